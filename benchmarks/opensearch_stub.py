@@ -0,0 +1,529 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Local stand-in for an OpenSearch cluster answering the API calls optic makes
+(/_cluster/health, /_cat/allocation, /_cat/indices and /_cat/aliases) from a
+synthetic, reproducible set of indices and aliases, with configurable response
+latency and error injection.
+
+python -m benchmarks.opensearch_stub --indices 100000 --aliases 10000 --latency 0.05
+"""
+
+import argparse
+import datetime
+import fnmatch
+import http.server
+import json
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+MILLIS_PER_DAY = 86_400_000
+
+# Prefixes of the synthetic index names, and the index type patterns matching them
+INDEX_PREFIXES = ("logs-app", "metrics-node", "traces-service", "audit", "security")
+INDEX_TYPE_PATTERNS = {
+    "logs": "logs-",
+    "metrics": "metrics-",
+    "traces": "traces-",
+    "audit": "audit-",
+}
+
+# _cat/indices columns holding numbers (reported as strings, like OpenSearch does)
+_NUMERIC_COLUMNS = (
+    "pri",
+    "rep",
+    "docs.count",
+    "docs.deleted",
+    "store.size",
+    "pri.store.size",
+    "creation.date",
+)
+
+# Number of encoded response bodies kept, so that repeated benchmark rounds measure
+# optic rather than the stand-in
+_BODY_CACHE_SIZE = 8
+
+
+class SyntheticCluster:
+    def __init__(
+        self,
+        index_count=1000,
+        alias_count=None,
+        node_count=3,
+        closed_ratio=0.02,
+        seed=0,
+        name="synthetic",
+    ):
+        """
+        Reproducible synthetic cluster content: indices of every health and status
+        created over the last year, and aliases each pointing to one to three of
+        them with exactly one write index
+
+        :param int index_count: number of indices
+        :param int alias_count: number of aliases (None for a tenth of the indices)
+        :param int node_count: number of data nodes
+        :param float closed_ratio: fraction of closed indices
+        :param int seed: random seed the content is generated from
+        :param str name: cluster name
+        """
+        self.name = name
+        self.node_count = node_count
+        rng = random.Random(seed)  # noqa: S311
+        reference_millis = int(
+            datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+            * 1000
+        )
+        self.indices = []
+        for number in range(index_count):
+            created = reference_millis - rng.randrange(365 * MILLIS_PER_DAY)
+            day = datetime.datetime.fromtimestamp(created / 1000, datetime.timezone.utc)
+            name = f"{INDEX_PREFIXES[number % len(INDEX_PREFIXES)]}-{day:%Y.%m.%d}-{number:07d}"
+            pri = rng.choice((1, 1, 2, 3, 5))
+            rep = rng.choice((0, 1, 1, 2))
+            if rng.random() < closed_ratio:
+                # closed indices report no health, counts, or sizes
+                self.indices.append(
+                    {
+                        "health": None,
+                        "status": "close",
+                        "index": name,
+                        "uuid": f"{rng.getrandbits(88):022x}",
+                        "pri": str(pri),
+                        "rep": str(rep),
+                        "docs.count": None,
+                        "docs.deleted": None,
+                        "store.size": None,
+                        "pri.store.size": None,
+                        "creation.date": str(created),
+                    }
+                )
+                continue
+            docs = rng.randrange(50_000_000)
+            pri_size = docs * rng.randrange(200, 2000)
+            self.indices.append(
+                {
+                    "health": rng.choices(("green", "yellow", "red"), (90, 8, 2))[0],
+                    "status": "open",
+                    "index": name,
+                    "uuid": f"{rng.getrandbits(88):022x}",
+                    "pri": str(pri),
+                    "rep": str(rep),
+                    "docs.count": str(docs),
+                    "docs.deleted": str(docs // 100),
+                    "store.size": str(pri_size * (1 + rep)),
+                    "pri.store.size": str(pri_size),
+                    "creation.date": str(created),
+                }
+            )
+
+        if alias_count is None:
+            alias_count = index_count // 10
+        self.aliases = []
+        for number in range(alias_count if self.indices else 0):
+            targets = rng.sample(self.indices, min(len(self.indices), 1 + number % 3))
+            for position, target in enumerate(targets):
+                routing = "1" if rng.random() < 0.05 else "-"
+                self.aliases.append(
+                    {
+                        "alias": f"alias-{number:07d}",
+                        "index": target["index"],
+                        "filter": "*" if rng.random() < 0.1 else "-",
+                        "routing.index": routing,
+                        "routing.search": routing,
+                        "is_write_index": (
+                            "true" if position == len(targets) - 1 else "-"
+                        ),
+                    }
+                )
+
+    def health(self) -> dict:
+        """
+        Returns the _cluster/health response
+
+        :return: cluster health
+        :rtype: dict
+        """
+        open_indices = [index for index in self.indices if index["status"] == "open"]
+        primaries = sum(int(index["pri"]) for index in open_indices)
+        shards = sum(
+            int(index["pri"]) * (1 + int(index["rep"])) for index in open_indices
+        )
+        if any(index["health"] == "red" for index in open_indices):
+            status = "red"
+        elif any(index["health"] == "yellow" for index in open_indices):
+            status = "yellow"
+        else:
+            status = "green"
+        return {
+            "cluster_name": self.name,
+            "status": status,
+            "timed_out": False,
+            "number_of_nodes": self.node_count,
+            "number_of_data_nodes": self.node_count,
+            "discovered_master": True,
+            "discovered_cluster_manager": True,
+            "active_primary_shards": primaries,
+            "active_shards": shards,
+            "relocating_shards": 0,
+            "initializing_shards": 0,
+            "unassigned_shards": 0,
+            "delayed_unassigned_shards": 0,
+            "number_of_pending_tasks": 0,
+            "number_of_in_flight_fetch": 0,
+            "task_max_waiting_in_queue_millis": 0,
+            "active_shards_percent_as_number": 100.0,
+        }
+
+    def allocation(self) -> list:
+        """
+        Returns the _cat/allocation rows, with disk sizes in megabytes
+
+        :return: disk usage of every node
+        :rtype: list
+        """
+        used = sum(
+            int(index["store.size"])
+            for index in self.indices
+            if index["store.size"] is not None
+        )
+        used_mb = used // 2**20 // self.node_count
+        total_mb = max(1, used_mb * 2)
+        return [
+            {"disk.used": str(used_mb), "disk.total": str(total_mb)}
+            for _ in range(self.node_count)
+        ]
+
+    def cat_indices(self, pattern="*", params=None) -> list:
+        """
+        Returns the _cat/indices rows matching an index pattern, honoring the
+        h, s, health and expand_wildcards parameters optic sends
+
+        :param str pattern: index pattern (comma separated for several)
+        :param dict params: query parameters
+        :return: index rows
+        :rtype: list
+        """
+        params = params or {}
+        rows = _matching(self.indices, "index", pattern)
+        if "health" in params:
+            rows = [row for row in rows if row["health"] == params["health"]]
+        expand = params.get("expand_wildcards", "all").split(",")
+        if "all" not in expand:
+            statuses = {"open": "open", "closed": "close"}
+            allowed = {statuses[name] for name in expand if name in statuses}
+            rows = [row for row in rows if row["status"] in allowed]
+        if "s" in params:
+            # the first sort key is the primary one, so it is sorted on last
+            for sort_key in reversed(params["s"].split(",")):
+                column, _, direction = sort_key.partition(":")
+                rows = sorted(
+                    rows,
+                    key=lambda row, column=column: _sort_value(row, column),
+                    reverse=direction == "desc",
+                )
+        return _columns(rows, params.get("h"))
+
+    def cat_aliases(self, pattern="*", params=None) -> list:
+        """
+        Returns the _cat/aliases rows of the aliases matching a name pattern
+
+        :param str pattern: alias pattern (comma separated for several)
+        :param dict params: query parameters
+        :return: alias rows
+        :rtype: list
+        """
+        rows = _matching(self.aliases, "alias", pattern)
+        return _columns(rows, (params or {}).get("h"))
+
+
+def _matching(rows, column, pattern) -> list:
+    """
+    Returns the rows whose column matches a wildcard pattern
+
+    :param list rows: response rows
+    :param str column: column matched (e.g. index)
+    :param str pattern: wildcard pattern (comma separated for several)
+    :return: matching rows
+    :rtype: list
+    """
+    patterns = [part for part in pattern.split(",") if part]
+    if not patterns or "*" in patterns or "_all" in patterns:
+        return rows
+    return [
+        row
+        for row in rows
+        if any(fnmatch.fnmatchcase(row[column], part) for part in patterns)
+    ]
+
+
+def _sort_value(row, column):
+    """
+    Returns the value a row is sorted on, comparing numbers as numbers
+
+    :param dict row: response row
+    :param str column: sorted column
+    :return: sort value
+    """
+    value = row.get(column)
+    if column in _NUMERIC_COLUMNS:
+        return -1 if value is None else int(value)
+    return value or ""
+
+
+def _columns(rows, columns) -> list:
+    """
+    Keeps the requested columns of the rows, in the requested order (h parameter)
+
+    :param list rows: response rows
+    :param str columns: comma separated column names (None for every column)
+    :return: rows with the requested columns
+    :rtype: list
+    """
+    if not columns:
+        return rows
+    names = columns.split(",")
+    return [{name: row.get(name) for name in names} for row in rows]
+
+
+class StubOpenSearch:
+    def __init__(
+        self,
+        cluster,
+        port=0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        error_status=503,
+        truncate_rate=0.0,
+        seed=0,
+    ):
+        """
+        HTTP server answering optic's OpenSearch API calls from a SyntheticCluster
+
+        Every request waits for latency seconds (plus up to jitter seconds), then
+        fails with error_status for a fraction error_rate of requests, or has its
+        body cut short for a fraction truncate_rate of requests
+
+        :param SyntheticCluster cluster: content of the cluster
+        :param int port: localhost TCP port (0 for any free port)
+        :param float latency: seconds every response is delayed by
+        :param float jitter: maximum random seconds added to the latency
+        :param float error_rate: fraction of requests answered with an error
+        :param int error_status: HTTP status of injected errors
+        :param float truncate_rate: fraction of responses cut short
+        :param int seed: random seed of the injected latency and errors
+        """
+        self.cluster = cluster
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.truncate_rate = truncate_rate
+        self.request_count = 0
+        self.error_count = 0
+        self._rng = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+        self._bodies = OrderedDict()
+        self._thread = None
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the URL optic connects to
+
+        :return: base URL of the server
+        :rtype: str
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubOpenSearch":
+        """
+        Answers requests in a background thread
+
+        :return: the server
+        :rtype: StubOpenSearch
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops answering requests
+
+        :return: None
+        :rtype: None
+        """
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self) -> "StubOpenSearch":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple[float, bool, bool]:
+        """
+        Draws the delay and injected failures of a request
+
+        :return: delay in seconds, whether to fail, and whether to truncate
+        :rtype: tuple[float, bool, bool]
+        """
+        with self._lock:
+            self.request_count += 1
+            delay = self.latency + self.jitter * self._rng.random()
+            fail = self._rng.random() < self.error_rate
+            truncate = not fail and self._rng.random() < self.truncate_rate
+            self.error_count += fail or truncate
+        return delay, fail, truncate
+
+    def body(self, path) -> bytes | None:
+        """
+        Returns the encoded response to a request path
+
+        :param str path: request path and query string
+        :return: JSON response body (None for an unknown endpoint)
+        :rtype: bytes | None
+        """
+        with self._lock:
+            if path in self._bodies:
+                self._bodies.move_to_end(path)
+                return self._bodies[path]
+        parts = urlsplit(path)
+        params = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        endpoint, _, pattern = parts.path.strip("/").partition("/")
+        if endpoint == "_cat":
+            endpoint, _, pattern = pattern.partition("/")
+            endpoint = "_cat/" + endpoint
+        match endpoint:
+            case "_cluster":
+                response = self.cluster.health()
+            case "_cat/allocation":
+                response = _columns(self.cluster.allocation(), params.get("h"))
+            case "_cat/indices":
+                response = self.cluster.cat_indices(pattern or "*", params)
+            case "_cat/aliases":
+                response = self.cluster.cat_aliases(pattern or "*", params)
+            case _:
+                return None
+        body = json.dumps(response, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._bodies[path] = body
+            while len(self._bodies) > _BODY_CACHE_SIZE:
+                self._bodies.popitem(last=False)
+        return body
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # keep-alive, like OpenSearch, so that optic's pooled sessions are exercised
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, which Nagle's algorithm would delay
+    disable_nagle_algorithm = True
+    server_version = "opensearch-stub"
+
+    def do_GET(self) -> None:  # noqa: N802
+        stub = self.server.stub
+        delay, fail, truncate = stub._draw()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(
+                stub.error_status, json.dumps({"error": "injected error"}).encode()
+            )
+            return
+        body = stub.body(self.path)
+        if body is None:
+            self._send(
+                404, json.dumps({"error": f"no handler for {self.path}"}).encode()
+            )
+            return
+        if truncate:
+            # announce the whole body, send half of it and drop the connection
+            self._send(200, body, len(body) // 2)
+            self.close_connection = True
+            return
+        self._send(200, body)
+
+    def _send(self, status, body, length=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body if length is None else body[:length])
+
+    def log_message(self, message_format, *args) -> None:
+        logging.debug("opensearch stub: " + message_format % args)
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    """
+    Parses the command line arguments of the stand-in
+
+    :param list args: command line arguments (None for sys.argv)
+    :return: parsed arguments
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=9200, help="0 for any free port")
+    parser.add_argument("--indices", type=int, default=1000)
+    parser.add_argument("--aliases", type=int, default=None)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(args)
+
+
+def main(args=None) -> None:
+    """
+    Answers requests until interrupted
+
+    :param list args: command line arguments (None for sys.argv)
+    :return: None
+    :rtype: None
+    """
+    options = parse_args(args)
+    cluster = SyntheticCluster(
+        options.indices, options.aliases, options.nodes, seed=options.seed
+    )
+    stub = StubOpenSearch(
+        cluster,
+        options.port,
+        options.latency,
+        options.jitter,
+        options.error_rate,
+        options.error_status,
+        options.truncate_rate,
+        options.seed,
+    )
+    # the benchmark runner reads the URL from the first line
+    print(stub.url, flush=True)
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
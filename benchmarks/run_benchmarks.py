@@ -0,0 +1,566 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+"""
+Benchmarks cluster info, index info and alias info against a synthetic local
+OpenSearch stand-in, reporting end-to-end and per-stage timings, and comparing
+them with the timings of a previous run to detect regressions.
+
+python -m benchmarks.run_benchmarks --indices 1000,100000 --save baseline.json
+python -m benchmarks.run_benchmarks --indices 1000,100000 --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import statistics
+import subprocess  # noqa: S404
+import sys
+import time
+
+from terminaltables import AsciiTable
+
+from benchmarks.opensearch_stub import INDEX_TYPE_PATTERNS
+from optic.alias.alias_service import (
+    build_alias_dicts,
+    get_alias_info,
+    print_alias_info,
+)
+from optic.cluster.cluster import ALLOCATION_QUERY, HEALTH_QUERY, Cluster, ClusterHealth
+from optic.cluster.cluster_service import (
+    build_cluster_info_table,
+    get_cluster_info,
+    print_cluster_info,
+)
+from optic.common import units
+from optic.common.api import close_sessions
+from optic.common.json_stream import STREAM_CHUNK_SIZE, iter_json_array
+from optic.index import index_type
+from optic.index.index_filter import FILTER_SETTINGS, IndexFilter
+from optic.index.index_service import (
+    build_index_dicts,
+    get_index_info,
+    plan_index_query,
+    print_index_info,
+    sort_index_table,
+)
+
+TOOLS = ("cluster", "index", "alias")
+# Stages of every tool, in the order they run (end_to_end runs the whole tool)
+STAGES = ("fetch", "parse", "build", "filter", "sort", "render", "end_to_end")
+
+STORAGE_PERCENT_THRESHOLDS = {"GREEN": 80, "YELLOW": 85, "RED": 100}
+
+# Timings shorter than this are too noisy to be reported as regressions
+DEFAULT_MIN_DELTA = 0.001
+DEFAULT_THRESHOLD = 0.2
+
+
+class StageTimer:
+    def __init__(self):
+        """
+        Collects the durations of the stages of successive benchmark rounds
+        """
+        self.timings = {}
+        self.failures = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Times a stage, recording its duration if it completes
+
+        :param str name: name of the stage
+        :return: context manager
+        """
+        started = time.perf_counter()
+        yield
+        self.timings.setdefault(name, []).append(time.perf_counter() - started)
+
+    def failed(self, name) -> None:
+        """
+        Records a round that failed (e.g. because of an injected error)
+
+        :param str name: name of the stage or tool that failed
+        :return: None
+        :rtype: None
+        """
+        self.failures[name] = self.failures.get(name, 0) + 1
+
+
+def start_stub(index_count, alias_count=None, stub_args=()) -> tuple:
+    """
+    Starts the OpenSearch stand-in in its own process, so that it does not compete
+    with the benchmarked code for the interpreter
+
+    :param int index_count: number of synthetic indices
+    :param int alias_count: number of synthetic aliases (None for the default)
+    :param list stub_args: additional command line arguments of the stand-in
+    :return: stand-in process and its URL
+    :rtype: tuple[subprocess.Popen, str]
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.opensearch_stub",
+        "--port",
+        "0",
+        "--indices",
+        str(index_count),
+        *stub_args,
+    ]
+    if alias_count is not None:
+        command += ["--aliases", str(alias_count)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)  # noqa: S603
+    url = process.stdout.readline().strip()
+    if not url:
+        process.kill()
+        raise RuntimeError("OpenSearch stand-in did not start")
+    return process, url
+
+
+def make_cluster(url) -> Cluster:
+    """
+    Returns a cluster for the stand-in, without a response cache
+
+    :param str url: URL of the stand-in
+    :return: Cluster object
+    :rtype: Cluster
+    """
+    return Cluster(
+        url=url,
+        auth={"username": "", "password": ""},  # noqa: S105
+        verify_ssl=False,
+        name="benchmark",
+        index_type_patterns=INDEX_TYPE_PATTERNS,
+        no_cache=True,
+    )
+
+
+def clear_process_state() -> None:
+    """
+    Forgets pooled sessions and parsing memos, so that a round runs like a new
+    optic invocation
+
+    :return: None
+    :rtype: None
+    """
+    close_sessions()
+    index_type._classifier.cache_clear()
+    units._parse_bytes_string.cache_clear()
+
+
+def _download(cluster, query) -> bytes:
+    """
+    Retrieves a response body as optic does (pooled session, retries, timeout)
+
+    :param Cluster cluster: cluster queried
+    :param str query: string added to the end of the cluster url
+    :return: response body
+    :rtype: bytes
+    """
+    return cluster._action(query)._send().content
+
+
+def _rows(body) -> list:
+    """
+    Parses a JSON array response in the chunks it is streamed in
+
+    :param bytes body: response body
+    :return: response elements
+    :rtype: list
+    """
+    stream = io.BytesIO(body)
+    return list(iter_json_array(iter(lambda: stream.read(STREAM_CHUNK_SIZE), b"")))
+
+
+def cluster_stages(cluster, timer, options) -> None:
+    """
+    Times the stages of cluster info (health and disk usage)
+
+    :param Cluster cluster: cluster queried
+    :param StageTimer timer: timer collecting the stage durations
+    :param argparse.Namespace options: benchmark options
+    :return: None
+    :rtype: None
+    """
+    with timer.stage("fetch"):
+        health_body = _download(cluster, HEALTH_QUERY)
+        allocation_body = _download(cluster, ALLOCATION_QUERY)
+    with timer.stage("parse"):
+        health_response = json.loads(health_body)
+        allocation_response = json.loads(allocation_body)
+    with timer.stage("build"):
+        health = ClusterHealth(**health_response)
+        cluster_info = [
+            {
+                "name": cluster.name,
+                "status": health.status,
+                "usage": cluster._calculate_storage_percent(allocation_response),
+            }
+        ]
+    with timer.stage("render"), contextlib.redirect_stdout(io.StringIO()):
+        print(
+            build_cluster_info_table(
+                cluster_info, True, STORAGE_PERCENT_THRESHOLDS
+            ).table
+        )
+
+
+def index_stages(cluster, timer, options) -> None:
+    """
+    Times the stages of index info, retrieving aliases when write alias
+    information is needed
+
+    :param Cluster cluster: cluster queried
+    :param StageTimer timer: timer collecting the stage durations
+    :param argparse.Namespace options: benchmark options
+    :return: None
+    :rtype: None
+    """
+    query_plan = plan_index_query(options.filters, options.sort_by, options.fields)
+    with_aliases = query_plan.with_write_alias
+    with timer.stage("fetch"):
+        indices_body = _download(cluster, query_plan.query(cluster.search_pattern))
+        if with_aliases:
+            aliases_body = _download(cluster, cluster._alias_list_query())
+    with timer.stage("parse"):
+        indices_rows = _rows(indices_body)
+        if with_aliases:
+            alias_rows = _rows(aliases_body)
+    with timer.stage("build"):
+        if with_aliases:
+            cluster._fetched("alias_list", cluster._build_alias_list(alias_rows))
+        index_table = cluster._build_index_table(indices_rows, query_plan)
+    with timer.stage("filter"):
+        index_table.set_reference_time(query_plan.reference_millis)
+        index_table = query_plan.local_filter.apply(index_table)
+    with timer.stage("sort"):
+        index_table = sort_index_table(index_table, query_plan.sort_by, options.top)
+    with timer.stage("render"), contextlib.redirect_stdout(io.StringIO()):
+        print_index_info(
+            build_index_dicts(index_table, options.fields), True, options.fields
+        )
+
+
+def alias_stages(cluster, timer, options) -> None:
+    """
+    Times the stages of alias info
+
+    :param Cluster cluster: cluster queried
+    :param StageTimer timer: timer collecting the stage durations
+    :param argparse.Namespace options: benchmark options
+    :return: None
+    :rtype: None
+    """
+    with timer.stage("fetch"):
+        body = _download(cluster, cluster._alias_list_query())
+    with timer.stage("parse"):
+        rows = _rows(body)
+    with timer.stage("build"):
+        alias_list = cluster._build_alias_list(rows)
+    with timer.stage("render"), contextlib.redirect_stdout(io.StringIO()):
+        print_alias_info(build_alias_dicts([(cluster, alias_list)]), True)
+
+
+def end_to_end(tool, cluster, options) -> bool:
+    """
+    Runs a whole info tool as the CLI does, discarding its output
+
+    :param str tool: cluster, index or alias
+    :param Cluster cluster: cluster queried
+    :param argparse.Namespace options: benchmark options
+    :return: True if the cluster could be queried
+    :rtype: bool
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        match tool:
+            case "cluster":
+                print_cluster_info(
+                    get_cluster_info([cluster]),
+                    {
+                        "no_color": True,
+                        "storage_percent_thresholds": STORAGE_PERCENT_THRESHOLDS,
+                    },
+                )
+            case "index":
+                index_dicts = get_index_info(
+                    [cluster],
+                    options.filters,
+                    options.sort_by,
+                    fields=options.fields,
+                    top=options.top,
+                )
+                print_index_info(index_dicts, True, options.fields)
+            case "alias":
+                print_alias_info(get_alias_info([cluster]), True)
+    return "Unable to retrieve information" not in output.getvalue()
+
+
+_TOOL_STAGES = {"cluster": cluster_stages, "index": index_stages, "alias": alias_stages}
+
+
+def benchmark(url, tool, options) -> StageTimer:
+    """
+    Times the stages of a tool, then the whole tool, over several rounds
+
+    :param str url: URL of the stand-in
+    :param str tool: cluster, index or alias
+    :param argparse.Namespace options: benchmark options
+    :return: collected timings
+    :rtype: StageTimer
+    """
+    timer = StageTimer()
+    for _ in range(options.rounds):
+        if not options.warm:
+            clear_process_state()
+        try:
+            _TOOL_STAGES[tool](make_cluster(url), timer, options)
+        except Exception:
+            # injected errors, the remaining stages of the round are skipped
+            timer.failed("stages")
+        if not options.warm:
+            clear_process_state()
+        started = time.perf_counter()
+        if end_to_end(tool, make_cluster(url), options):
+            timer.timings.setdefault("end_to_end", []).append(
+                time.perf_counter() - started
+            )
+        else:
+            timer.failed("end_to_end")
+    return timer
+
+
+def run(options) -> dict:
+    """
+    Benchmarks the selected tools for every index count
+
+    :param argparse.Namespace options: benchmark options
+    :return: benchmark results
+    :rtype: dict
+    """
+    results = {}
+    for index_count in options.indices:
+        if options.url:
+            process, url = None, options.url
+        else:
+            process, url = start_stub(index_count, options.aliases, options.stub_args)
+        try:
+            for tool in options.tools:
+                timer = benchmark(url, tool, options)
+                for stage in STAGES:
+                    timings = timer.timings.get(stage)
+                    if not timings:
+                        continue
+                    results[f"{tool}/{index_count}/{stage}"] = {
+                        "min": min(timings),
+                        "median": statistics.median(timings),
+                        "rounds": timings,
+                    }
+                if timer.failures:
+                    results[f"{tool}/{index_count}/failures"] = timer.failures
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    return {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rounds": options.rounds,
+            "warm": options.warm,
+            "sort_by": options.sort_by,
+            "stub_args": options.stub_args,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results, baseline, threshold=DEFAULT_THRESHOLD, min_delta=DEFAULT_MIN_DELTA
+):
+    """
+    Compares median timings with those of a previous run
+
+    :param dict results: benchmark results
+    :param dict baseline: results of the previous run
+    :param float threshold: relative slowdown reported as a regression (0.2 for 20%)
+    :param float min_delta: smallest slowdown in seconds reported as a regression
+    :return: change of every timing present in both runs, and regressed timings
+    :rtype: tuple[dict, list]
+    """
+    changes = {}
+    regressions = []
+    for key, timing in results["results"].items():
+        previous = baseline["results"].get(key)
+        if "median" not in timing or not previous or "median" not in previous:
+            continue
+        change = timing["median"] / previous["median"] - 1 if previous["median"] else 0
+        changes[key] = change
+        if change > threshold and timing["median"] - previous["median"] >= min_delta:
+            regressions.append(key)
+    return changes, regressions
+
+
+def print_results(results, changes=None) -> None:
+    """
+    Prints the timings of a run, with their change since a previous run
+
+    :param dict results: benchmark results
+    :param dict changes: relative change of every timing present in the previous run
+    :return: None
+    :rtype: None
+    """
+    changes = changes or {}
+    print_data = [["Tool", "Indices", "Stage", "Min (ms)", "Median (ms)", "Change"]]
+    for key, timing in results["results"].items():
+        tool, index_count, stage = key.split("/")
+        if stage == "failures":
+            stage = "failures: " + ", ".join(
+                f"{name} {count}" for name, count in timing.items()
+            )
+            print_data.append([tool, index_count, stage, "", "", ""])
+            continue
+        change = changes.get(key)
+        print_data.append(
+            [
+                tool,
+                index_count,
+                stage,
+                f"{timing['min'] * 1000:.1f}",
+                f"{timing['median'] * 1000:.1f}",
+                "" if change is None else f"{change:+.1%}",
+            ]
+        )
+    table = AsciiTable(print_data)
+    table.title = "Benchmarks"
+    print(table.table)
+
+
+def _filter_option(option) -> tuple:
+    name, _, value = option.partition("=")
+    if name not in FILTER_SETTINGS:
+        raise argparse.ArgumentTypeError(f"unrecognized filter: {name}")
+    if name == "type_filter":
+        return name, value.split(",")
+    if name == "write_alias_only":
+        return name, value.lower() == "true"
+    return name, value
+
+
+def parse_args(args=None) -> argparse.Namespace:
+    """
+    Parses the command line arguments of the benchmarks
+
+    :param list args: command line arguments (None for sys.argv)
+    :return: parsed arguments
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--indices",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=[1000, 10000],
+        help="comma separated index counts (default: 1000,10000)",
+    )
+    parser.add_argument(
+        "--aliases", type=int, default=None, help="default: a tenth of the indices"
+    )
+    parser.add_argument(
+        "--tools",
+        type=lambda value: value.split(","),
+        default=list(TOOLS),
+        help="comma separated tools (default: cluster,index,alias)",
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="keep pooled sessions and memos between rounds, as optic serve does",
+    )
+    parser.add_argument(
+        "--sort",
+        dest="sort_by",
+        action="append",
+        default=None,
+        help="index info sort key (default: age)",
+    )
+    parser.add_argument(
+        "--filter",
+        dest="filter_options",
+        action="append",
+        type=_filter_option,
+        default=[],
+        metavar="NAME=VALUE",
+        help="index info filter (e.g. min_age=30, type_filter=logs,metrics)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=lambda value: value.split(","),
+        default=None,
+        help="comma separated index info fields",
+    )
+    parser.add_argument("--top", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=None, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--truncate-rate", type=float, default=None)
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="benchmark an already running stand-in (--indices only labels the results)",
+    )
+    parser.add_argument("--save", default=None, help="write the results to a file")
+    parser.add_argument(
+        "--baseline", default=None, help="compare with the results saved in a file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    options = parser.parse_args(args)
+    if options.sort_by is None:
+        options.sort_by = ["age"]
+    options.filters = IndexFilter(**dict(options.filter_options))
+    options.stub_args = []
+    for name in ("latency", "error_rate", "truncate_rate"):
+        value = getattr(options, name)
+        if value is not None:
+            options.stub_args += ["--" + name.replace("_", "-"), str(value)]
+    return options
+
+
+def main(args=None) -> int:
+    """
+    Runs the benchmarks, returning 1 if a timing regressed
+
+    :param list args: command line arguments (None for sys.argv)
+    :return: exit status
+    :rtype: int
+    """
+    options = parse_args(args)
+    results = run(options)
+    changes, regressions = {}, []
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        changes, regressions = compare(results, baseline, options.threshold)
+    print_results(results, changes)
+    if options.save:
+        with open(options.save, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+    for key in regressions:
+        print(f"Regression: {key} {changes[key]:+.1%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,65 @@
-from optic.alias.alias_service import get_alias_info
-from optic.cluster.cluster import Cluster, configure_cluster
-from optic.cluster.cluster_service import get_cluster_info, get_selected_clusters
-from optic.common.config import ClusterConfig
-from optic.index.index_service import get_index_info
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from optic.alias.alias_service import async_get_alias_info, get_alias_info
+    from optic.cluster.cluster import Cluster, configure_cluster
+    from optic.cluster.cluster_service import (
+        async_get_cluster_info,
+        get_cluster_info,
+        get_selected_clusters,
+    )
+    from optic.common.async_api import close_async_sessions
+    from optic.common.config import ClusterConfig
+    from optic.index.index_filter import IndexFilter
+    from optic.index.index_service import (
+        async_get_index_info,
+        get_index_info,
+        iter_index_info,
+    )
+
+# Public names and the modules they are imported from the first time they are used,
+# so that importing optic (e.g. for the CLI) does not load HTTP and YAML libraries
+_EXPORTS = {
+    "Cluster": "optic.cluster.cluster",
+    "ClusterConfig": "optic.common.config",
+    "IndexFilter": "optic.index.index_filter",
+    "configure_cluster": "optic.cluster.cluster",
+    "get_cluster_info": "optic.cluster.cluster_service",
+    "get_index_info": "optic.index.index_service",
+    "iter_index_info": "optic.index.index_service",
+    "get_alias_info": "optic.alias.alias_service",
+    "get_selected_clusters": "optic.cluster.cluster_service",
+    "async_get_cluster_info": "optic.cluster.cluster_service",
+    "async_get_index_info": "optic.index.index_service",
+    "async_get_alias_info": "optic.alias.alias_service",
+    "close_async_sessions": "optic.common.async_api",
+}
 
 __all__ = [
     "Cluster",
     "ClusterConfig",
+    "IndexFilter",
     "configure_cluster",
     "get_cluster_info",
     "get_index_info",
+    "iter_index_info",
     "get_alias_info",
     "get_selected_clusters",
+    "async_get_cluster_info",
+    "async_get_index_info",
+    "async_get_alias_info",
+    "close_async_sessions",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -4,36 +4,59 @@
 # ** Licensed under the Universal Permissive License v 1.0
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
+from optic.common.record import ResponseRecord
 
-class AliasTarget:
-    def __init__(self, **kwargs):
-        self.is_write_index = None
-        self._set_properties_from_response(**kwargs)
+# _cat/aliases response fields kept by AliasTarget -> attribute names
+ALIAS_TARGET_FIELDS = {
+    "index": "index",
+    "filter": "filter",
+    "routing.index": "routing_index",
+    "routing.search": "routing_search",
+    "is_write_index": "is_write_index",
+}
 
-    def _set_properties_from_response(self, **kwargs) -> None:
-        """
-        Dynamically sets attributes based off API Response dictionary
 
-        :param dict kwargs: dictionary with response attributes
-        :return: None
-        :rtype: None
-        """
-        # TODO: Detailed Filter information
-        for key, value in kwargs.items():
-            if isinstance(value, str) and (value.lower() == "true" or value == "*"):
-                value = True
-            elif isinstance(value, str) and (value.lower() == "false" or value == "-"):
-                value = False
+class AliasTarget(ResponseRecord):
+    __slots__ = tuple(ALIAS_TARGET_FIELDS.values())
 
-            setattr(self, key, value)
+    FIELDS = ALIAS_TARGET_FIELDS
+
+    @staticmethod
+    def _parse_value(value):
+        # TODO: Detailed Filter information
+        if isinstance(value, str) and (value.lower() == "true" or value == "*"):
+            return True
+        elif isinstance(value, str) and (value.lower() == "false" or value == "-"):
+            return False
+        return value
 
 
 class Alias:
-    def __init__(self, alias_name=None, cluster_name=None, info_response=None):
+    __slots__ = (
+        "alias_name",
+        "cluster_name",
+        "info_response",
+        "_targets",
+        "_write_targets",
+    )
+
+    def __init__(
+        self, alias_name=None, cluster_name=None, info_response=None, targets=None
+    ):
+        """
+        Alias of one or more indices
+
+        The raw response is only kept until it is parsed into targets
+
+        :param str alias_name: name of the alias
+        :param str cluster_name: name of the cluster the alias belongs to
+        :param list info_response: _cat/aliases rows of the alias (without the alias field)
+        :param list targets: AliasTarget objects of the alias, instead of info_response
+        """
         self.alias_name = alias_name
         self.cluster_name = cluster_name
-        self.info_response = info_response
-        self._targets = None
+        self.info_response = info_response if targets is None else None
+        self._targets = targets
         self._write_targets = None
 
     @property
@@ -44,10 +67,12 @@ class Alias:
         :return: list of AliasTarget
         :rtype: list[AliasTarget]
         """
-        if not self._targets:
+        if self._targets is None:
             self._targets = [
-                AliasTarget(**index_details) for index_details in self.info_response
+                AliasTarget(**index_details)
+                for index_details in self.info_response or ()
             ]
+            self.info_response = None
         return self._targets
 
     @property
@@ -58,7 +83,7 @@ class Alias:
         :return: list of AliasTarget
         :rtype: list[AliasTarget]
         """
-        if not self._write_targets:
+        if self._write_targets is None:
             self._write_targets = [
                 target for target in self.targets if target.is_write_index
             ]
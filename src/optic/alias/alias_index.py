@@ -0,0 +1,93 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+from types import MappingProxyType
+
+_NO_ALIASES = MappingProxyType({})
+
+
+class AliasIndex:
+    def __init__(self, alias_list=()):
+        """
+        Bidirectional index of the aliases of a cluster, built in one pass over its
+        aliases: alias name -> targets, and index name -> aliases pointing to it
+        (with the write, filter and routing flags of each alias for that index).
+
+        :param list alias_list: list of Alias objects
+        """
+        self._targets = {}
+        self._index_aliases = {}
+        self.write_targets = set()
+        for alias in alias_list:
+            self._targets[alias.alias_name] = alias.targets
+            for target in alias.targets:
+                aliases = self._index_aliases.get(target.index)
+                if aliases is None:
+                    aliases = self._index_aliases[target.index] = {}
+                aliases[alias.alias_name] = target
+                if target.is_write_index:
+                    self.write_targets.add(target.index)
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def __contains__(self, alias_name) -> bool:
+        return alias_name in self._targets
+
+    def targets(self, alias_name) -> list:
+        """
+        Returns the targets of an alias
+
+        :param str alias_name: name of the alias
+        :return: list of AliasTarget objects (empty if there is no such alias)
+        :rtype: list
+        """
+        return self._targets.get(alias_name, [])
+
+    def aliases(self, index_name) -> MappingProxyType:
+        """
+        Returns the aliases pointing to an index
+
+        :param str index_name: name of the index
+        :return: read-only mapping of alias name -> AliasTarget of the index
+        :rtype: MappingProxyType
+        """
+        aliases = self._index_aliases.get(index_name)
+        return _NO_ALIASES if aliases is None else MappingProxyType(aliases)
+
+    def alias_names(self, index_name) -> list:
+        """
+        Returns the names of the aliases pointing to an index
+
+        :param str index_name: name of the index
+        :return: sorted alias names
+        :rtype: list
+        """
+        return sorted(self._index_aliases.get(index_name, ()))
+
+    def write_aliases(self, index_name) -> list:
+        """
+        Returns the names of the aliases an index is the write index of
+
+        :param str index_name: name of the index
+        :return: sorted alias names
+        :rtype: list
+        """
+        return sorted(
+            alias_name
+            for alias_name, target in self._index_aliases.get(index_name, {}).items()
+            if target.is_write_index
+        )
+
+    def is_write_target(self, index_name) -> bool:
+        """
+        Returns whether an index is the write index of an alias
+
+        :param str index_name: name of the index
+        :return: True if index is a write alias target
+        :rtype: bool
+        """
+        return index_name in self.write_targets
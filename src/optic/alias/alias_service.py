@@ -6,20 +6,68 @@
 
 from terminaltables import AsciiTable
 
+from optic.common.concurrency import (
+    async_map_clusters,
+    map_clusters,
+    report_failures,
+)
 from optic.common.optic_color import OpticColor
 
+# Fields of the records produced by iter_alias_records
+ALIAS_RECORD_FIELDS = (
+    "alias",
+    "cluster_name",
+    "index_name",
+    "filter",
+    "routing_index",
+    "routing_search",
+    "write_target",
+)
 
-def get_alias_info(clusters) -> list:
+
+def get_alias_info(clusters, max_concurrency=None) -> list:
     """
     Retrieves and packages Alias information into a list of dictionaries
 
     :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :return: list of dictionaries containing alias information
+    :rtype: list
+    """
+    results, failures = map_clusters(
+        lambda cluster: cluster.alias_list, clusters, max_concurrency
+    )
+    report_failures(failures)
+    return build_alias_dicts(results)
+
+
+async def async_get_alias_info(clusters, max_concurrency=None) -> list:
+    """
+    Asynchronous variant of get_alias_info
+
+    :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :return: list of dictionaries containing alias information
+    :rtype: list
+    """
+    results, failures = await async_map_clusters(
+        lambda cluster: cluster.async_alias_list(), clusters, max_concurrency
+    )
+    report_failures(failures)
+    return build_alias_dicts(results)
+
+
+def build_alias_dicts(results) -> list:
+    """
+    Packages the Alias objects of each cluster into a list of dictionaries
+
+    :param list results: list of (cluster, list of Alias objects) tuples
     :return: list of dictionaries containing alias information
     :rtype: list
     """
     alias_list = []
-    for cluster in clusters:
-        alias_list.extend(cluster.alias_list)
+    for _, cluster_alias_list in results:
+        alias_list.extend(cluster_alias_list)
 
     alias_dicts = []
     for alias in alias_list:
@@ -39,6 +87,21 @@ def get_alias_info(clusters) -> list:
     return alias_dicts
 
 
+def iter_alias_records(alias_dicts):
+    """
+    Flattens alias information into one record per alias target
+    (e.g. for machine-readable output)
+
+    :param list alias_dicts: list of dictionaries of alias information
+    :return: generator of dictionaries with the fields of ALIAS_RECORD_FIELDS
+    :rtype: Generator
+    """
+    for alias in alias_dicts:
+        for alias_name, targets in alias.items():
+            for target in targets:
+                yield {"alias": alias_name, **target}
+
+
 def print_alias_info(alias_dicts, no_color) -> None:
     """
     Prints Alias Information
@@ -4,38 +4,51 @@
 # ** Licensed under the Universal Permissive License v 1.0
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
+# Only lightweight modules are imported here, so that shell completion and --help
+# stay fast. Each command imports the modules it needs (HTTP clients, YAML parser,
+# table rendering) when it runs
+import os
+
 import click
 from click import Option
 
-from optic.alias.alias_service import get_alias_info, print_alias_info
-from optic.cluster.cluster import configure_cluster
-from optic.cluster.cluster_service import (
-    get_cluster_info,
-    get_selected_clusters,
-    print_cluster_info,
+from optic.common.completion import (
+    cluster_config_summary,
+    collect_names,
+    complete_cluster_selection,
+    complete_search_pattern,
+    remember_names,
+    settings_summary,
+    update_config_index,
 )
 from optic.common.config import OpticSettings, read_cluster_config, yaml_load
 from optic.common.exceptions import OpticConfigurationFileError, OpticError
-from optic.index.index_service import get_index_info, print_index_info
-from optic.initialize.initialize_service import initialize_optic
+from optic.common.output import OUTPUT_FORMATS, data_output, write_records
+from optic.index.index_fields import INDEX_INFO_FIELDS, selected_index_fields
+from optic.serve.serve_client import query_daemon
 
 
 def read_optic_settings(ctx):
+    optic_settings_file_path = ctx.obj["optic_settings"]["optic_settings_file_path"]
     try:
         ctx.obj["optic_settings"].update(
-            OpticSettings(
-                yaml_load(ctx.obj["optic_settings"]["optic_settings_file_path"])
-            ).fields
+            OpticSettings(yaml_load(optic_settings_file_path)).fields
         )
     except OpticConfigurationFileError as e:
         print(e)
         exit(1)
+    update_config_index(
+        optic_settings_file_path, settings_summary(ctx.obj["optic_settings"])
+    )
     return ctx.obj["optic_settings"]
 
 
 def read_cluster_configuration(cluster_config_file_path):
     try:
         cluster_config = read_cluster_config(cluster_config_file_path)
+        update_config_index(
+            cluster_config_file_path, cluster_config_summary(cluster_config)
+        )
     except OpticConfigurationFileError as e:
         print(e)
         exit(1)
@@ -43,6 +56,121 @@ def read_cluster_configuration(cluster_config_file_path):
     return cluster_config
 
 
+def select_clusters(cluster_config_file_path, cluster_selection, optic_settings):
+    """
+    Reads the cluster configuration file and returns the selected clusters,
+    configured with the optic settings
+
+    :param str cluster_config_file_path: path of the cluster configuration file
+    :param tuple cluster_selection: cluster or cluster group names (all if empty)
+    :param dict optic_settings: optic settings
+    :return: list of Cluster type objects
+    :rtype: list[Cluster]
+    """
+    from optic.cluster.cluster import configure_cluster
+    from optic.cluster.cluster_service import get_selected_clusters
+
+    cluster_config = read_cluster_configuration(cluster_config_file_path)
+    selected_clusters = get_selected_clusters(cluster_config, list(cluster_selection))
+    for cluster in selected_clusters:
+        configure_cluster(cluster, optic_settings)
+    return selected_clusters
+
+
+def query_running_daemon(
+    path, optic_settings, cluster_config_file_path, cluster_selection, **arguments
+):
+    """
+    Answers a query with the optic daemon (optic serve) if one is running, unless
+    cached responses are refreshed or disabled
+
+    :param str path: query path (e.g. /index/info)
+    :param dict optic_settings: optic settings
+    :param str cluster_config_file_path: path of the cluster configuration file
+    :param tuple cluster_selection: cluster or cluster group names (all if empty)
+    :param arguments: other query arguments (e.g. filters)
+    :return: query result, or None if the query must be answered locally
+    :rtype: list | None
+    :raises OpticError: if the daemon could not answer the query
+    """
+    if optic_settings.get("no_cache") or optic_settings.get("refresh_cache"):
+        return None
+    return query_daemon(
+        path,
+        {
+            "settings": optic_settings,
+            "cluster_config_file_path": cluster_config_file_path
+            and os.path.abspath(os.path.expanduser(cluster_config_file_path)),
+            "cluster_selection": list(cluster_selection),
+            **arguments,
+        },
+        optic_settings.get("daemon_socket"),
+    )
+
+
+def watch_info(
+    kind,
+    fetch,
+    table,
+    interval,
+    output_format,
+    cluster_config_file_path,
+    cluster_selection,
+    optic_settings,
+):
+    """
+    Displays information about the selected clusters every interval seconds until
+    interrupted, keeping the clusters between updates
+
+    :param str kind: cluster, index, or alias
+    :param Callable fetch: function returning the records of a list of clusters
+    :param WatchTable table: table displaying the records
+    :param int interval: seconds between updates
+    :param str output_format: output format (only table is supported)
+    :param str cluster_config_file_path: path of the cluster configuration file
+    :param tuple cluster_selection: cluster or cluster group names (all if empty)
+    :param dict optic_settings: optic settings
+    :return: None
+    :rtype: None
+    :raises click.UsageError: if the output format is not table
+    """
+    if output_format != "table":
+        raise click.UsageError("--watch only supports table output")
+    from optic.cluster.cluster import INFO_PROPERTIES
+    from optic.common.watch import watch_clusters
+
+    selected_clusters = select_clusters(
+        cluster_config_file_path, cluster_selection, optic_settings
+    )
+    try:
+        watch_clusters(fetch, selected_clusters, INFO_PROPERTIES[kind], table, interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def validate_sort_by(ctx, param, value) -> tuple:
+    """
+    Validates index sort keys (e.g. age, or age:desc)
+
+    :param click.Context ctx: click context
+    :param click.Parameter param: sort option
+    :param tuple value: sort keys
+    :return: lowercase sort keys
+    :rtype: tuple
+    :raises click.BadParameter: if a sort key is not recognized
+    """
+    if not value:
+        return ()
+    from optic.index.index_service import parse_sort_key
+
+    try:
+        for sort_key in value:
+            parse_sort_key(sort_key)
+    except OpticError as err:
+        raise click.BadParameter(str(err)) from err
+    return tuple(sort_key.lower() for sort_key in value)
+
+
 def get_default_from_optic_settings(setting_name) -> type[Option] | None:
     """
     Constructs custom class to support default values for cli options
@@ -100,6 +228,7 @@ def cli(ctx, optic_settings_file_path):
 @click.pass_context
 def init(ctx, cluster_config_file_path):
     """Initialize OPTIC settings,  configuration, and shell completion"""
+    from optic.initialize.initialize_service import initialize_optic
 
     optic_settings = ctx.obj["optic_settings"]
     try:
@@ -114,6 +243,43 @@ def init(ctx, cluster_config_file_path):
 # END: initialize command (No tool domain)
 
 
+# BEGIN: serve command (No tool domain)
+@cli.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    help="Unix socket the daemon listens on  [default: daemon_socket setting]",
+)
+@click.option(
+    "--port",
+    type=click.IntRange(min=1, max=65535),
+    help="listen on this localhost HTTP port instead of the Unix socket, answering "
+    "queries with the daemon cluster configuration file and settings only",
+)
+@click.option(
+    "--refresh-interval",
+    type=click.IntRange(min=0),
+    help="seconds between background refreshes of the clusters queried, "
+    "0 disables background refreshes  [default: daemon_refresh_interval setting]",
+)
+@click.pass_context
+def serve(ctx, socket_path, port, refresh_interval):
+    """Answer info queries from warm cluster state until interrupted"""
+    from optic.serve.serve_service import run_daemon
+
+    optic_settings = read_optic_settings(ctx)
+    if refresh_interval is None:
+        refresh_interval = optic_settings["daemon_refresh_interval"]
+    try:
+        run_daemon(optic_settings, socket_path, port, refresh_interval)
+    except OpticError as e:
+        print(e)
+        exit(1)
+
+
+# END: serve command (No tool domain)
+
+
 # BEGIN: Cluster Tool Domain
 @cli.group(help="cluster: actions related to OpenSearch clusters")
 @click.pass_context
@@ -137,6 +303,7 @@ def cluster(ctx):
     "cluster_selection",
     multiple=True,
     default=(),
+    shell_complete=complete_cluster_selection,
     help="filter results to specific cluster(s) and/or group(s). "
     "Argument can be used multiple times. ",
 )
@@ -147,20 +314,110 @@ def cluster(ctx):
     help="disable terminal color output",
     show_default=True,
 )
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    cls=get_default_from_optic_settings("max_concurrency"),
+    help="maximum number of clusters queried at the same time",
+    show_default=True,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="do not read or write cached OpenSearch responses",
+)
+@click.option(
+    "--refresh",
+    "refresh_cache",
+    is_flag=True,
+    help="ignore cached OpenSearch responses and refresh the cache",
+)
+@click.option(
+    "--watch",
+    "watch_interval",
+    type=click.IntRange(min=1),
+    metavar="SECONDS",
+    help="update the table every SECONDS seconds until interrupted, only retrieving "
+    "again what it shows and highlighting what changed",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default="table",
+    help="output format (json, ndjson and csv are written as clusters are "
+    "retrieved, arrow and parquet require pyarrow)",
+    show_default=True,
+)
 @click.pass_context
-def info(ctx, cluster_config_file_path, cluster_selection, no_color):
+def info(
+    ctx,
+    cluster_config_file_path,
+    cluster_selection,
+    no_color,
+    max_concurrency,
+    no_cache,
+    refresh_cache,
+    watch_interval,
+    output_format,
+):
 
     optic_settings = ctx.obj["optic_settings"]
     optic_settings["no_color"] = no_color
-    cluster_config = read_cluster_configuration(cluster_config_file_path)
+    optic_settings["no_cache"] = no_cache
+    optic_settings["refresh_cache"] = refresh_cache
 
     """Prints status of all clusters in configuration file"""
+    from optic.cluster.cluster_service import (
+        CLUSTER_INFO_FIELDS,
+        get_cluster_info,
+        print_cluster_info,
+    )
+    from optic.common.concurrency import recording_failures
+
     try:
-        selected_clusters = get_selected_clusters(
-            cluster_config, list(cluster_selection)
-        )
-        cluster_info = get_cluster_info(selected_clusters)
-        print_cluster_info(cluster_info, optic_settings)
+        if watch_interval:
+            from optic.common.watch import WatchTable
+
+            watch_info(
+                "cluster",
+                lambda clusters: get_cluster_info(clusters, max_concurrency),
+                WatchTable(
+                    "Cluster Info",
+                    {"name": "Cluster", "status": "Status", "usage": "Storage Use (%)"},
+                    ("name",),
+                    no_color,
+                ),
+                watch_interval,
+                output_format,
+                cluster_config_file_path,
+                cluster_selection,
+                optic_settings,
+            )
+            return
+        with (
+            recording_failures() as failed_clusters,
+            data_output(output_format) as output,
+        ):
+            cluster_info = query_running_daemon(
+                "/cluster/info",
+                optic_settings,
+                cluster_config_file_path,
+                cluster_selection,
+                max_concurrency=max_concurrency,
+            )
+            if cluster_info is None:
+                selected_clusters = select_clusters(
+                    cluster_config_file_path, cluster_selection, optic_settings
+                )
+                cluster_info = get_cluster_info(selected_clusters, max_concurrency)
+            if output_format == "table":
+                print_cluster_info(cluster_info, optic_settings)
+            else:
+                write_records(cluster_info, output_format, output, CLUSTER_INFO_FIELDS)
+        if failed_clusters:
+            exit(1)
     except OpticError as e:
         print(e)
         exit(1)
@@ -193,6 +450,7 @@ def index(ctx):
     "cluster_selection",
     multiple=True,
     default=(),
+    shell_complete=complete_cluster_selection,
     help="filter results to specific cluster(s) and/or group(s). "
     "Argument can be used multiple times. ",
 )
@@ -200,6 +458,7 @@ def index(ctx):
     "-p",
     "--search-pattern",
     cls=get_default_from_optic_settings("search_pattern"),
+    shell_complete=complete_search_pattern,
     help="specify a glob search pattern for indices",
     show_default=True,
 )
@@ -239,6 +498,16 @@ def index(ctx):
 )
 @click.option("--min-doc-count", type=int, help="filter by minimum number of documents")
 @click.option("--max-doc-count", type=int, help="filter by maximum number of documents")
+@click.option(
+    "--health",
+    type=click.Choice(["green", "yellow", "red"], case_sensitive=False),
+    help="filter by index health (applied by OpenSearch)",
+)
+@click.option(
+    "--status",
+    type=click.Choice(["open", "close"], case_sensitive=False),
+    help="filter by index status (applied by OpenSearch)",
+)
 @click.option(
     "-t",
     "--type-filter",
@@ -253,21 +522,74 @@ def index(ctx):
     "--sort-by",
     multiple=True,
     default=(),
-    type=click.Choice(
-        [
-            "age",
-            "name",
-            "write-alias",
-            "index-size",
-            "shard-size",
-            "doc-count",
-            "type",
-            "primary-shards",
-            "replica-shards",
-        ],
-        case_sensitive=False,
-    ),
-    help="Specify field(s) to sort by",
+    type=str,
+    callback=validate_sort_by,
+    help="Specify field(s) to sort by, optionally followed by :asc or :desc "
+    "(age, name, write-alias, index-size, shard-size, doc-count, type, "
+    "primary-shards, replica-shards).  Example: -s index-size:desc",
+)
+@click.option(
+    "--explain",
+    is_flag=True,
+    help="show which filters and sorting are done by OpenSearch and which locally",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    help="only display the first N indices in sort order.  "
+    "Example: -s shard-size:desc --top 20",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="display indices as they are retrieved instead of once every cluster "
+    "answered (column widths are estimated from the first indices)",
+)
+@click.option(
+    "-f",
+    "--field",
+    "fields",
+    multiple=True,
+    default=(),
+    type=click.Choice(list(INDEX_INFO_FIELDS), case_sensitive=False),
+    help="Specify field(s) to display (default: all fields except aliases). "
+    "Aliases are only retrieved when needed",
+)
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    cls=get_default_from_optic_settings("max_concurrency"),
+    help="maximum number of clusters queried at the same time",
+    show_default=True,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="do not read or write cached OpenSearch responses",
+)
+@click.option(
+    "--refresh",
+    "refresh_cache",
+    is_flag=True,
+    help="ignore cached OpenSearch responses and refresh the cache",
+)
+@click.option(
+    "--watch",
+    "watch_interval",
+    type=click.IntRange(min=1),
+    metavar="SECONDS",
+    help="update the table every SECONDS seconds until interrupted, only retrieving "
+    "again what it shows and highlighting what changed",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default="table",
+    help="output format (json, ndjson and csv are written as indices are "
+    "retrieved, arrow and parquet require pyarrow)",
+    show_default=True,
 )
 @click.pass_context
 def info(
@@ -284,9 +606,20 @@ def info(
     max_shard_size,
     min_doc_count,
     max_doc_count,
+    health,
+    status,
     type_filter,
     sort_by,
+    explain,
+    top,
+    stream,
+    fields,
     no_color,
+    max_concurrency,
+    no_cache,
+    refresh_cache,
+    watch_interval,
+    output_format,
 ):
 
     # the initial settings and defaults are read from the optic settings file
@@ -294,10 +627,20 @@ def info(
 
     optic_settings = ctx.obj["optic_settings"]
     optic_settings["no_color"] = no_color
+    optic_settings["no_cache"] = no_cache
+    optic_settings["refresh_cache"] = refresh_cache
     optic_settings["search_pattern"] = search_pattern
-    cluster_config = read_cluster_configuration(cluster_config_file_path)
 
     """Get Index information"""
+    from optic.common.concurrency import recording_failures
+    from optic.index.index_service import (
+        explain_index_query,
+        get_index_info,
+        iter_index_info,
+        print_index_info,
+        print_index_info_stream,
+    )
+
     try:
         filters = {
             "write_alias_only": write_alias_only,
@@ -310,17 +653,112 @@ def info(
             "min_doc_count": min_doc_count,
             "max_doc_count": max_doc_count,
             "type_filter": list(type_filter),
+            "health": health,
+            "status": status,
         }
         sort_by = list(sort_by)
-        selected_clusters = get_selected_clusters(
-            cluster_config, list(cluster_selection)
+        fields = [field.lower() for field in fields] or None
+        # index names seen are recorded for shell completion of -p
+        index_names = (
+            {} if fields is None or {"name", "cluster"} <= set(fields) else None
         )
-
-        for cluster in selected_clusters:
-            configure_cluster(cluster, optic_settings)
-
-        index_info = get_index_info(selected_clusters, filters, sort_by)
-        print_index_info(index_info, optic_settings)
+        if watch_interval:
+            from optic.common.watch import WatchTable
+
+            watch_info(
+                "index",
+                lambda clusters: get_index_info(
+                    clusters,
+                    filters,
+                    sort_by,
+                    max_concurrency,
+                    fields,
+                    optic_settings.get("byte_type"),
+                    top,
+                ),
+                WatchTable(
+                    "Index Info",
+                    {
+                        field: INDEX_INFO_FIELDS[field]
+                        for field in selected_index_fields(fields)
+                    },
+                    ("cluster", "name"),
+                    no_color,
+                ),
+                watch_interval,
+                output_format,
+                cluster_config_file_path,
+                cluster_selection,
+                optic_settings,
+            )
+            return
+
+        with (
+            recording_failures() as failed_clusters,
+            data_output(output_format) as output,
+        ):
+            index_info = None
+            if not explain:
+                index_info = query_running_daemon(
+                    "/index/info",
+                    optic_settings,
+                    cluster_config_file_path,
+                    cluster_selection,
+                    max_concurrency=max_concurrency,
+                    filters=filters,
+                    sort_by=sort_by,
+                    fields=fields,
+                    top=top,
+                )
+            if index_info is None:
+                selected_clusters = select_clusters(
+                    cluster_config_file_path, cluster_selection, optic_settings
+                )
+                if explain:
+                    print(
+                        "\n".join(
+                            explain_index_query(
+                                selected_clusters, filters, sort_by, fields
+                            )
+                        )
+                    )
+                arguments = (
+                    selected_clusters,
+                    filters,
+                    sort_by,
+                    max_concurrency,
+                    fields,
+                    optic_settings.get("byte_type"),
+                    top,
+                )
+                if output_format == "table" and not stream:
+                    # the table is only printed once every cluster answered
+                    index_info = get_index_info(*arguments)
+                else:
+                    # records are written while clusters are queried, in cluster
+                    # order unless --stream writes them in the order clusters answer
+                    index_info = iter_index_info(*arguments, ordered=not stream)
+            index_info = collect_names(index_info, index_names, "cluster", "name")
+            if output_format != "table":
+                write_records(
+                    index_info,
+                    output_format,
+                    output,
+                    selected_index_fields(fields),
+                )
+            elif stream:
+                print_index_info_stream(index_info, optic_settings["no_color"], fields)
+            else:
+                print_index_info(list(index_info), optic_settings["no_color"], fields)
+        if index_names:
+            remember_names(
+                "indices",
+                index_names,
+                search_pattern,
+                complete=top is None and not any(filters.values()),
+            )
+        if failed_clusters:
+            exit(1)
     except OpticError as e:
         print(e)
         exit(1)
@@ -353,6 +791,7 @@ def alias(ctx):
     "cluster_selection",
     multiple=True,
     default=(),
+    shell_complete=complete_cluster_selection,
     help="filter results to specific cluster(s) and/or group(s). "
     "Argument can be used multiple times. ",
 )
@@ -360,6 +799,7 @@ def alias(ctx):
     "-p",
     "--search-pattern",
     cls=get_default_from_optic_settings("search_pattern"),
+    shell_complete=complete_search_pattern,
     help="specify a glob search pattern for indices",
     show_default=True,
 )
@@ -370,26 +810,135 @@ def alias(ctx):
     help="disable terminal color output",
     show_default=True,
 )
+@click.option(
+    "--max-concurrency",
+    type=click.IntRange(min=1),
+    cls=get_default_from_optic_settings("max_concurrency"),
+    help="maximum number of clusters queried at the same time",
+    show_default=True,
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="do not read or write cached OpenSearch responses",
+)
+@click.option(
+    "--refresh",
+    "refresh_cache",
+    is_flag=True,
+    help="ignore cached OpenSearch responses and refresh the cache",
+)
+@click.option(
+    "--watch",
+    "watch_interval",
+    type=click.IntRange(min=1),
+    metavar="SECONDS",
+    help="update the table every SECONDS seconds until interrupted, only retrieving "
+    "again what it shows and highlighting what changed",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS, case_sensitive=False),
+    default="table",
+    help="output format (formats other than table have one record per alias "
+    "target, arrow and parquet require pyarrow)",
+    show_default=True,
+)
 @click.pass_context
-def info(ctx, cluster_config_file_path, cluster_selection, search_pattern, no_color):
+def info(
+    ctx,
+    cluster_config_file_path,
+    cluster_selection,
+    search_pattern,
+    no_color,
+    max_concurrency,
+    no_cache,
+    refresh_cache,
+    watch_interval,
+    output_format,
+):
     """Prints information about aliases in use"""
 
     optic_settings = ctx.obj["optic_settings"]
     optic_settings["no_color"] = no_color
+    optic_settings["no_cache"] = no_cache
+    optic_settings["refresh_cache"] = refresh_cache
     optic_settings["search_pattern"] = search_pattern
-    cluster_config = read_cluster_configuration(cluster_config_file_path)
+    from optic.alias.alias_service import (
+        ALIAS_RECORD_FIELDS,
+        get_alias_info,
+        iter_alias_records,
+        print_alias_info,
+    )
+    from optic.common.concurrency import recording_failures
 
     try:
-        cluster_config = read_cluster_config(cluster_config_file_path)
-        selected_clusters = get_selected_clusters(
-            cluster_config, list(cluster_selection)
-        )
-
-        for cluster in selected_clusters:
-            configure_cluster(cluster, optic_settings)
-
-        alias_info = get_alias_info(selected_clusters)
-        print_alias_info(alias_info, no_color)
+        if watch_interval:
+            from optic.common.watch import WatchTable
+
+            watch_info(
+                "alias",
+                lambda clusters: iter_alias_records(
+                    get_alias_info(clusters, max_concurrency)
+                ),
+                WatchTable(
+                    "Alias Info",
+                    {
+                        "alias": "Alias",
+                        "index_name": "Target Index",
+                        "write_target": "Write Target",
+                        "filter": "Filter",
+                        "routing_index": "Routing Index",
+                        "routing_search": "Routing Search",
+                        "cluster_name": "Cluster",
+                    },
+                    ("cluster_name", "alias", "index_name"),
+                    no_color,
+                ),
+                watch_interval,
+                output_format,
+                cluster_config_file_path,
+                cluster_selection,
+                optic_settings,
+            )
+            return
+        with (
+            recording_failures() as failed_clusters,
+            data_output(output_format) as output,
+        ):
+            alias_info = query_running_daemon(
+                "/alias/info",
+                optic_settings,
+                cluster_config_file_path,
+                cluster_selection,
+                max_concurrency=max_concurrency,
+            )
+            if alias_info is None:
+                selected_clusters = select_clusters(
+                    cluster_config_file_path, cluster_selection, optic_settings
+                )
+                alias_info = get_alias_info(selected_clusters, max_concurrency)
+            alias_names = {}
+            for alias in alias_info:
+                for alias_name, targets in alias.items():
+                    for target in targets:
+                        alias_names.setdefault(target["cluster_name"], set()).add(
+                            alias_name
+                        )
+            remember_names("aliases", alias_names, search_pattern)
+            if output_format == "table":
+                print_alias_info(alias_info, no_color)
+            else:
+                write_records(
+                    iter_alias_records(alias_info),
+                    output_format,
+                    output,
+                    ALIAS_RECORD_FIELDS,
+                )
+        if failed_clusters:
+            exit(1)
     except OpticError as e:
         print(e)
         exit(1)
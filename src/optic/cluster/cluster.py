@@ -4,10 +4,75 @@
 # ** Licensed under the Universal Permissive License v 1.0
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
-from optic.alias.alias import Alias
-from optic.common.api import OpenSearchAction
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from optic.alias.alias import Alias, AliasTarget
+from optic.alias.alias_index import AliasIndex
+from optic.common.api import (
+    DEFAULT_POOL_LIFETIME,
+    DEFAULT_POOL_SIZE,
+    OpenSearchAction,
+)
+from optic.common.cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_CACHE_MAX_SIZE_MB,
+    ResponseCache,
+)
 from optic.common.exceptions import OpticDataError
+from optic.common.record import ResponseRecord
 from optic.index.index import Index
+from optic.index.index_table import CAT_COLUMNS, IndexTable, now_millis
+
+if TYPE_CHECKING:
+    from optic.common.async_api import AsyncOpenSearchAction
+
+HEALTH_QUERY = "/_cluster/health?pretty"
+ALLOCATION_QUERY = "/_cat/allocation?h=disk.used,disk.total&format=json&bytes=mb"
+
+# _cluster/health response fields kept by ClusterHealth
+HEALTH_FIELDS = (
+    "cluster_name",
+    "status",
+    "timed_out",
+    "number_of_nodes",
+    "number_of_data_nodes",
+    "discovered_master",
+    "discovered_cluster_manager",
+    "active_primary_shards",
+    "active_shards",
+    "relocating_shards",
+    "initializing_shards",
+    "unassigned_shards",
+    "delayed_unassigned_shards",
+    "number_of_pending_tasks",
+    "number_of_in_flight_fetch",
+    "task_max_waiting_in_queue_millis",
+    "active_shards_percent_as_number",
+)
+
+# Lazily fetched properties each info tool reads from a cluster
+INFO_PROPERTIES = {
+    "cluster": ("health", "storage_percent"),
+    "index": ("index_table", "alias_list"),
+    "alias": ("alias_list",),
+}
+
+# Lazily fetched properties retrieved from the cluster, whose time of retrieval is
+# recorded in Cluster.fetched_at
+FETCHED_PROPERTIES = ("health", "storage_percent", "index_table", "alias_list")
+
+# Properties calculated from other properties, forgotten along with them
+_DEPENDENT_PROPERTIES = {
+    "index_table": ("index_list",),
+    "alias_list": ("alias_index", "write_alias_targets"),
+}
+_SOURCE_PROPERTIES = {
+    dependent: name
+    for name, dependents in _DEPENDENT_PROPERTIES.items()
+    for dependent in dependents
+}
 
 
 def configure_cluster(cluster, settings):
@@ -18,27 +83,15 @@ def configure_cluster(cluster, settings):
 
     """
     for setting, value in settings.items():
-        if hasattr(cluster, setting) and value:
+        if hasattr(cluster, setting) and value is not None:
             setattr(cluster, setting, value)
     return cluster
 
 
-class ClusterHealth:
-    def __init__(self, **kwargs):
-        self._set_properties_from_response(**kwargs)
+class ClusterHealth(ResponseRecord):
+    __slots__ = HEALTH_FIELDS
 
-    def _set_properties_from_response(self, **kwargs) -> None:
-        """
-        Dynamically sets attributes based off API Response dictionary
-
-        :param dict kwargs: dictionary with response attributes
-        :return: None
-        :rtype: None
-        """
-        for key, value in kwargs.items():
-            if isinstance(value, str) and value.isdigit():
-                value = int(value)
-            setattr(self, key, value)
+    FIELDS = {field: field for field in HEALTH_FIELDS}
 
 
 class Cluster:
@@ -51,6 +104,15 @@ class Cluster:
         byte_type=None,  # remove this?
         search_pattern=None,
         index_type_patterns=None,
+        pool_size=None,
+        pool_lifetime=None,
+        cache_ttl=None,
+        cache_dir=None,
+        cache_max_size_mb=None,
+        no_cache=False,
+        refresh_cache=False,
+        property_ttl=None,
+        keep_unknown_fields=False,
     ):
         self.url = url
         self.auth = auth
@@ -59,11 +121,29 @@ class Cluster:
         self.byte_type = byte_type
         self.search_pattern = search_pattern or "*"
         self.index_type_patterns = index_type_patterns or {}
-
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        # 0 never recycles the pooled session
+        self.pool_lifetime = (
+            DEFAULT_POOL_LIFETIME if pool_lifetime is None else pool_lifetime
+        )
+        self.cache_ttl = cache_ttl or {}
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.cache_max_size_mb = cache_max_size_mb or DEFAULT_CACHE_MAX_SIZE_MB
+        self.no_cache = no_cache
+        self.refresh_cache = refresh_cache
+        self.property_ttl = property_ttl or {}
+        self.keep_unknown_fields = keep_unknown_fields
+        self.fetched_at = {}
+
+        self._cache = None
+        self._cache_settings = None
         self._health = None
         self._storage_percent = None
+        self._index_table = None
         self._index_list = None
         self._alias_list = None
+        self._alias_index = None
+        self._write_alias_targets = None
 
     def _calculate_storage_percent(self, disk_list) -> int:
         """
@@ -89,6 +169,85 @@ class Cluster:
             )
         return int(round(100 * (float(used) / float(total))))
 
+    @property
+    def cache(self) -> ResponseCache | None:
+        """
+        Returns the on-disk response cache used for the cluster, if caching is enabled
+
+        The cache is created once, and again only if the cache settings change
+
+        :return: ResponseCache object or None
+        :rtype: ResponseCache | None
+        """
+        if self.no_cache or not self.cache_ttl:
+            return None
+        settings = (
+            tuple(self.cache_ttl.items()),
+            self.cache_dir,
+            self.cache_max_size_mb,
+        )
+        if self._cache is None or settings != self._cache_settings:
+            self._cache = ResponseCache(
+                cache_dir=self.cache_dir,
+                ttl=self.cache_ttl,
+                max_size_mb=self.cache_max_size_mb,
+            )
+            self._cache_settings = settings
+        return self._cache
+
+    def _action(self, query) -> OpenSearchAction:
+        """
+        Constructs an OpenSearchAction for the cluster that uses its pooled session
+
+        :param str query: string added to the end of the cluster url
+        :return: OpenSearchAction object
+        :rtype: OpenSearchAction
+        """
+        return OpenSearchAction(
+            url=self.url,
+            usr=self.auth["username"],
+            pwd=self.auth["password"],
+            verify_ssl=self.verify_ssl,
+            query=query,
+            pool_size=self.pool_size,
+            pool_lifetime=self.pool_lifetime,
+            cache=self.cache,
+            refresh_cache=self.refresh_cache,
+        )
+
+    def _async_action(self, query) -> "AsyncOpenSearchAction":
+        """
+        Constructs an AsyncOpenSearchAction for the cluster that uses its pooled connector
+
+        :param str query: string added to the end of the cluster url
+        :return: AsyncOpenSearchAction object
+        :rtype: AsyncOpenSearchAction
+        """
+        # imported here so that aiohttp is only loaded by the asynchronous API
+        from optic.common.async_api import AsyncOpenSearchAction
+
+        return AsyncOpenSearchAction(
+            url=self.url,
+            usr=self.auth["username"],
+            pwd=self.auth["password"],
+            verify_ssl=self.verify_ssl,
+            query=query,
+            pool_size=self.pool_size,
+            pool_lifetime=self.pool_lifetime,
+            cache=self.cache,
+            refresh_cache=self.refresh_cache,
+        )
+
+    @property
+    def session(self):
+        """
+        Returns the pooled keep-alive session shared by all requests to the cluster
+
+        :return: pooled session
+        :rtype: requests.Session
+        """
+        return self._action("").session
+
     @property
     def health(self) -> ClusterHealth:
         """
@@ -97,16 +256,16 @@ class Cluster:
         :return: Cluster Health object
         :rtype: ClusterHealth
         """
-        if not self._health:
+        self._expire("health")
+        if self._health is None:
             print("Getting cluster health for", self.name)
-            api = OpenSearchAction(
-                url=self.url,
-                usr=self.auth["username"],
-                pwd=self.auth["password"],
-                verify_ssl=self.verify_ssl,
-                query="/_cluster/health?pretty",
+            api = self._action(HEALTH_QUERY)
+            self._fetched(
+                "health",
+                ClusterHealth(
+                    keep_unknown_fields=self.keep_unknown_fields, **api.response
+                ),
             )
-            self._health = ClusterHealth(**api.response)
 
         return self._health
 
@@ -118,19 +277,32 @@ class Cluster:
         :return: storage percentage (0%-100%)
         :rtype: int
         """
-        if not self._storage_percent:
+        self._expire("storage_percent")
+        if self._storage_percent is None:
             print("Getting storage percent for", self.name)
-            api = OpenSearchAction(
-                url=self.url,
-                usr=self.auth["username"],
-                pwd=self.auth["password"],
-                verify_ssl=self.verify_ssl,
-                query="/_cat/allocation?h=disk.used,disk.total&format=json&bytes=mb",
+            api = self._action(ALLOCATION_QUERY)
+            self._fetched(
+                "storage_percent", self._calculate_storage_percent(api.response)
             )
-            self._storage_percent = self._calculate_storage_percent(api.response)
 
         return self._storage_percent
 
+    @property
+    def index_table(self) -> IndexTable:
+        """
+        Returns table of index information associated with cluster
+
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        self._expire("index_table")
+        if self._index_table is None:
+            api = self._action(self._index_list_query())
+            print("Getting cluster index list for", self.name)
+            self._fetched("index_table", self._build_index_table(api.iter_rows()))
+
+        return self._index_table
+
     @property
     def index_list(self) -> list:
         """
@@ -139,40 +311,9 @@ class Cluster:
         :return: list of Index objects
         :rtype: list
         """
-        if not self._index_list:
-            index_list = []
-            api = OpenSearchAction(
-                url=self.url,
-                usr=self.auth["username"],
-                pwd=self.auth["password"],
-                verify_ssl=self.verify_ssl,
-                query="/_cat/indices/"
-                + self.search_pattern
-                + "?format=json&h=health,status,index,uuid,pri,rep,docs.count,"
-                "docs.deleted,store.size,pri.store.size,creation.date.string",
-            )
-
-            # Create map for index -> write_target_alias?
-            index_to_write_target = {}
-            aliases = self.alias_list
-            for alias in aliases:
-                for write_target in alias.write_targets:
-                    index_to_write_target[write_target.index] = True
-
-            print("Getting cluster index list for", self.name)
-            for index_info in api.response:
-                index_list.append(
-                    Index(
-                        cluster_name=self.name,
-                        index_name=index_info["index"],
-                        write_alias=index_to_write_target.get(
-                            index_info["index"], False
-                        ),
-                        index_type_patterns=self.index_type_patterns,
-                        info_response=index_info,
-                    )
-                )
-            self._index_list = index_list
+        self._expire("index_table")
+        if self._index_list is None:
+            self._index_list = self._build_index_list(self.index_table)
 
         return self._index_list
 
@@ -184,78 +325,441 @@ class Cluster:
         :return: list of Alias objects
         :rtype: list
         """
-        if not self._alias_list:
-            alias_list = []
-            api = OpenSearchAction(
-                url=self.url,
-                usr=self.auth["username"],
-                pwd=self.auth["password"],
-                verify_ssl=self.verify_ssl,
-                query="/_cat/aliases/" + self.search_pattern + "?format=json",
+        self._expire("alias_list")
+        if self._alias_list is None:
+            api = self._action(self._alias_list_query())
+            print("Getting cluster alias list for", self.name)
+            self._fetched("alias_list", self._build_alias_list(api.iter_rows()))
+
+        return self._alias_list
+
+    @property
+    def alias_index(self) -> AliasIndex:
+        """
+        Returns the bidirectional index of the cluster aliases (alias -> targets,
+        index -> aliases)
+
+        :return: AliasIndex object
+        :rtype: AliasIndex
+        """
+        self._expire("alias_list")
+        if self._alias_index is None:
+            self._alias_index = AliasIndex(self.alias_list)
+        return self._alias_index
+
+    @property
+    def write_alias_targets(self) -> set:
+        """
+        Returns names of the indices that are write targets of an alias
+
+        :return: set of index names
+        :rtype: set
+        """
+        self._expire("alias_list")
+        if self._write_alias_targets is None:
+            self._write_alias_targets = self.alias_index.write_targets
+        return self._write_alias_targets
+
+    def index_aliases(self, index_name) -> str:
+        """
+        Returns the aliases pointing to an index, as reported by index info
+
+        :param str index_name: name of the index
+        :return: comma-separated alias names (empty if there are none)
+        :rtype: str
+        """
+        return ",".join(self.alias_index.alias_names(index_name))
+
+    def is_write_alias_target(self, index_name) -> bool:
+        """
+        Returns whether an index is the write target of an alias
+
+        :param str index_name: name of the index
+        :return: True if index is a write alias target
+        :rtype: bool
+        """
+        return index_name in self.write_alias_targets
+
+    def _fetched(self, name, value) -> None:
+        """
+        Keeps a property retrieved from the cluster, recording when it was retrieved
+
+        :param str name: name of the property (one of FETCHED_PROPERTIES)
+        :param value: retrieved value
+        :return: None
+        :rtype: None
+        """
+        setattr(self, "_" + name, value)
+        self.fetched_at[name] = time.time()
+
+    def _expire(self, name) -> None:
+        """
+        Forgets a property retrieved from the cluster once its time to live
+        (property_ttl) has elapsed
+
+        :param str name: name of the property (one of FETCHED_PROPERTIES)
+        :return: None
+        :rtype: None
+        """
+        ttl = self.property_ttl.get(name)
+        fetched_at = self.fetched_at.get(name)
+        if ttl is not None and fetched_at is not None:
+            if time.time() - fetched_at >= ttl:
+                self.invalidate(name)
+
+    def invalidate(self, *properties) -> None:
+        """
+        Forgets lazily fetched properties (e.g. "health", "alias_list"), so that
+        they are retrieved again the next time they are used
+
+        Properties calculated from another property (e.g. "index_list") are
+        forgotten along with the property they are calculated from.
+
+        :param str properties: names of the properties to forget (every property if none)
+        :return: None
+        :rtype: None
+        """
+        for name in properties or FETCHED_PROPERTIES:
+            name = _SOURCE_PROPERTIES.get(name, name)
+            for forgotten in (name, *_DEPENDENT_PROPERTIES.get(name, ())):
+                setattr(self, "_" + forgotten, None)
+            self.fetched_at.pop(name, None)
+
+    def refresh(self, *properties) -> None:
+        """
+        Retrieves lazily fetched properties again, at the same time
+
+        Cached responses are ignored, so that the properties are up to date even
+        within the cache time to live.  The new responses are cached
+
+        :param str properties: names of the properties to retrieve (every property
+            retrieved so far if none)
+        :return: None
+        :rtype: None
+        :raises OpticError: if retrieving any of the properties fails
+        """
+        properties = properties or tuple(self.fetched_at)
+        self.invalidate(*properties)
+        refresh_cache = self.refresh_cache
+        self.refresh_cache = True
+        try:
+            self.fetch(*properties)
+        finally:
+            self.refresh_cache = refresh_cache
+
+    def fetch(self, *properties) -> None:
+        """
+        Retrieves several lazily fetched properties (e.g. "index_list", "alias_list")
+        at the same time instead of one after another
+
+        :param str properties: names of the properties to retrieve
+        :return: None
+        :rtype: None
+        :raises OpticError: if retrieving any of the properties fails
+        """
+        with ThreadPoolExecutor(max_workers=max(len(properties), 1)) as pool:
+            futures = [pool.submit(getattr, self, name) for name in properties]
+        for future in futures:
+            future.result()
+
+    def fetch_index_table(self, with_write_alias=False, query_plan=None) -> IndexTable:
+        """
+        Returns table of index information associated with cluster, retrieving the
+        cluster aliases at the same time as the indices when write alias information
+        is needed
+
+        If the index table has not been retrieved yet and a query plan is given, only
+        the indices and columns selected by the plan are retrieved.  That partial
+        table is returned without being kept as the cluster index table
+
+        :param bool with_write_alias: whether write alias information will be needed
+        :param IndexQueryPlan query_plan: plan of the _cat/indices query
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        self._expire("index_table")
+        if self._index_table is not None or query_plan is None:
+            if with_write_alias and self._index_table is None:
+                self.fetch("index_table", "alias_list")
+            return self.index_table
+
+        def planned_index_table():
+            api = self._action(query_plan.query(self.search_pattern))
+            print("Getting cluster index list for", self.name)
+            return self._build_index_table(api.iter_rows(), query_plan)
+
+        if not with_write_alias:
+            return planned_index_table()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            alias_list = pool.submit(getattr, self, "alias_list")
+            index_table = pool.submit(planned_index_table)
+        alias_list.result()
+        return index_table.result()
+
+    async def async_fetch_index_table(
+        self, with_write_alias=False, query_plan=None
+    ) -> IndexTable:
+        """
+        Asynchronous variant of fetch_index_table
+
+        :param bool with_write_alias: whether write alias information will be needed
+        :param IndexQueryPlan query_plan: plan of the _cat/indices query
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        import asyncio
+
+        self._expire("index_table")
+        if self._index_table is not None or query_plan is None:
+            if with_write_alias and self._index_table is None:
+                await asyncio.gather(self.async_index_table(), self.async_alias_list())
+            return await self.async_index_table()
+
+        async def planned_index_table():
+            api = self._async_action(query_plan.query(self.search_pattern))
+            print("Getting cluster index list for", self.name)
+            return await self._async_build_index_table(api, query_plan)
+
+        if not with_write_alias:
+            return await planned_index_table()
+        index_table, _ = await asyncio.gather(
+            planned_index_table(), self.async_alias_list()
+        )
+        return index_table
+
+    async def async_health(self) -> ClusterHealth:
+        """
+        Asynchronous variant of health
+
+        :return: Cluster Health object
+        :rtype: ClusterHealth
+        """
+        self._expire("health")
+        if self._health is None:
+            print("Getting cluster health for", self.name)
+            api = self._async_action(HEALTH_QUERY)
+            self._fetched(
+                "health",
+                ClusterHealth(
+                    keep_unknown_fields=self.keep_unknown_fields,
+                    **await api.response(),
+                ),
+            )
+
+        return self._health
+
+    async def async_storage_percent(self) -> int:
+        """
+        Asynchronous variant of storage_percent
+
+        :return: storage percentage (0%-100%)
+        :rtype: int
+        """
+        self._expire("storage_percent")
+        if self._storage_percent is None:
+            print("Getting storage percent for", self.name)
+            api = self._async_action(ALLOCATION_QUERY)
+            self._fetched(
+                "storage_percent",
+                self._calculate_storage_percent(await api.response()),
             )
 
-            """
-            Parse multiple responses that correspond to one alias
-
-            Response:
-            [  {
-                "alias": "alias1",
-                "index": "stockindex",
-                "filter": "-",
-                "routing.index": "-",
-                "routing.search": "-",
-                "is_write_index": "-"
-              },
-              {
-                "alias": "alias1",
-                "index": "students",
-                "filter": "*",
-                "routing.index": "1",
-                "routing.search": "1",
-                "is_write_index": "true"
-              }
-            ]
-
-            ---------------BECOMES------------------
-
-            alias_to_indices:
-            {
-              "alias1" : [
-                  {
-                      "index": "stockindex",
-                      "filter": "-",
-                      "routing.index": "-",
-                      "routing.search": "-",
-                      "is_write_index": "-"
-                  },
-                  {
-                      "index": "students",
-                      "filter": "*",
-                      "routing.index": "1",
-                      "routing.search": "1",
-                      "is_write_index": "true"
-                  }
-              ]
-            }
-            """
+        return self._storage_percent
+
+    async def async_index_table(self) -> IndexTable:
+        """
+        Asynchronous variant of index_table
+
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        self._expire("index_table")
+        if self._index_table is None:
+            api = self._async_action(self._index_list_query())
+            print("Getting cluster index list for", self.name)
+            self._fetched("index_table", await self._async_build_index_table(api))
+
+        return self._index_table
+
+    async def async_index_list(self) -> list:
+        """
+        Asynchronous variant of index_list
+
+        :return: list of Index objects
+        :rtype: list
+        """
+        self._expire("index_table")
+        if self._index_list is None:
+            self._index_list = self._build_index_list(await self.async_index_table())
+
+        return self._index_list
 
+    async def async_alias_list(self) -> list:
+        """
+        Asynchronous variant of alias_list
+
+        :return: list of Alias objects
+        :rtype: list
+        """
+        self._expire("alias_list")
+        if self._alias_list is None:
+            api = self._async_action(self._alias_list_query())
             print("Getting cluster alias list for", self.name)
-            alias_to_indices = {}
-            for alias_info in api.response:
-                if alias_info["alias"] not in alias_to_indices.keys():
-                    alias_to_indices[alias_info["alias"]] = []
-                alias_to_indices[alias_info["alias"]].append(
-                    {key: val for key, val in alias_info.items() if key != "alias"}
-                )
+            self._fetched(
+                "alias_list",
+                self._build_alias_list(
+                    [alias_info async for alias_info in api.iter_rows()]
+                ),
+            )
+
+        return self._alias_list
+
+    async def async_alias_index(self) -> AliasIndex:
+        """
+        Asynchronous variant of alias_index
 
-            for alias_name, alias_info in alias_to_indices.items():
-                alias_list.append(
-                    Alias(
-                        alias_name=alias_name,
-                        cluster_name=self.name,
-                        info_response=alias_info,
-                    )
+        :return: AliasIndex object
+        :rtype: AliasIndex
+        """
+        await self.async_alias_list()
+        return self.alias_index
+
+    def _index_list_query(self) -> str:
+        """
+        Returns the _cat/indices query for the cluster search pattern
+
+        Sizes are requested in bytes and the creation date in epoch milliseconds,
+        so they are only formatted when displayed
+
+        :return: query string
+        :rtype: str
+        """
+        return (
+            "/_cat/indices/"
+            + self.search_pattern
+            + "?format=json&bytes=b&h="
+            + ",".join(CAT_COLUMNS)
+        )
+
+    def _alias_list_query(self) -> str:
+        """
+        Returns the _cat/aliases query for the cluster search pattern
+
+        :return: query string
+        :rtype: str
+        """
+        return "/_cat/aliases/" + self.search_pattern + "?format=json"
+
+    def _build_index_table(self, indices_response, query_plan=None) -> IndexTable:
+        """
+        Constructs the table of index information from a _cat/indices response
+
+        Alias information is only retrieved if the table is asked for it
+
+        :param Iterable indices_response: dictionaries of index information (e.g. streamed rows)
+        :param IndexQueryPlan query_plan: plan of the query the response was retrieved with, if any
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        return IndexTable.from_response(
+            indices_response,
+            cluster_name=self.name,
+            index_type_patterns=self.index_type_patterns,
+            write_alias_lookup=self.is_write_alias_target,
+            aliases_lookup=self.index_aliases,
+            query_plan=query_plan,
+        )
+
+    async def _async_build_index_table(self, api, query_plan=None) -> IndexTable:
+        """
+        Asynchronous variant of _build_index_table, adding rows to the table as the
+        _cat/indices response is streamed
+
+        :param AsyncOpenSearchAction api: _cat/indices action
+        :param IndexQueryPlan query_plan: plan of the query the response is retrieved with, if any
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        index_table = self._build_index_table((), query_plan)
+        async for index_info in api.iter_rows():
+            index_table.append(index_info)
+        return index_table
+
+    def _build_index_list(self, index_table) -> list:
+        """
+        Constructs Index objects from the rows of an index table
+
+        Write alias information is only retrieved if an Index is asked for it
+
+        :param IndexTable index_table: table of index information
+        :return: list of Index objects
+        :rtype: list
+        """
+        # ages of every index are calculated at the same time
+        if index_table.reference_millis is None:
+            index_table.reference_millis = now_millis()
+        index_list = []
+        for index_info in index_table.rows():
+            index_list.append(
+                Index(
+                    cluster_name=self.name,
+                    index_name=index_info["index"],
+                    index_type_patterns=self.index_type_patterns,
+                    info_response=index_info,
+                    write_alias_lookup=self.is_write_alias_target,
+                    reference_millis=index_table.reference_millis,
                 )
-            self._alias_list = alias_list
+            )
+        return index_list
 
-        return self._alias_list
+    def _build_alias_list(self, aliases_response) -> list:
+        """
+        Constructs Alias objects from a _cat/aliases response
+
+        Parse multiple responses that correspond to one alias
+
+        Response:
+        [  {
+            "alias": "alias1",
+            "index": "stockindex",
+            "filter": "-",
+            "routing.index": "-",
+            "routing.search": "-",
+            "is_write_index": "-"
+          },
+          {
+            "alias": "alias1",
+            "index": "students",
+            "filter": "*",
+            "routing.index": "1",
+            "routing.search": "1",
+            "is_write_index": "true"
+          }
+        ]
+
+        ---------------BECOMES------------------
+
+        alias_targets:
+        {
+          "alias1" : [
+              AliasTarget(index="stockindex", filter=False, routing_index=False,
+                          routing_search=False, is_write_index=False),
+              AliasTarget(index="students", filter=True, routing_index="1",
+                          routing_search="1", is_write_index=True)
+          ]
+        }
+
+        :param Iterable aliases_response: dictionaries of alias information
+        :return: list of Alias objects
+        :rtype: list
+        """
+        alias_targets = {}
+        for alias_info in aliases_response:
+            alias_targets.setdefault(alias_info["alias"], []).append(
+                AliasTarget(keep_unknown_fields=self.keep_unknown_fields, **alias_info)
+            )
+
+        return [
+            Alias(alias_name=alias_name, cluster_name=self.name, targets=targets)
+            for alias_name, targets in alias_targets.items()
+        ]
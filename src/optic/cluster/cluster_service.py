@@ -7,6 +7,11 @@
 from terminaltables import AsciiTable
 
 from optic.cluster.cluster import Cluster
+from optic.common.concurrency import (
+    async_map_clusters,
+    map_clusters,
+    report_failures,
+)
 from optic.common.exceptions import OpticConfigurationFileError
 from optic.common.optic_color import OpticColor
 
@@ -64,20 +69,54 @@ def get_selected_clusters(cluster_config, selected_cluster_names):
     return selected_clusters
 
 
-def get_cluster_info(clusters) -> list:
+# Fields of the dictionaries returned by get_cluster_info
+CLUSTER_INFO_FIELDS = ("name", "status", "usage")
+
+
+def get_cluster_info(clusters, max_concurrency=None) -> list:
     """
     Retrieves and packages Cluster information into a list of dictionaries
 
+    Clusters are queried concurrently, and clusters that cannot be reached are
+    reported and left out of the results
+
     :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
     :return: list of dictionaries containing cluster information
     :rtype: list
     """
-    cluster_info = []
-    for cluster in clusters:
+
+    def fetch(cluster):
         usage = cluster.storage_percent
         status = cluster.health.status
-        cluster_info.append({"name": cluster.name, "status": status, "usage": usage})
-    return cluster_info
+        return {"name": cluster.name, "status": status, "usage": usage}
+
+    results, failures = map_clusters(fetch, clusters, max_concurrency)
+    report_failures(failures)
+    return [info for _, info in results]
+
+
+async def async_get_cluster_info(clusters, max_concurrency=None) -> list:
+    """
+    Asynchronous variant of get_cluster_info
+
+    :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :return: list of dictionaries containing cluster information
+    :rtype: list
+    """
+
+    import asyncio
+
+    async def fetch(cluster):
+        usage, health = await asyncio.gather(
+            cluster.async_storage_percent(), cluster.async_health()
+        )
+        return {"name": cluster.name, "status": health.status, "usage": usage}
+
+    results, failures = await async_map_clusters(fetch, clusters, max_concurrency)
+    report_failures(failures)
+    return [info for _, info in results]
 
 
 def print_cluster_info(cluster_info, optic_settings) -> None:
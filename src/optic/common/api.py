@@ -5,6 +5,8 @@
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
 import logging
+import threading
+import time
 
 import requests
 import urllib3
@@ -12,12 +14,116 @@ from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from urllib3.util.retry import Retry
 
+from optic.common.cache import credentials_key
 from optic.common.exceptions import OpticAPIError
+from optic.common.json_stream import STREAM_CHUNK_SIZE, iter_json_array
 
 logging.basicConfig(level=logging.INFO)
 
 urllib3.disable_warnings()
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_LIFETIME = 300
+
+
+class SessionRegistry:
+    def __init__(self):
+        """
+        Keeps one pooled, keep-alive requests.Session per cluster connection so that
+        every OpenSearchAction targeting the same cluster reuses open TCP/TLS connections.
+        Sessions are keyed by URL, credentials, SSL verification mode and retry strategy,
+        and are replaced once they are older than their configured lifetime.
+        """
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        url,
+        usr,
+        pwd,
+        verify_ssl,
+        retries,
+        backoff_factor,
+        status_forcelist,
+        pool_size=DEFAULT_POOL_SIZE,
+        pool_lifetime=DEFAULT_POOL_LIFETIME,
+    ) -> requests.Session:
+        """
+        Returns the pooled session for a cluster connection, creating it if needed
+
+        :param str url: cluster URL
+        :param str usr: username to be used in BasicAuth header
+        :param str pwd: password to be used in BasicAuth header
+        :param bool verify_ssl: SSL verification mode
+        :param int retries: maximum number of retries
+        :param float backoff_factor: backoff factor to apply between retries in seconds
+        :param tuple status_forcelist: HTTP status codes to retry on
+        :param int pool_size: maximum number of connections kept open to the cluster
+        :param int pool_lifetime: seconds before the session is recycled (0 to never recycle)
+        :return: pooled session
+        :rtype: requests.Session
+        """
+        key = (
+            url,
+            usr,
+            pwd,
+            verify_ssl,
+            retries,
+            backoff_factor,
+            tuple(status_forcelist),
+            pool_size,
+        )
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry:
+                session, created = entry
+                if not pool_lifetime or time.monotonic() - created < pool_lifetime:
+                    return session
+                logging.debug(f"recycling pooled session for {url}")
+                session.close()
+
+            retry_strategy = Retry(
+                total=retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=status_forcelist,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size, max_retries=retry_strategy
+            )
+            session = requests.Session()
+            session.auth = HTTPBasicAuth(usr, pwd)
+            session.verify = verify_ssl
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._sessions[key] = (session, time.monotonic())
+            return session
+
+    def close(self) -> None:
+        """
+        Closes and forgets every pooled session
+
+        :return: None
+        :rtype: None
+        """
+        with self._lock:
+            for session, _ in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+session_registry = SessionRegistry()
+
+
+def close_sessions() -> None:
+    """
+    Closes all pooled cluster sessions
+
+    :return: None
+    :rtype: None
+    """
+    session_registry.close()
+
 
 class OpenSearchAction:
     def __init__(
@@ -30,6 +136,11 @@ class OpenSearchAction:
         usr=None,
         pwd=None,
         verify_ssl=True,
+        pool_size=DEFAULT_POOL_SIZE,
+        pool_lifetime=DEFAULT_POOL_LIFETIME,
+        session=None,
+        cache=None,
+        refresh_cache=False,
     ):
         """
         Wraps the methods required to execute REST calls against the OpenSearch API.
@@ -42,6 +153,11 @@ class OpenSearchAction:
             usr (str): username to be used in BasicAuth header
             pwd (str): password to be used in BasicAuth header
             verify_ssl (boolean): set SSL verification mode
+            pool_size (int): maximum number of pooled connections to the cluster
+            pool_lifetime (int): seconds before the pooled session is recycled
+            session (requests.Session): session to use instead of the pooled one
+            cache (ResponseCache): on-disk response cache to read from and write to
+            refresh_cache (boolean): ignore cached responses, but still cache the new response
 
         """
 
@@ -57,8 +173,78 @@ class OpenSearchAction:
             pwd or str()
         )  # Requests 3.0.0 will no longer support None as a password
         self.verify_ssl = verify_ssl
+        self.pool_size = pool_size
+        self.pool_lifetime = pool_lifetime
+        self._session = session
+        self.cache = cache
+        self.refresh_cache = refresh_cache
         self._response = None
 
+    @property
+    def _cache_credentials(self) -> str:
+        """
+        Returns what identifies the credentials of the request in cache keys
+
+        :return: digest of the credentials
+        :rtype: str
+        """
+        return credentials_key(self.usr, self.pwd)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Returns the pooled session used to send the request
+
+        :return: pooled session
+        :rtype: requests.Session
+        """
+        if self._session is None:
+            self._session = session_registry.get(
+                self.url,
+                self.usr,
+                self.pwd,
+                self.verify_ssl,
+                self.retries,
+                self.backoff_factor,
+                self.status_forcelist,
+                pool_size=self.pool_size,
+                pool_lifetime=self.pool_lifetime,
+            )
+        return self._session
+
+    def _send(self, stream=False) -> requests.Response:
+        """
+        Sends the request
+
+        :param bool stream: only read the response headers, leaving the body to be streamed
+        :return: successful response
+        :rtype: requests.Response
+        :raises OpticAPIError: if the request fails or retries are exhausted
+        """
+        url = self.url + self.query
+        logging.debug(
+            f"creating REST request to {url} with "
+            f"{self.retries} retries, backoff {self.backoff_factor}, and ssl verify {self.verify_ssl}"
+        )
+        try:
+            response = self.session.get(
+                url,
+                verify=self.verify_ssl,
+                auth=HTTPBasicAuth(self.usr, self.pwd),
+                timeout=6,
+                stream=stream,
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as err:
+            # Check if retries were exhausted
+            if err.args and isinstance(err.args[0], urllib3.exceptions.MaxRetryError):
+                raise OpticAPIError(
+                    f"Request failed after {self.retries} retries {err}"
+                ) from err
+            else:
+                raise OpticAPIError(f"did not attempt to retry error: {err}") from err
+        return response
+
     @property
     def response(self) -> list | dict:
         """
@@ -68,43 +254,62 @@ class OpenSearchAction:
         :rtype: list | dict
         """
 
-        if not self._response:
-            url = self.url + self.query
-            logging.debug(
-                f"creating REST request to {url} with "
-                f"{self.retries} retries, backoff {self.backoff_factor}, and ssl verify {self.verify_ssl}"
+        if self._response is None and self.cache and not self.refresh_cache:
+            self._response = self.cache.get(
+                self.url, self._cache_credentials, self.query
             )
-            basic_auth = HTTPBasicAuth(self.usr, self.pwd)
-            retry_strategy = Retry(
-                total=self.retries,
-                backoff_factor=self.backoff_factor,
-                status_forcelist=self.status_forcelist,
-            )
-            session = requests.Session()
-            session.mount("https://", HTTPAdapter(max_retries=retry_strategy))
-            session.mount("http://", HTTPAdapter(max_retries=retry_strategy))
-
-            try:
-                self._response = session.get(
-                    url,
-                    verify=self.verify_ssl,
-                    auth=basic_auth,
-                    timeout=6,
+
+        if self._response is None:
+            self._response = self._send().json()
+            if self.cache:
+                self.cache.put(
+                    self.url, self._cache_credentials, self.query, self._response
                 )
-                self._response.raise_for_status()
-            except requests.exceptions.RequestException as err:
-                # Check if retries were exhausted
-                if err.args and isinstance(
-                    err.args[0], urllib3.exceptions.MaxRetryError
-                ):
-                    raise OpticAPIError(
-                        f"Request failed after {self.retries} retries {err}"
-                    ) from err
-                else:
-                    raise OpticAPIError(
-                        f"did not attempt to retry error: {err}"
-                    ) from err
-
-            self._response = self._response.json()
 
         return self._response
+
+    def iter_rows(self):
+        """
+        Iterates over the elements of a JSON array response (e.g. a _cat API response)
+        while it is being downloaded, so that large responses are never held in memory
+        as a whole. The response is not kept by the action, only cached if enabled
+
+        :return: generator of response elements
+        :rtype: Generator
+        :raises OpticAPIError: if the request fails or the response is cut short
+        :raises OpticDataError: if the response is not a JSON array
+        """
+        if self._response is not None:
+            yield from self._response
+            return
+        if self.cache and not self.refresh_cache:
+            rows = self.cache.iter_rows(self.url, self._cache_credentials, self.query)
+            if rows is not None:
+                yield from rows
+                return
+
+        response = self._send(stream=True)
+        writer = (
+            self.cache.writer(self.url, self._cache_credentials, self.query)
+            if self.cache
+            else None
+        )
+        try:
+            for row in iter_json_array(
+                response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            ):
+                if writer:
+                    writer.write(row)
+                yield row
+        except requests.exceptions.RequestException as err:
+            if writer:
+                writer.discard()
+            raise OpticAPIError(f"Failed to read response: {err}") from err
+        except BaseException:
+            if writer:
+                writer.discard()
+            raise
+        finally:
+            response.close()
+        if writer:
+            writer.commit()
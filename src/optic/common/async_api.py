@@ -0,0 +1,419 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import asyncio
+import base64
+import contextlib
+import logging
+import time
+
+from urllib3.util.retry import Retry
+
+from optic.common.api import DEFAULT_POOL_LIFETIME, DEFAULT_POOL_SIZE
+from optic.common.cache import credentials_key
+from optic.common.exceptions import OpticAPIError, OpticDependencyError
+from optic.common.json_stream import STREAM_CHUNK_SIZE, JSONArrayParser
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without the async extra
+    aiohttp = None
+
+
+def _basic_auth_header(usr, pwd) -> str:
+    """
+    Encodes credentials as an HTTP Basic Authorization header value
+
+    :param str usr: username
+    :param str pwd: password
+    :return: header value
+    :rtype: str
+    """
+    credentials = base64.b64encode(f"{usr}:{pwd}".encode("utf-8")).decode("ascii")
+    return f"Basic {credentials}"
+
+
+class _PooledClientSession:
+    def __init__(self, session):
+        self.session = session
+        self.created = time.monotonic()
+        self.active = 0
+        self.retired = False
+
+
+class _LoopSessions:
+    def __init__(self):
+        self.sessions = {}
+        self.retired = []
+        self.closer = None
+
+
+class AsyncSessionRegistry:
+    def __init__(self):
+        """
+        Keeps one pooled aiohttp.ClientSession per cluster connection and event loop so that
+        every AsyncOpenSearchAction targeting the same cluster shares one connector.
+        Sessions older than their lifetime are retired, and closed once their last
+        in-flight request completes.
+
+        The sessions of an event loop are closed when the loop finishes (e.g. at the
+        end of asyncio.run), even if close_async_sessions was not called, and
+        sessions of loops closed without finishing their tasks are forgotten.
+        """
+        self._loops = {}
+
+    def _loop_sessions(self) -> _LoopSessions:
+        """
+        Returns the sessions of the running event loop, forgetting those of closed loops
+
+        :return: sessions of the running loop
+        :rtype: _LoopSessions
+        """
+        loop = asyncio.get_running_loop()
+        loop_sessions = self._loops.get(loop)
+        if loop_sessions is None:
+            for closed_loop in [other for other in self._loops if other.is_closed()]:
+                del self._loops[closed_loop]
+            loop_sessions = self._loops[loop] = _LoopSessions()
+            loop_sessions.closer = loop.create_task(self._close_when_finished(loop))
+        return loop_sessions
+
+    async def _close_when_finished(self, loop) -> None:
+        """
+        Waits until the event loop cancels its remaining tasks as it finishes, then
+        closes the sessions of the loop
+
+        :param asyncio.AbstractEventLoop loop: running event loop
+        :return: None
+        :rtype: None
+        """
+        try:
+            await loop.create_future()
+        finally:
+            loop_sessions = self._loops.pop(loop, None)
+            if loop_sessions is not None:
+                await self._close_sessions(loop_sessions)
+
+    def _get(self, url, usr, pwd, verify_ssl, pool_size, pool_lifetime):
+        loop_sessions = self._loop_sessions()
+        key = (url, usr, pwd, verify_ssl, pool_size)
+        pooled = loop_sessions.sessions.get(key)
+        if pooled and not pooled.session.closed:
+            if not pool_lifetime or time.monotonic() - pooled.created < pool_lifetime:
+                return pooled, loop_sessions
+            logging.debug(f"recycling pooled async session for {url}")
+            pooled.retired = True
+            loop_sessions.retired.append(pooled)
+
+        connector = aiohttp.TCPConnector(
+            limit=pool_size, ssl=None if verify_ssl else False
+        )
+        pooled = _PooledClientSession(
+            aiohttp.ClientSession(
+                connector=connector,
+                headers={"Authorization": _basic_auth_header(usr, pwd)},
+            )
+        )
+        loop_sessions.sessions[key] = pooled
+        return pooled, loop_sessions
+
+    @contextlib.asynccontextmanager
+    async def session(
+        self,
+        url,
+        usr,
+        pwd,
+        verify_ssl,
+        pool_size=DEFAULT_POOL_SIZE,
+        pool_lifetime=DEFAULT_POOL_LIFETIME,
+    ):
+        """
+        Provides the pooled session for a cluster connection for the duration of a request
+
+        :param str url: cluster URL
+        :param str usr: username to be used in BasicAuth header
+        :param str pwd: password to be used in BasicAuth header
+        :param bool verify_ssl: SSL verification mode
+        :param int pool_size: maximum number of connections kept open to the cluster
+        :param int pool_lifetime: seconds before the session is recycled (0 to never recycle)
+        :return: pooled session
+        :rtype: aiohttp.ClientSession
+        """
+        pooled, loop_sessions = self._get(
+            url, usr, pwd, verify_ssl, pool_size, pool_lifetime
+        )
+        pooled.active += 1
+        try:
+            yield pooled.session
+        finally:
+            pooled.active -= 1
+            if pooled.retired and not pooled.active:
+                loop_sessions.retired.remove(pooled)
+                await pooled.session.close()
+
+    @staticmethod
+    async def _close_sessions(loop_sessions) -> None:
+        """
+        Closes the pooled sessions of an event loop, and its retired sessions that
+        have no request in flight
+
+        :param _LoopSessions loop_sessions: sessions of the loop
+        :return: None
+        :rtype: None
+        """
+        while loop_sessions.sessions:
+            await loop_sessions.sessions.popitem()[1].session.close()
+        for pooled in list(loop_sessions.retired):
+            if not pooled.active:
+                loop_sessions.retired.remove(pooled)
+                await pooled.session.close()
+
+    async def close(self) -> None:
+        """
+        Closes and forgets every pooled session owned by the running event loop
+
+        :return: None
+        :rtype: None
+        """
+        loop_sessions = self._loops.pop(asyncio.get_running_loop(), None)
+        if loop_sessions is None:
+            return
+        if loop_sessions.closer is not asyncio.current_task():
+            loop_sessions.closer.cancel()
+        await self._close_sessions(loop_sessions)
+
+
+async_session_registry = AsyncSessionRegistry()
+
+
+async def close_async_sessions() -> None:
+    """
+    Closes all pooled async cluster sessions of the running event loop
+
+    :return: None
+    :rtype: None
+    """
+    await async_session_registry.close()
+
+
+class AsyncOpenSearchAction:
+    def __init__(
+        self,
+        url="",
+        query="",
+        retries=3,
+        backoff_factor=2,
+        status_forcelist=(500, 502, 503, 504),
+        usr=None,
+        pwd=None,
+        verify_ssl=True,
+        pool_size=DEFAULT_POOL_SIZE,
+        pool_lifetime=DEFAULT_POOL_LIFETIME,
+        cache=None,
+        refresh_cache=False,
+    ):
+        """
+        Asynchronous counterpart of OpenSearchAction, for use from an asyncio event loop.
+        Requires the optional aiohttp dependency (pip install 'opensearch-optic[async]').
+        Args:
+            url (str): The URL to send the request to
+            query (str): additional string added to the end of url
+            retries (int): Maximum number of retries
+            backoff_factor (float): Backoff factor to apply between retries in seconds
+            status_forcelist (tuple): HTTP status codes to retry on
+            usr (str): username to be used in BasicAuth header
+            pwd (str): password to be used in BasicAuth header
+            verify_ssl (boolean): set SSL verification mode
+            pool_size (int): maximum number of pooled connections to the cluster
+            pool_lifetime (int): seconds before the pooled session is recycled
+            cache (ResponseCache): on-disk response cache to read from and write to
+            refresh_cache (boolean): ignore cached responses, but still cache the new response
+
+        """
+        if aiohttp is None:
+            raise OpticDependencyError(
+                "aiohttp is required for asynchronous requests, "
+                "install it with: pip install 'opensearch-optic[async]'"
+            )
+        self.url = url
+        self.query = query
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = status_forcelist
+        self.usr = usr or str()
+        self.pwd = pwd or str()
+        self.verify_ssl = verify_ssl
+        self.pool_size = pool_size
+        self.pool_lifetime = pool_lifetime
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self._response = None
+
+    @property
+    def _cache_credentials(self) -> str:
+        """
+        Returns what identifies the credentials of the request in cache keys
+
+        :return: digest of the credentials
+        :rtype: str
+        """
+        return credentials_key(self.usr, self.pwd)
+
+    def _backoff(self, consecutive_errors) -> float:
+        """
+        Calculates the delay before the next retry, matching urllib3's Retry backoff
+
+        :param int consecutive_errors: number of failed attempts so far
+        :return: seconds to wait
+        :rtype: float
+        """
+        if consecutive_errors <= 1:
+            return 0
+        return min(
+            Retry.DEFAULT_BACKOFF_MAX,
+            self.backoff_factor * (2 ** (consecutive_errors - 1)),
+        )
+
+    def _session(self):
+        """
+        Provides the pooled session for the action's cluster connection
+
+        :return: pooled session context manager
+        :rtype: contextlib.AbstractAsyncContextManager
+        """
+        logging.debug(
+            f"creating async REST request to {self.url + self.query} with "
+            f"{self.retries} retries, backoff {self.backoff_factor}, and ssl verify {self.verify_ssl}"
+        )
+        return async_session_registry.session(
+            self.url,
+            self.usr,
+            self.pwd,
+            self.verify_ssl,
+            pool_size=self.pool_size,
+            pool_lifetime=self.pool_lifetime,
+        )
+
+    async def response(self) -> list | dict:
+        """
+        Returns JSON-like object with response data
+
+        :return: JSON-like object with response data
+        :rtype: list | dict
+        """
+        if self._response is None and self.cache and not self.refresh_cache:
+            self._response = self.cache.get(
+                self.url, self._cache_credentials, self.query
+            )
+
+        if self._response is None:
+            try:
+                async with self._session() as session:
+                    async with self._send(
+                        session, aiohttp.ClientTimeout(total=6)
+                    ) as response:
+                        self._response = await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                raise OpticAPIError(f"Failed to read response: {err!r}") from err
+            if self.cache:
+                self.cache.put(
+                    self.url, self._cache_credentials, self.query, self._response
+                )
+        return self._response
+
+    async def iter_rows(self):
+        """
+        Asynchronous variant of OpenSearchAction.iter_rows
+
+        :return: asynchronous generator of response elements
+        :rtype: AsyncGenerator
+        :raises OpticAPIError: if the request fails or the response is cut short
+        :raises OpticDataError: if the response is not a JSON array
+        """
+        if self._response is not None:
+            for row in self._response:
+                yield row
+            return
+        if self.cache and not self.refresh_cache:
+            rows = self.cache.iter_rows(self.url, self._cache_credentials, self.query)
+            if rows is not None:
+                for row in rows:
+                    yield row
+                return
+
+        parser = JSONArrayParser()
+        writer = (
+            self.cache.writer(self.url, self._cache_credentials, self.query)
+            if self.cache
+            else None
+        )
+        try:
+            async with self._session() as session:
+                # the whole body may take longer than 6 seconds, but no single read may
+                timeout = aiohttp.ClientTimeout(total=None, sock_connect=6, sock_read=6)
+                async with self._send(session, timeout) as response:
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        for row in parser.feed(chunk):
+                            if writer:
+                                writer.write(row)
+                            yield row
+            for row in parser.close():
+                if writer:
+                    writer.write(row)
+                yield row
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            if writer:
+                writer.discard()
+            raise OpticAPIError(f"Failed to read response: {err!r}") from err
+        except BaseException:
+            if writer:
+                writer.discard()
+            raise
+        if writer:
+            writer.commit()
+
+    @contextlib.asynccontextmanager
+    async def _send(self, session, timeout):
+        """
+        Sends the request, retrying failed attempts with exponential backoff, and
+        provides the successful response while its body is read
+
+        :param aiohttp.ClientSession session: pooled session
+        :param aiohttp.ClientTimeout timeout: request timeout
+        :return: successful response
+        :rtype: aiohttp.ClientResponse
+        :raises OpticAPIError: if the request fails or retries are exhausted
+        """
+        url = self.url + self.query
+        errors = 0
+        while True:
+            try:
+                response = await session.get(url, timeout=timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                reason = repr(err)
+            else:
+                async with response:
+                    if response.status in self.status_forcelist:
+                        reason = f"too many {response.status} error responses"
+                    else:
+                        try:
+                            response.raise_for_status()
+                        except aiohttp.ClientResponseError as err:
+                            raise OpticAPIError(
+                                f"did not attempt to retry error: {err}"
+                            ) from err
+                        yield response
+                        return
+
+            errors += 1
+            if errors > self.retries:
+                raise OpticAPIError(
+                    f"Request failed after {self.retries} retries "
+                    f"(url: {url}, caused by: {reason})"
+                )
+            backoff = self._backoff(errors)
+            if backoff > 0:
+                await asyncio.sleep(backoff)
@@ -0,0 +1,339 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import hashlib
+import json
+import logging
+import os
+import time
+
+DEFAULT_CACHE_DIR = "~/.optic/cache"
+DEFAULT_CACHE_MAX_SIZE_MB = 100
+
+CACHE_FILE_SUFFIX = ".json"
+
+
+def credentials_key(usr, pwd) -> str:
+    """
+    Returns what identifies the credentials of a request in cache keys, so that
+    responses retrieved with other credentials (e.g. before a password change) are
+    not used, without keeping the password itself
+
+    :param str usr: username used for the request
+    :param str pwd: password used for the request
+    :return: digest of the credentials
+    :rtype: str
+    """
+    return hashlib.sha256(f"{usr}\0{pwd}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        ttl=None,
+        max_size_mb=DEFAULT_CACHE_MAX_SIZE_MB,
+    ):
+        """
+        On-disk cache of OpenSearch API responses shared by all optic processes.
+
+        Entries are keyed by cluster URL, credentials and query, and expire after the TTL
+        configured for the queried endpoint (endpoints without a TTL are never cached).
+        Writes are atomic, and the least recently used entries are evicted once the
+        cache grows past max_size_mb.  An entry is a line of metadata followed by the
+        response document, so that array responses can be written and read back one
+        element at a time.
+
+        :param str cache_dir: directory holding cache entries
+        :param dict ttl: endpoint (e.g. "_cat/indices") -> seconds to keep responses
+        :param int max_size_mb: maximum total size of the cache in megabytes
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.ttl = ttl or {}
+        self.max_size = max_size_mb * 2**20
+
+    def ttl_for(self, query) -> int:
+        """
+        Returns the TTL configured for the endpoint of a query
+
+        :param str query: query string added to the end of the cluster url
+        :return: seconds to keep the response (0 if the endpoint is not cached)
+        :rtype: int
+        """
+        path = query.lstrip("/")
+        for endpoint, ttl in self.ttl.items():
+            if path.startswith(endpoint.lstrip("/")):
+                return ttl or 0
+        return 0
+
+    def _path(self, url, credentials, query) -> str:
+        key = hashlib.sha256(
+            f"{url}\0{credentials}\0{query}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_FILE_SUFFIX)
+
+    def _open(self, url, credentials, query):
+        """
+        Opens a cache entry that has not expired, positioned after its metadata line
+
+        :param str url: cluster URL
+        :param str credentials: credentials used for the request (see credentials_key)
+        :param str query: query string added to the end of the cluster url
+        :return: open binary file, or None on a cache miss
+        :rtype: BinaryIO | None
+        """
+        ttl = self.ttl_for(query)
+        if not ttl:
+            return None
+        path = self._path(url, credentials, query)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        try:
+            created = json.loads(f.readline())["created"]
+            if time.time() - created > ttl:
+                f.close()
+                return None
+            # mark entry as recently used for LRU eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            f.close()
+            return None
+        logging.debug(f"using cached response for {url}{query}")
+        return f
+
+    def get(self, url, credentials, query) -> list | dict | None:
+        """
+        Returns the cached response for a query if it has not expired
+
+        :param str url: cluster URL
+        :param str credentials: credentials used for the request (see credentials_key)
+        :param str query: query string added to the end of the cluster url
+        :return: cached JSON-like response, or None on a cache miss
+        :rtype: list | dict | None
+        """
+        f = self._open(url, credentials, query)
+        if f is None:
+            return None
+        with f:
+            try:
+                return json.load(f)
+            except (OSError, ValueError):
+                return None
+
+    def iter_rows(self, url, credentials, query):
+        """
+        Returns an iterator over the elements of a cached array response if it has
+        not expired, reading the entry a chunk at a time
+
+        :param str url: cluster URL
+        :param str credentials: credentials used for the request (see credentials_key)
+        :param str query: query string added to the end of the cluster url
+        :return: generator of response elements, or None on a cache miss
+        :rtype: Generator | None
+        """
+        f = self._open(url, credentials, query)
+        if f is None:
+            return None
+
+        from optic.common.json_stream import STREAM_CHUNK_SIZE, iter_json_array
+
+        def rows():
+            with f:
+                yield from iter_json_array(iter(lambda: f.read(STREAM_CHUNK_SIZE), b""))
+
+        return rows()
+
+    def _create_entry(self):
+        """
+        Creates a temporary file for a new entry, with the entry metadata written
+
+        :return: open text file and its path
+        :rtype: tuple
+        """
+        # imported here as tempfile is slow to import and only needed for writing
+        import tempfile
+
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        f = os.fdopen(fd, "w")
+        f.write(json.dumps({"created": time.time()}) + "\n")
+        return f, tmp_path
+
+    def put(self, url, credentials, query, response) -> None:
+        """
+        Atomically stores a response, then evicts entries if the cache is too large
+
+        :param str url: cluster URL
+        :param str credentials: credentials used for the request (see credentials_key)
+        :param str query: query string added to the end of the cluster url
+        :param list|dict response: JSON-like response to store
+        :return: None
+        :rtype: None
+        """
+        if not self.ttl_for(query):
+            return
+        try:
+            f, tmp_path = self._create_entry()
+            try:
+                with f:
+                    json.dump(response, f)
+                os.replace(tmp_path, self._path(url, credentials, query))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self.evict()
+        except OSError as err:
+            logging.debug(f"unable to write response cache: {err}")
+
+    def writer(self, url, credentials, query) -> "CacheWriter | None":
+        """
+        Returns a writer storing an array response one element at a time, for
+        responses that are streamed instead of held in memory
+
+        :param str url: cluster URL
+        :param str credentials: credentials used for the request (see credentials_key)
+        :param str query: query string added to the end of the cluster url
+        :return: CacheWriter object, or None if the endpoint is not cached
+        :rtype: CacheWriter | None
+        """
+        if not self.ttl_for(query):
+            return None
+        return CacheWriter(self, self._path(url, credentials, query))
+
+    def _entries(self) -> list:
+        """
+        Lists cache entries as (mtime, size, path) tuples
+
+        :return: list of cache entries
+        :rtype: list
+        """
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(CACHE_FILE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self) -> None:
+        """
+        Removes least recently used entries until the cache fits in its size limit
+
+        :return: None
+        :rtype: None
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # already removed by another optic process
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """
+        Removes every cache entry
+
+        :return: None
+        :rtype: None
+        """
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class CacheWriter:
+    def __init__(self, cache, path):
+        """
+        Writes an array response to a temporary file element by element, and
+        atomically replaces the cache entry with it once the response is complete.
+        Write errors disable the writer instead of failing the request.
+
+        :param ResponseCache cache: cache the entry belongs to
+        :param str path: path of the cache entry
+        """
+        self.cache = cache
+        self.path = path
+        self._file = None
+        self._tmp_path = None
+        self._separator = ""
+        try:
+            self._file, self._tmp_path = cache._create_entry()
+            self._file.write("[")
+        except OSError as err:
+            self._failed(err)
+
+    def _failed(self, err) -> None:
+        logging.debug(f"unable to write response cache: {err}")
+        self.discard()
+
+    def write(self, element) -> None:
+        """
+        Appends an element to the array
+
+        :param element: JSON-like array element
+        :return: None
+        :rtype: None
+        """
+        if self._file is None:
+            return
+        try:
+            self._file.write(self._separator + json.dumps(element))
+        except OSError as err:
+            self._failed(err)
+        self._separator = ","
+
+    def commit(self) -> None:
+        """
+        Completes the array and replaces the cache entry with it
+
+        :return: None
+        :rtype: None
+        """
+        if self._file is None:
+            return
+        try:
+            self._file.write("]")
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.path)
+            self._tmp_path = None
+            self.cache.evict()
+        except OSError as err:
+            self._failed(err)
+
+    def discard(self) -> None:
+        """
+        Abandons the entry (e.g. when the response could not be read completely)
+
+        :return: None
+        :rtype: None
+        """
+        try:
+            if self._file is not None:
+                self._file.close()
+            if self._tmp_path is not None:
+                os.unlink(self._tmp_path)
+        except OSError:
+            pass
+        self._file = None
+        self._tmp_path = None
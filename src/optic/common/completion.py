@@ -0,0 +1,329 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+# Shell completion runs optic on every key press, so completions are served from
+# small JSON files written by previous commands: a summary of the settings and
+# cluster configuration files (invalidated by file modification time) and the
+# index and alias names retrieved from each cluster.  Completion never makes
+# network calls, and only parses YAML after a configuration file changed.
+
+import bisect
+import fnmatch
+import json
+import os
+
+from optic.common.config import ClusterConfig, OpticSettings, yaml_load
+from optic.common.exceptions import OpticConfigurationFileError
+
+DEFAULT_COMPLETION_DIR = "~/.optic/completion"
+DEFAULT_SETTINGS_FILE_PATH = "~/.optic/optic-settings.yaml"
+DEFAULT_CLUSTER_CONFIG_FILE_PATH = "~/.optic/cluster-config.yaml"
+
+CONFIG_INDEX_FILE = "config.json"
+NAME_KINDS = ("indices", "aliases")
+
+
+def _completion_path(file_name, completion_dir=None) -> str:
+    return os.path.join(
+        os.path.expanduser(completion_dir or DEFAULT_COMPLETION_DIR), file_name
+    )
+
+
+def _read_json(path) -> dict:
+    """
+    Reads a completion file
+
+    :param str path: path of the file
+    :return: file contents (empty if the file is missing or unreadable)
+    :rtype: dict
+    """
+    try:
+        with open(path, "rb") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_json(path, data) -> None:
+    """
+    Atomically replaces a completion file, ignoring errors as completion data can
+    always be rebuilt
+
+    :param str path: path of the file
+    :param dict data: file contents
+    :return: None
+    :rtype: None
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _file_signature(path) -> list | None:
+    """
+    Returns what identifies a version of a file (modification time and size)
+
+    :param str path: absolute path of the file
+    :return: [modification time in nanoseconds, size], or None if it does not exist
+    :rtype: list | None
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def settings_summary(settings) -> dict:
+    """
+    Returns the settings used by shell completion
+
+    :param dict settings: optic settings
+    :return: completion summary of the settings
+    :rtype: dict
+    """
+    return {"cluster_config_file_path": settings.get("cluster_config_file_path")}
+
+
+def cluster_config_summary(cluster_config) -> dict:
+    """
+    Returns the cluster and group names of a cluster configuration
+
+    :param ClusterConfig cluster_config: cluster configuration
+    :return: completion summary of the cluster configuration
+    :rtype: dict
+    """
+    return {
+        "clusters": sorted(cluster_config.clusters or {}),
+        "groups": {
+            group: list(clusters or [])
+            for group, clusters in (cluster_config.groups or {}).items()
+        },
+    }
+
+
+def _summarize_settings(yaml_data) -> dict:
+    return settings_summary(OpticSettings(yaml_data).fields)
+
+
+def _summarize_cluster_config(yaml_data) -> dict:
+    return cluster_config_summary(ClusterConfig(yaml_data))
+
+
+def update_config_index(file_path, summary, completion_dir=None) -> None:
+    """
+    Records the completion summary of a configuration file that was just read, so
+    completion does not need to parse it until it is modified
+
+    :param str file_path: path of the configuration file
+    :param dict summary: completion summary of the file
+    :param str completion_dir: directory holding completion data
+    :return: None
+    :rtype: None
+    """
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+    signature = _file_signature(file_path)
+    if signature is None:
+        return
+    index_path = _completion_path(CONFIG_INDEX_FILE, completion_dir)
+    config_index = _read_json(index_path)
+    entry = {"signature": signature, "summary": summary}
+    if config_index.get(file_path) != entry:
+        config_index[file_path] = entry
+        _write_json(index_path, config_index)
+
+
+def _config_summary(file_path, summarize, completion_dir=None) -> dict:
+    """
+    Returns the completion summary of a configuration file, parsing the file only
+    if it was modified since its summary was recorded
+
+    :param str file_path: path of the configuration file
+    :param Callable summarize: function returning the summary of the parsed YAML
+    :param str completion_dir: directory holding completion data
+    :return: completion summary of the file (empty if it cannot be read)
+    :rtype: dict
+    """
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+    signature = _file_signature(file_path)
+    if signature is None:
+        return {}
+    entry = _read_json(_completion_path(CONFIG_INDEX_FILE, completion_dir)).get(
+        file_path
+    )
+    if isinstance(entry, dict) and entry.get("signature") == signature:
+        return entry.get("summary") or {}
+
+    try:
+        summary = summarize(yaml_load(file_path))
+    except (OpticConfigurationFileError, AttributeError, TypeError):
+        return {}
+    update_config_index(file_path, summary, completion_dir)
+    return summary
+
+
+def remember_names(
+    kind, names_by_cluster, search_pattern="*", complete=True, completion_dir=None
+) -> None:
+    """
+    Records the index or alias names retrieved from clusters for shell completion
+
+    When complete is set, the names are every name matching search_pattern, and
+    replace the previously recorded names matching it.  Otherwise (e.g. when
+    indices were filtered) they are added to the recorded names.
+
+    :param str kind: indices or aliases
+    :param dict names_by_cluster: cluster name -> iterable of names
+    :param str search_pattern: comma-separated glob patterns the names were retrieved for
+    :param bool complete: whether every name matching the search pattern was retrieved
+    :param str completion_dir: directory holding completion data
+    :return: None
+    :rtype: None
+    """
+    if not names_by_cluster:
+        return
+    patterns = (search_pattern or "*").split(",")
+    # names excluded by a pattern (e.g. -logs-*) were not retrieved, so are kept
+    complete = complete and not any(pattern.startswith("-") for pattern in patterns)
+    path = _completion_path(f"{kind}.json", completion_dir)
+    recorded = _read_json(path)
+    for cluster_name, names in names_by_cluster.items():
+        cluster_names = set(recorded.get(cluster_name) or ())
+        if complete:
+            cluster_names = {
+                name
+                for name in cluster_names
+                if not any(fnmatch.fnmatchcase(name, p) for p in patterns)
+            }
+        cluster_names.update(names)
+        recorded[cluster_name] = sorted(cluster_names)
+    _write_json(path, recorded)
+
+
+def collect_names(records, names_by_cluster, cluster_key, name_key):
+    """
+    Passes records through, collecting their names by cluster
+
+    :param Iterable records: dictionaries (e.g. from iter_index_info)
+    :param dict names_by_cluster: cluster name -> set of names, updated in place
+        (None to pass the records through without collecting names)
+    :param str cluster_key: record key holding the cluster name
+    :param str name_key: record key holding the name
+    :return: the records
+    :rtype: Iterable
+    """
+    if names_by_cluster is None:
+        return records
+
+    def collecting():
+        for record in records:
+            names_by_cluster.setdefault(record[cluster_key], set()).add(
+                record[name_key]
+            )
+            yield record
+
+    return collecting()
+
+
+def _prefixed(names, prefix) -> list:
+    """
+    Returns the names starting with a prefix
+
+    :param list names: sorted names
+    :param str prefix: prefix being completed
+    :return: matching names
+    :rtype: list
+    """
+    start = bisect.bisect_left(names, prefix)
+    end = start
+    while end < len(names) and names[end].startswith(prefix):
+        end += 1
+    return names[start:end]
+
+
+def _cluster_config_summary(ctx, completion_dir=None) -> dict:
+    """
+    Returns the completion summary of the cluster configuration file used by a
+    command being completed
+
+    :param click.Context ctx: click context of the command
+    :param str completion_dir: directory holding completion data
+    :return: completion summary of the cluster configuration
+    :rtype: dict
+    """
+    cluster_config_file_path = ctx.params.get("cluster_config_file_path")
+    if not cluster_config_file_path:
+        settings_file_path = (
+            ctx.find_root().params.get("optic_settings_file_path")
+            or DEFAULT_SETTINGS_FILE_PATH
+        )
+        cluster_config_file_path = (
+            _config_summary(
+                settings_file_path, _summarize_settings, completion_dir
+            ).get("cluster_config_file_path")
+            or DEFAULT_CLUSTER_CONFIG_FILE_PATH
+        )
+    return _config_summary(
+        cluster_config_file_path, _summarize_cluster_config, completion_dir
+    )
+
+
+def complete_cluster_selection(ctx, param, incomplete, completion_dir=None) -> list:
+    """
+    Completes -c/--cluster with the cluster and group names of the cluster
+    configuration
+
+    :param click.Context ctx: click context of the command
+    :param click.Parameter param: completed option
+    :param str incomplete: value typed so far
+    :param str completion_dir: directory holding completion data
+    :return: matching cluster and group names
+    :rtype: list
+    """
+    summary = _cluster_config_summary(ctx, completion_dir)
+    names = sorted({*summary.get("clusters", ()), *summary.get("groups", {})})
+    return _prefixed(names, incomplete)
+
+
+def complete_search_pattern(ctx, param, incomplete, completion_dir=None) -> list:
+    """
+    Completes -p/--search-pattern with the index and alias names recorded for the
+    selected clusters (every cluster if none is selected), one comma-separated
+    pattern at a time
+
+    :param click.Context ctx: click context of the command
+    :param click.Parameter param: completed option
+    :param str incomplete: value typed so far
+    :param str completion_dir: directory holding completion data
+    :return: matching index and alias names
+    :rtype: list
+    """
+    selection = ctx.params.get("cluster_selection") or ()
+    selected = set()
+    if selection:
+        groups = _cluster_config_summary(ctx, completion_dir).get("groups", {})
+        for name in selection:
+            selected.update(groups.get(name) or (name,))
+
+    names = set()
+    for kind in NAME_KINDS:
+        for cluster_name, cluster_names in _read_json(
+            _completion_path(f"{kind}.json", completion_dir)
+        ).items():
+            if not selected or cluster_name in selected:
+                names.update(cluster_names)
+
+    head, separator, prefix = incomplete.rpartition(",")
+    return [head + separator + name for name in _prefixed(sorted(names), prefix)]
@@ -0,0 +1,170 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import contextlib
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from optic.common.exceptions import OpticError
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# names of the clusters reported as failing within recording_failures blocks
+_failed_clusters = contextvars.ContextVar("failed_clusters", default=None)
+
+
+def _split_outcomes(clusters, outcomes) -> tuple[list, list]:
+    """
+    Separates (result, error) outcomes into successful results and failures
+
+    :param list clusters: list of Cluster type objects
+    :param list outcomes: list of (result, error) tuples in cluster order
+    :return: list of (cluster, result) tuples and list of (cluster, OpticError) tuples
+    :rtype: tuple[list, list]
+    """
+    results = []
+    failures = []
+    for cluster, (result, error) in zip(clusters, outcomes):
+        if error is None:
+            results.append((cluster, result))
+        else:
+            failures.append((cluster, error))
+    return results, failures
+
+
+def map_clusters(function, clusters, max_concurrency=None) -> tuple[list, list]:
+    """
+    Applies a function to every cluster using a bounded pool of worker threads
+
+    Results are returned in the same order as the clusters provided, regardless of
+    the order in which the requests complete.  Clusters that raise an OpticError are
+    collected as failures instead of aborting the remaining clusters.
+
+    :param function: callable that receives a Cluster object
+    :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :return: list of (cluster, result) tuples and list of (cluster, OpticError) tuples
+    :rtype: tuple[list, list]
+    """
+    max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+    if not clusters:
+        return [], []
+
+    def run(cluster):
+        try:
+            return function(cluster), None
+        except OpticError as err:
+            return None, err
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(clusters))) as pool:
+        outcomes = list(pool.map(run, clusters))
+
+    return _split_outcomes(clusters, outcomes)
+
+
+def iter_clusters(function, clusters, max_concurrency=None, ordered=False):
+    """
+    Variant of map_clusters that yields the outcome of every cluster as soon as it
+    is available, in completion order, so that results can be used (e.g. displayed)
+    while the remaining clusters are still being queried
+
+    With ordered, outcomes are yielded in cluster order instead, each as soon as
+    the clusters before it have been yielded (the outcomes of clusters answering
+    earlier are held until then)
+
+    :param function: callable that receives a Cluster object
+    :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :param bool ordered: whether outcomes are yielded in cluster order
+    :return: generator of (cluster, result, OpticError) tuples (result or error is None)
+    :rtype: Generator
+    """
+    max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+    if not clusters:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(clusters))) as pool:
+        futures = {pool.submit(function, cluster): cluster for cluster in clusters}
+        for future in futures if ordered else as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except OpticError as err:
+                yield futures[future], None, err
+
+
+async def async_map_clusters(
+    function, clusters, max_concurrency=None
+) -> tuple[list, list]:
+    """
+    Asynchronous variant of map_clusters that awaits a coroutine function for every cluster,
+    with at most max_concurrency clusters in flight on the running event loop
+
+    :param function: coroutine function that receives a Cluster object
+    :param list clusters: list of Cluster type objects
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :return: list of (cluster, result) tuples and list of (cluster, OpticError) tuples
+    :rtype: tuple[list, list]
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max_concurrency or DEFAULT_MAX_CONCURRENCY)
+
+    async def run(cluster):
+        async with semaphore:
+            try:
+                return await function(cluster), None
+            except OpticError as err:
+                return None, err
+
+    outcomes = await asyncio.gather(*(run(cluster) for cluster in clusters))
+
+    return _split_outcomes(clusters, outcomes)
+
+
+@contextlib.contextmanager
+def recording_failures():
+    """
+    Records the names of the clusters reported as failing within the block, so
+    that a command displaying the information of the other clusters can still
+    tell that some could not be queried
+
+    :return: list the names of the failing clusters are added to
+    :rtype: list
+    """
+    failed_clusters = []
+    token = _failed_clusters.set(failed_clusters)
+    try:
+        yield failed_clusters
+    finally:
+        _failed_clusters.reset(token)
+
+
+def record_failures(cluster_names) -> None:
+    """
+    Records clusters that could not be queried in the enclosing recording_failures
+    block, if any
+
+    :param Iterable cluster_names: names of the clusters
+    :return: None
+    :rtype: None
+    """
+    failed_clusters = _failed_clusters.get()
+    if failed_clusters is not None:
+        failed_clusters.extend(cluster_names)
+
+
+def report_failures(failures) -> None:
+    """
+    Prints the clusters that could not be queried and the reason why, and records
+    them in the enclosing recording_failures block, if any
+
+    :param list failures: list of (cluster, OpticError) tuples
+    :return: None
+    :rtype: None
+    """
+    for cluster, error in failures:
+        print(f"Unable to retrieve information for {cluster.name}: {error}")
+    record_failures(cluster.name for cluster, _ in failures)
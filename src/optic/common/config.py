@@ -6,10 +6,28 @@
 
 import os
 
-import yaml
-
+from optic.common.cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_SIZE_MB
+from optic.common.concurrency import DEFAULT_MAX_CONCURRENCY
 from optic.common.exceptions import OpticConfigurationFileError
 
+# Unix socket the optic daemon (optic serve) listens on, seconds between its
+# background refreshes, and seconds after which its warm state is retrieved again
+DEFAULT_DAEMON_SOCKET = "~/.optic/optic.sock"
+DEFAULT_DAEMON_REFRESH_INTERVAL = 30
+DEFAULT_DAEMON_MAX_AGE = 120
+
+# Defaults for settings that may be missing from settings files created by older versions
+# (responses are only cached for the endpoints a settings file gives a cache_ttl)
+DEFAULT_OPTIC_SETTINGS = {
+    "max_concurrency": DEFAULT_MAX_CONCURRENCY,
+    "cache_dir": DEFAULT_CACHE_DIR,
+    "cache_max_size_mb": DEFAULT_CACHE_MAX_SIZE_MB,
+    "cache_ttl": {},
+    "daemon_socket": DEFAULT_DAEMON_SOCKET,
+    "daemon_refresh_interval": DEFAULT_DAEMON_REFRESH_INTERVAL,
+    "daemon_max_age": DEFAULT_DAEMON_MAX_AGE,
+}
+
 
 def yaml_load(file_path) -> dict:
     """
@@ -19,6 +37,9 @@ def yaml_load(file_path) -> dict:
     rtype: dict
     :raises OpticConfigurationFileError: if yaml file cannot be parsed
     """
+    # imported here as the YAML parser is slow to import and only needed by commands
+    import yaml
+
     try:
         abs_path = os.path.expanduser(file_path)
         config_file = open(abs_path)
@@ -77,4 +98,4 @@ class ClusterConfig:
 
 class OpticSettings:
     def __init__(self, settings_data):
-        self.fields = settings_data
+        self.fields = {**DEFAULT_OPTIC_SETTINGS, **(settings_data or {})}
@@ -19,3 +19,7 @@ class OpticAPIError(OpticError):
 
 class OpticDataError(OpticError):
     pass
+
+
+class OpticDependencyError(OpticError):
+    pass
@@ -0,0 +1,192 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import codecs
+import json
+import re
+
+from optic.common.exceptions import OpticDataError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+# Bytes read from a response or cache file at a time
+STREAM_CHUNK_SIZE = 2**16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters delimiting nested values, and the rest of a string after its opening quote
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING_REST = re.compile(r'[^"\\]*+(?:\\.[^"\\]*+)*+"', re.DOTALL)
+
+
+class JSONArrayParser:
+    def __init__(self, use_orjson=True):
+        """
+        Incremental parser of a JSON array document (e.g. a _cat API response).
+
+        Chunks of the document are fed to the parser as they arrive, and every
+        element completed by a chunk is returned right away, so only the elements
+        and the unparsed end of the document are held in memory, never the whole
+        document.  Objects are decoded with orjson when it is installed.
+
+        :param bool use_orjson: decode objects with orjson if it is installed
+        """
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._use_orjson = use_orjson and orjson is not None
+        self._buffer = ""
+        # how far the incomplete object or array at the start of the buffer was
+        # scanned, and its nesting depth there
+        self._scanned = None
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk) -> list:
+        """
+        Parses the next chunk of the document
+
+        :param bytes chunk: next bytes of the document
+        :return: elements completed by the chunk
+        :rtype: list
+        :raises OpticDataError: if the document is not a JSON array
+        """
+        self._buffer += self._utf8.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        """
+        Parses the end of the document
+
+        :return: elements completed by the end of the document
+        :rtype: list
+        :raises OpticDataError: if the document is not a complete JSON array
+        """
+        self._buffer += self._utf8.decode(b"", final=True)
+        elements = self._parse(final=True)
+        if not self._finished:
+            raise OpticDataError("Incomplete JSON array in response")
+        return elements
+
+    def _container_end(self, buffer, position) -> int:
+        """
+        Finds the end of the object or array starting at a position of the buffer,
+        resuming the scan where it stopped for the previous chunk
+
+        :param str buffer: unparsed document text
+        :param int position: position of the opening brace or bracket
+        :return: position following the closing brace or bracket
+        :rtype: int
+        :raises ValueError: if the object or array is incomplete
+        """
+        offset, depth = self._scanned or (0, 0)
+        index = position + offset
+        while True:
+            match = _STRUCTURE.search(buffer, index)
+            if match is None:
+                self._scanned = (len(buffer) - position, depth)
+                raise ValueError("incomplete value")
+            character = match.group()
+            index = match.end()
+            if character == '"':
+                string_end = _STRING_REST.match(buffer, index)
+                if string_end is None:
+                    # scanned again from the opening quote once the string is complete
+                    self._scanned = (match.start() - position, depth)
+                    raise ValueError("incomplete value")
+                index = string_end.end()
+            elif character in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self._scanned = None
+                    return index
+
+    def _decode(self, buffer, position) -> tuple:
+        """
+        Decodes the element starting at a position of the buffer
+
+        The end of an object or array is found in a single scan across chunks
+        before it is decoded, so that a large element split across many chunks is
+        not decoded again for every chunk
+
+        :param str buffer: unparsed document text
+        :param int position: position of the first character of the element
+        :return: element and the position following it
+        :rtype: tuple
+        :raises ValueError: if the element is invalid or incomplete
+        """
+        if buffer[position] not in "{[":
+            return self._decoder.raw_decode(buffer, position)
+        end = self._container_end(buffer, position)
+        if self._use_orjson:
+            return orjson.loads(buffer[position:end]), end
+        return self._decoder.raw_decode(buffer, position)
+
+    def _parse(self, final) -> list:
+        """
+        Parses every complete element of the buffer, keeping the rest for later
+
+        :param bool final: whether the end of the document has been reached
+        :return: parsed elements
+        :rtype: list
+        :raises OpticDataError: if the document is not a JSON array
+        """
+        buffer = self._buffer
+        length = len(buffer)
+        position = 0
+        elements = []
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position >= length:
+                break
+            character = buffer[position]
+            if self._finished:
+                raise OpticDataError("Unexpected data after JSON array in response")
+            if not self._started:
+                if character != "[":
+                    raise OpticDataError("Expected a JSON array in response")
+                self._started = True
+                position += 1
+            elif character == "]":
+                self._finished = True
+                position += 1
+            elif character == ",":
+                position += 1
+            else:
+                try:
+                    element, end = self._decode(buffer, position)
+                except ValueError as err:
+                    if final:
+                        raise OpticDataError(
+                            f"Invalid JSON array in response: {err}"
+                        ) from err
+                    break
+                if end >= length and not final and character not in '{["':
+                    # a number or literal may continue in the next chunk
+                    break
+                elements.append(element)
+                position = end
+        self._buffer = buffer[position:]
+        return elements
+
+
+def iter_json_array(chunks, use_orjson=True):
+    """
+    Iterates over the elements of a JSON array document read in chunks
+
+    :param Iterable chunks: bytes of the document
+    :param bool use_orjson: decode objects with orjson if it is installed
+    :return: generator of array elements
+    :rtype: Generator
+    :raises OpticDataError: if the document is not a JSON array
+    """
+    parser = JSONArrayParser(use_orjson=use_orjson)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
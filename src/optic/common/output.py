@@ -0,0 +1,141 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import contextlib
+import csv
+import itertools
+import json
+import sys
+
+from optic.common.exceptions import OpticDataError, OpticDependencyError
+
+# Output formats of the info tools (table is the colored terminal table)
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv", "arrow", "parquet")
+
+
+def _import_pyarrow():
+    """
+    Imports pyarrow, which is only needed (and slow to import) for columnar output
+
+    :return: pyarrow module
+    :rtype: module
+    :raises OpticDependencyError: if pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as err:
+        raise OpticDependencyError(
+            "pyarrow is required for arrow and parquet output, "
+            "install it with: pip install 'opensearch-optic[arrow]'"
+        ) from err
+    return pyarrow
+
+
+@contextlib.contextmanager
+def data_output(output_format):
+    """
+    Provides the stream data is written to, sending everything else printed in
+    the meantime (progress messages, unreachable clusters) to stderr so that
+    machine-readable output is not mixed with messages
+
+    :param str output_format: output format
+    :return: standard output
+    :rtype: TextIO
+    """
+    stdout = sys.stdout
+    if output_format == "table":
+        yield stdout
+        return
+    with contextlib.redirect_stdout(sys.stderr):
+        yield stdout
+
+
+def write_records(records, output_format, file, fieldnames=None) -> int:
+    """
+    Writes records (e.g. the dictionaries returned by get_index_info) in a
+    machine-readable format.
+
+    json, ndjson and csv are written record by record as the records are
+    produced, so a generator (e.g. iter_index_info) is never held in memory as a
+    whole.  arrow (Arrow IPC stream) and parquet need every record, and
+    the optional pyarrow dependency.
+
+    :param Iterable records: dictionaries with the same keys
+    :param str output_format: json, ndjson, csv, arrow, or parquet
+    :param TextIO file: text stream to write to (binary formats use its buffer)
+    :param list fieldnames: record keys, in column order (None for the keys of the first record)
+    :return: number of records written
+    :rtype: int
+    :raises OpticDataError: if the output format is not recognized
+    :raises OpticDependencyError: if pyarrow is needed and not installed
+    """
+    records = iter(records)
+    match output_format:
+        case "json":
+            count = 0
+            file.write("[")
+            for record in records:
+                file.write((",\n" if count else "\n") + json.dumps(record))
+                count += 1
+            file.write("\n]\n" if count else "]\n")
+            return count
+        case "ndjson":
+            count = 0
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+                count += 1
+            return count
+        case "csv":
+            first = next(records, None)
+            if fieldnames is None:
+                if first is None:
+                    return 0
+                fieldnames = list(first)
+            writer = csv.DictWriter(
+                file, fieldnames, extrasaction="ignore", lineterminator="\n"
+            )
+            writer.writeheader()
+            if first is None:
+                return 0
+            count = 0
+            for record in itertools.chain((first,), records):
+                writer.writerow(record)
+                count += 1
+            return count
+        case "arrow" | "parquet":
+            return _write_columnar(list(records), output_format, file, fieldnames)
+    raise OpticDataError(f"Unrecognized output format: {output_format}")
+
+
+def _write_columnar(records, output_format, file, fieldnames=None) -> int:
+    """
+    Writes records as an Arrow IPC stream or a Parquet file
+
+    :param list records: dictionaries with the same keys
+    :param str output_format: arrow or parquet
+    :param TextIO file: text stream whose buffer is written to
+    :param list fieldnames: record keys, in column order (None for the keys of the first record)
+    :return: number of records written
+    :rtype: int
+    :raises OpticDependencyError: if pyarrow is not installed
+    """
+    pyarrow = _import_pyarrow()
+    if fieldnames is None:
+        fieldnames = list(records[0]) if records else []
+    table = pyarrow.table(
+        {name: [record[name] for record in records] for name in fieldnames}
+    )
+    file.flush()
+    sink = getattr(file, "buffer", file)
+    if output_format == "parquet":
+        pyarrow.parquet.write_table(table, sink)
+    else:
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    sink.flush()
+    return len(records)
@@ -0,0 +1,78 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+
+class ResponseRecord:
+    __slots__ = ("extra_fields",)
+
+    # response field name -> attribute name
+    FIELDS = {}
+
+    def __init__(self, keep_unknown_fields=False, **kwargs):
+        """
+        Fixed-schema record parsed from an OpenSearch API response dictionary.
+
+        Only the known response fields (FIELDS) are kept, in slots instead of a
+        per-instance dictionary.  Response field names that are not identifiers
+        (e.g. routing.index) are stored under an attribute name (routing_index) and
+        can still be read with getattr under their response name.  Unknown fields
+        are dropped unless keep_unknown_fields is set, in which case they are kept
+        in extra_fields and can also be read as attributes.
+
+        :param bool keep_unknown_fields: keep the response fields missing from FIELDS
+        :param dict kwargs: dictionary with response attributes
+        """
+        for attribute in self.FIELDS.values():
+            setattr(self, attribute, None)
+        self.extra_fields = {} if keep_unknown_fields else None
+        fields = self.FIELDS
+        for key, value in kwargs.items():
+            value = self._parse_value(value)
+            attribute = fields.get(key)
+            if attribute is not None:
+                setattr(self, attribute, value)
+            elif self.extra_fields is not None:
+                self.extra_fields[key] = value
+
+    @staticmethod
+    def _parse_value(value):
+        """
+        Converts a response value to the type it is kept as (numbers reported as
+        strings to integers)
+
+        :param value: response value
+        :return: converted value
+        """
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        return value
+
+    def __getattr__(self, name):
+        # only called for names that are not attributes (e.g. routing.index)
+        attribute = type(self).FIELDS.get(name)
+        if attribute is not None and attribute != name:
+            return getattr(self, attribute)
+        try:
+            extra_fields = object.__getattribute__(self, "extra_fields")
+        except AttributeError:
+            extra_fields = None
+        if extra_fields is not None and name in extra_fields:
+            return extra_fields[name]
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Returns the record as a response dictionary
+
+        :return: response field name -> value, including kept unknown fields
+        :rtype: dict
+        """
+        fields = {
+            key: getattr(self, attribute) for key, attribute in self.FIELDS.items()
+        }
+        return fields | (self.extra_fields or {})
@@ -0,0 +1,97 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import itertools
+import re
+
+# Rows used to size the columns of a streamed table
+DEFAULT_SAMPLE_SIZE = 100
+
+_ANSI_ESCAPE = re.compile(r"\033\[[0-9;]*m")
+
+
+def visible_width(cell) -> int:
+    """
+    Returns the number of characters a cell takes on the terminal, ignoring colors
+
+    :param str cell: table cell
+    :return: cell width
+    :rtype: int
+    """
+    return len(_ANSI_ESCAPE.sub("", cell))
+
+
+def format_row(cells, widths) -> str:
+    """
+    Formats a table row, padding every cell to its column width
+
+    :param list cells: table cells
+    :param list widths: column widths
+    :return: table row
+    :rtype: str
+    """
+    return (
+        "| "
+        + " | ".join(
+            cell + " " * (width - visible_width(cell))
+            for cell, width in zip(cells, widths)
+        )
+        + " |"
+    )
+
+
+def format_border(widths, title=None) -> str:
+    """
+    Formats a table border, with a title in the style of terminaltables.AsciiTable
+
+    :param list widths: column widths
+    :param str title: table title shown in the border (None for a plain border)
+    :return: table border
+    :rtype: str
+    """
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+    if title and len(title) <= len(border) - 2:
+        title_end = len(title) + 1
+        border = "+" + title + border[title_end:]
+    return border
+
+
+def print_table_stream(header, rows, title=None, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Prints a table in the style of terminaltables.AsciiTable while its rows are
+    still being produced.
+
+    Column widths are computed from the header and the first sample_size rows,
+    which are printed as soon as they are available, and every following row is
+    printed as soon as it is produced.  A later value wider than its column
+    widens its own row instead of the whole table.
+
+    :param list header: column headers
+    :param Iterable rows: table rows (lists of cells, converted with str)
+    :param str title: table title shown in the top border
+    :param int sample_size: number of rows used to compute column widths
+    :return: number of rows printed
+    :rtype: int
+    """
+    rows = ([str(cell) for cell in row] for row in rows)
+    sample = list(itertools.islice(rows, sample_size))
+    widths = [
+        max(visible_width(cell) for cell in column) for column in zip(header, *sample)
+    ]
+    border = format_border(widths)
+
+    print(format_border(widths, title))
+    print(format_row(header, widths))
+    print(border)
+    for row in sample:
+        print(format_row(row, widths))
+    print(end="", flush=True)
+    count = len(sample)
+    for row in rows:
+        print(format_row(row, widths))
+        count += 1
+    print(border)
+    return count
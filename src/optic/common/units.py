@@ -0,0 +1,108 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import functools
+
+from optic.common.exceptions import OpticDataError
+
+# Storage unit suffixes used by OpenSearch human readable sizes, largest first
+BYTE_UNITS = (("pb", 2**50), ("tb", 2**40), ("gb", 2**30), ("mb", 2**20), ("kb", 2**10))
+# Storage unit suffix -> size in bytes, including plain bytes
+UNIT_SIZES = {**dict(BYTE_UNITS), "b": 1}
+
+# Number of distinct size strings whose parsed value is remembered
+PARSE_CACHE_SIZE = 4096
+
+
+def split_size(bytes_string) -> tuple[str, str | None]:
+    """
+    Splits a memory amount string into its number and storage unit suffix
+
+    :param str bytes_string: memory amount string (e.g. 1.5gb)
+    :return: number string and lowercase unit suffix (None if there is no unit)
+    :rtype: tuple[str, str | None]
+    :raises OpticDataError: if the memory amount string format is not valid
+    """
+    lowered = bytes_string.lower()
+    number, unit = lowered, None
+    if lowered.endswith("b"):
+        # two letter suffixes (kb, mb...) before plain bytes
+        unit = lowered[-2:] if lowered[-2:] in UNIT_SIZES else "b"
+        number = lowered[: -len(unit)]
+    if not number.replace(".", "", 1).isdigit():
+        raise OpticDataError("Unrecognized storage format: " + bytes_string)
+    return number, unit
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_bytes_string(bytes_string) -> int | float:
+    if bytes_string.isdigit():
+        return int(bytes_string)
+    number, unit = split_size(bytes_string)
+    if unit is None:
+        return float(number)
+    return float(number) * UNIT_SIZES[unit]
+
+
+def parse_bytes(bytes_string) -> int | float:
+    """
+    Parses a memory amount string into an integer or float
+
+    Parsed strings are remembered, as the same sizes and thresholds are parsed
+    again for every index they are compared with
+
+    :param str|float|int bytes_string: memory amount string
+    :return: int or float with parsed memory amount
+    :rtype: int | float
+    :raises OpticDataError: if the memory amount string format is not valid
+    """
+    if type(bytes_string) is float or type(bytes_string) is int:
+        return bytes_string
+    return _parse_bytes_string(bytes_string)
+
+
+def byte_unit(num_bytes, byte_type=None) -> tuple[str, int]:
+    """
+    Returns the storage unit a number of bytes is displayed in
+
+    :param int|float num_bytes: number of bytes
+    :param str byte_type: storage unit to use (e.g. gb), or None for the largest unit below the size
+    :return: unit suffix and its size in bytes
+    :rtype: tuple[str, int]
+    :raises OpticDataError: if byte_type is not a recognized storage unit
+    """
+    if byte_type:
+        byte_type = byte_type.lower()
+        if byte_type not in UNIT_SIZES:
+            raise OpticDataError("Unrecognized byte_type storage unit: " + byte_type)
+        return byte_type, UNIT_SIZES[byte_type]
+    return next(
+        ((suffix, size) for suffix, size in BYTE_UNITS if num_bytes >= size),
+        ("b", 1),
+    )
+
+
+def format_bytes(num_bytes, byte_type=None, decimals=1) -> str:
+    """
+    Formats a number of bytes as an OpenSearch style human readable size (e.g. 1.5gb)
+
+    Sizes that would be displayed as 0 in byte_type (e.g. 4kb in gb) are displayed
+    in the largest unit below the size instead
+
+    :param int|float num_bytes: number of bytes
+    :param str byte_type: storage unit to use (e.g. gb), or None for the largest unit below the size
+    :param int decimals: number of decimals the size is rounded to
+    :return: human readable size
+    :rtype: str
+    """
+    suffix, size = byte_unit(num_bytes, byte_type)
+    value = round(num_bytes / size, decimals)
+    if value == 0 and num_bytes:
+        suffix, size = byte_unit(num_bytes)
+        value = round(num_bytes / size, decimals)
+    if value == int(value):
+        return f"{int(value)}{suffix}"
+    return f"{value}{suffix}"
@@ -0,0 +1,255 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import contextlib
+import datetime
+import io
+import shutil
+import sys
+import time
+
+from optic.common.optic_color import OpticColor
+from optic.common.table_stream import format_border, format_row, visible_width
+
+# Progress messages printed while cluster information is retrieved, which are not
+# displayed below a watched table (failures are)
+_PROGRESS_PREFIX = "Getting "
+
+_STATUS_COLORS = {
+    "green": OpticColor.GREEN,
+    "yellow": OpticColor.YELLOW,
+    "red": OpticColor.RED,
+}
+
+_NEW = object()
+
+
+def _delta(old, new) -> str:
+    """
+    Describes how a value changed (e.g. +1,204 or yellow→green)
+
+    :param old: previous value
+    :param new: current value
+    :return: description of the change
+    :rtype: str
+    """
+    numbers = all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in (old, new)
+    )
+    if not numbers:
+        return f"{old}→{new}"
+    difference = new - old
+    if isinstance(difference, float):
+        difference = round(difference, 2)
+    return f"{difference:+,}"
+
+
+class WatchTable:
+    def __init__(self, title, columns, key_fields, no_color=False, stream=None):
+        """
+        Table displaying successive snapshots of records (e.g. the dictionaries
+        returned by get_cluster_info), highlighting what changed since the
+        previous snapshot in a Changes column.
+
+        On a terminal only the lines that changed are rewritten, in place, as long
+        as the table keeps the same number of lines; otherwise the screen is
+        redrawn.  Elsewhere (e.g. piped to a file) the table is written again
+        whenever a row changed.
+
+        :param dict columns: record field -> column header, in display order
+        :param tuple key_fields: fields identifying a record across snapshots
+        :param bool no_color: disable colored output if value is true
+        :param TextIO stream: stream the table is written to (standard output if None)
+        """
+        self.title = title
+        self.columns = columns
+        self.key_fields = key_fields
+        self.no_color = no_color
+        self.stream = stream or sys.stdout
+        self._interactive = getattr(self.stream, "isatty", lambda: False)()
+        self._previous = None
+        self._lines = []
+        self._widths = None
+
+    def _color(self, color, text) -> str:
+        if self.no_color or not text:
+            return text
+        return color + text + OpticColor.STOP
+
+    def _row(self, record, previous) -> tuple[list, list]:
+        """
+        Formats the cells of a record and describes its changes
+
+        :param dict record: current record
+        :param dict previous: previous snapshot of the record (None if it is new)
+        :return: list of cells and list of changes
+        :rtype: tuple[list, list]
+        """
+        cells = []
+        changes = []
+        for field, header in self.columns.items():
+            value = record.get(field)
+            cell = "" if value is None else str(value)
+            if field == "status" and value in _STATUS_COLORS:
+                cell = self._color(_STATUS_COLORS[value], cell)
+            if previous is not None and previous.get(field) != value:
+                changes.append(f"{header} {_delta(previous.get(field), value)}")
+                cell = self._color(OpticColor.BOLD, cell)
+            cells.append(cell)
+        return cells, changes
+
+    def update(self, records, messages=(), status="") -> dict:
+        """
+        Displays a new snapshot of the records
+
+        :param Iterable records: dictionaries with the fields of the table columns
+        :param list messages: messages displayed below the table
+        :param str status: status line displayed below the table
+        :return: number of changed, new, and removed records
+        :rtype: dict
+        """
+        counts = {"changed": 0, "new": 0, "removed": 0}
+        snapshot = {}
+        rows = []
+        for record in records:
+            key = tuple(record.get(field) for field in self.key_fields)
+            snapshot[key] = record
+            previous = None
+            if self._previous is not None:
+                previous = self._previous.get(key, _NEW)
+            if previous is _NEW:
+                counts["new"] += 1
+                cells, _ = self._row(record, None)
+                changes = ["new"]
+            else:
+                cells, changes = self._row(record, previous)
+                counts["changed"] += bool(changes)
+            rows.append(cells + [self._color(OpticColor.CYAN, ", ".join(changes))])
+        if self._previous is not None:
+            counts["removed"] = len(self._previous.keys() - snapshot.keys())
+        self._previous = snapshot
+
+        header = list(self.columns.values()) + ["Changes"]
+        widths = [
+            max(visible_width(cell) for cell in column) for column in zip(header, *rows)
+        ]
+        if self._widths is not None:
+            # columns only grow, so that changes do not move the whole table
+            widths = [max(width, last) for width, last in zip(widths, self._widths)]
+        self._widths = widths
+        border = format_border(widths)
+        lines = [
+            format_border(widths, self.title),
+            format_row(header, widths),
+            border,
+            *(format_row(row, widths) for row in rows),
+            border,
+            *messages,
+            f"{status}  {counts['changed']} changed, {counts['new']} new, "
+            f"{counts['removed']} removed",
+        ]
+        self._display(lines)
+        return counts
+
+    def _display(self, lines) -> None:
+        """
+        Writes the lines of the table, only rewriting the lines that changed when
+        possible
+
+        :param list lines: lines of the table
+        :return: None
+        :rtype: None
+        """
+        previous, self._lines = self._lines, lines
+        if not self._interactive:
+            # the status line alone changes at every update
+            if lines[:-1] != previous[:-1]:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            return
+        if (
+            len(lines) != len(previous)
+            or len(lines) >= shutil.get_terminal_size().lines
+        ):
+            self.stream.write("\033[H\033[2J" + "\n".join(lines) + "\n")
+        else:
+            # move up to each changed line, rewrite it, and come back below the table
+            self.stream.write(
+                "".join(
+                    f"\033[{len(lines) - position}F{line}\033[K"
+                    f"\033[{len(lines) - position}E"
+                    for position, (line, last) in enumerate(zip(lines, previous))
+                    if line != last
+                )
+            )
+        self.stream.flush()
+
+
+def watch(fetch, table, interval, iterations=None) -> None:
+    """
+    Displays the records returned by fetch in a WatchTable every interval seconds,
+    until interrupted or after a number of iterations
+
+    :param Callable fetch: function returning the current records
+    :param WatchTable table: table displaying the records
+    :param float interval: seconds between the start of two updates
+    :param int iterations: number of updates (None to watch until interrupted)
+    :return: None
+    :rtype: None
+    """
+    iteration = 0
+    while True:
+        started = time.monotonic()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            records = list(fetch())
+        messages = [
+            line
+            for line in output.getvalue().splitlines()
+            if line and not line.startswith(_PROGRESS_PREFIX)
+        ]
+        table.update(
+            records,
+            messages,
+            f"Every {interval}s: {datetime.datetime.now():%Y-%m-%d %H:%M:%S}",
+        )
+        iteration += 1
+        if iterations is not None and iteration >= iterations:
+            return
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def watch_clusters(fetch, clusters, properties, table, interval, iterations=None):
+    """
+    Watches information retrieved from clusters that are kept between updates,
+    only retrieving again the cluster properties the information is built from
+
+    Only the first update may be answered from cached responses, the cluster
+    properties are retrieved from the clusters for the following updates
+
+    :param Callable fetch: function returning the records of a list of clusters
+    :param list clusters: list of Cluster type objects
+    :param tuple properties: names of the cluster properties retrieved again
+    :param WatchTable table: table displaying the records
+    :param float interval: seconds between the start of two updates
+    :param int iterations: number of updates (None to watch until interrupted)
+    :return: None
+    :rtype: None
+    """
+
+    updated = False
+
+    def refetch():
+        nonlocal updated
+        if updated:
+            for cluster in clusters:
+                cluster.invalidate(*properties)
+                cluster.refresh_cache = True
+        updated = True
+        return fetch(clusters)
+
+    watch(refetch, table, interval, iterations)
@@ -4,36 +4,55 @@
 # ** Licensed under the Universal Permissive License v 1.0
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
-import re
-from datetime import datetime, timezone
+from optic.common.record import ResponseRecord
+from optic.common.units import format_bytes, parse_bytes, split_size
+from optic.index.index_table import age_in_days, epoch_millis, now_millis
+from optic.index.index_type import index_type_classifier
+
+# _cat/indices response fields kept by IndexInfo -> attribute names
+INDEX_RESPONSE_FIELDS = {
+    "health": "health",
+    "status": "status",
+    "index": "index",
+    "uuid": "uuid",
+    "pri": "pri",
+    "rep": "rep",
+    "docs.count": "docs_count",
+    "docs.deleted": "docs_deleted",
+    "store.size": "store_size",
+    "pri.store.size": "pri_store_size",
+    "creation.date": "creation_date",
+    "creation.date.string": "creation_date_string",
+}
+
+
+class IndexInfo(ResponseRecord):
+    __slots__ = (
+        *INDEX_RESPONSE_FIELDS.values(),
+        "index_type_patterns",
+        "reference_millis",
+        "_age",
+        "_shard_size",
+        "_shard_size_bytes",
+        "_index_type",
+    )
+
+    FIELDS = INDEX_RESPONSE_FIELDS
 
-import dateutil.parser
-
-from optic.common.exceptions import OpticDataError
-
-
-class IndexInfo:
-    def __init__(self, index_type_patterns=None, **kwargs):
-        self.index = None
-        self.pri = None
+    def __init__(
+        self,
+        index_type_patterns=None,
+        reference_millis=None,
+        keep_unknown_fields=False,
+        **kwargs,
+    ):
         self._age = None
         self._shard_size = None
+        self._shard_size_bytes = None
         self._index_type = None
         self.index_type_patterns = index_type_patterns or {}
-        self._set_properties_from_response(**kwargs)
-
-    def _set_properties_from_response(self, **kwargs) -> None:
-        """
-        Dynamically sets attributes based off API Response dictionary
-
-        :param dict kwargs: dictionary with response attributes
-        :return: None
-        :rtype: None
-        """
-        for key, value in kwargs.items():
-            if isinstance(value, str) and value.isdigit():
-                value = int(value)
-            setattr(self, key, value)
+        self.reference_millis = reference_millis
+        super().__init__(keep_unknown_fields, **kwargs)
 
     def _calculate_age(self) -> int:
         """
@@ -42,10 +61,11 @@ class IndexInfo:
         :return: age in days
         :rtype: int
         """
-        return (
-            datetime.now(timezone.utc).date()
-            - dateutil.parser.isoparse(getattr(self, "creation.date.string")).date()
-        ).days
+        creation_millis = self.creation_date
+        if creation_millis is None:
+            # only parsed when the creation date is not reported in epoch milliseconds
+            creation_millis = epoch_millis(self.creation_date_string)
+        return age_in_days(creation_millis, self.reference_millis or now_millis())
 
     def _calculate_type(self) -> str:
         """
@@ -54,10 +74,7 @@ class IndexInfo:
         :return: index type string
         :rtype: str
         """
-        for type_name, reg_ex in self.index_type_patterns.items():
-            if re.match(reg_ex, self.index):
-                return type_name
-        return "UNDEFINED"
+        return index_type_classifier(self.index_type_patterns).classify(self.index)
 
     @property
     def age(self) -> int:
@@ -67,7 +84,7 @@ class IndexInfo:
         :return: age in days
         :rtype: int
         """
-        if not self._age:
+        if self._age is None:
             self._age = self._calculate_age()
 
         return self._age
@@ -80,60 +97,44 @@ class IndexInfo:
         :return: index type
         :rtype: str
         """
-        if not self._index_type:
+        if self._index_type is None:
             self._index_type = self._calculate_type()
 
         return self._index_type
 
     @property
-    def shard_size(self) -> str:
+    def shard_size_bytes(self) -> float | None:
         """
-        Returns shard size of index in digital storage unit
+        Returns primary shard size of index in bytes
 
-        :return: shard size
-        :rtype: str
+        :return: shard size in bytes, or None if the index size is unknown
+        :rtype: float | None
+        :raises OpticDataError: if the index size is in an unrecognized format
         """
-        if not self._shard_size:
-            store_size = getattr(self, "pri.store.size")
+        if self._shard_size_bytes is None:
+            store_size = self.pri_store_size
             if store_size is None:
-                return self._shard_size
-            if store_size[-1].lower() == "b":
-                match store_size[-2].lower():
-                    case "k":
-                        self._shard_size = (
-                            str(float(store_size[:-2]) / float(self.pri)) + "kb"
-                        )
-                    case "m":
-                        self._shard_size = (
-                            str(float(store_size[:-2]) / float(self.pri)) + "mb"
-                        )
-                    case "g":
-                        self._shard_size = (
-                            str(float(store_size[:-2]) / float(self.pri)) + "gb"
-                        )
-                    case "t":
-                        self._shard_size = (
-                            str(float(store_size[:-2]) / float(self.pri)) + "tb"
-                        )
-                    case _:
-                        if store_size[-2].isnumeric():
-                            self._shard_size = (
-                                str(float(store_size[:-1]) / float(self.pri)) + "b"
-                            )
-                        else:
-                            raise OpticDataError(
-                                "Unrecognized index size storage format: "
-                                + store_size
-                                + " for index "
-                                + self.index
-                            )
-            else:
-                raise OpticDataError(
-                    "Unrecognized index size storage format: "
-                    + store_size
-                    + " for index "
-                    + self.index
-                )
+                return None
+            self._shard_size_bytes = parse_bytes(store_size) / float(self.pri)
+        return self._shard_size_bytes
+
+    @property
+    def shard_size(self) -> str | None:
+        """
+        Returns shard size of index with two decimals, in the digital storage unit
+        of its index size
+
+        :return: shard size (e.g. 477.5kb)
+        :rtype: str | None
+        :raises OpticDataError: if the index size is in an unrecognized format
+        """
+        if self._shard_size is None:
+            if self.shard_size_bytes is None:
+                return None
+            # sizes without a unit (e.g. retrieved with bytes=b) are in bytes
+            _, unit = split_size(str(self.pri_store_size))
+            unit = unit or "b"
+            self._shard_size = format_bytes(self.shard_size_bytes, unit, decimals=2)
         return self._shard_size
 
 
@@ -145,14 +146,35 @@ class Index:
         write_alias=None,
         index_type_patterns=None,
         info_response=None,
+        write_alias_lookup=None,
+        reference_millis=None,
     ):
         self.cluster_name = cluster_name
         self.name = index_name
-        self.write_alias = write_alias
         self.index_type_patterns = index_type_patterns
         self.info_response = info_response
+        self._write_alias = write_alias
+        self._write_alias_lookup = write_alias_lookup
+        self.reference_millis = reference_millis
         self._info = None
 
+    @property
+    def write_alias(self) -> bool | None:
+        """
+        Returns whether the index is the write target of an alias, resolving it
+        through the cluster's aliases the first time it is needed
+
+        :return: True if index is a write alias target
+        :rtype: bool | None
+        """
+        if self._write_alias is None and self._write_alias_lookup:
+            self._write_alias = self._write_alias_lookup(self.name)
+        return self._write_alias
+
+    @write_alias.setter
+    def write_alias(self, value) -> None:
+        self._write_alias = value
+
     @property
     def info(self) -> IndexInfo:
         """
@@ -161,8 +183,10 @@ class Index:
         :return: IndexInfo object
         :rtype: IndexInfo
         """
-        if not self._info:
+        if self._info is None:
             self._info = IndexInfo(
-                index_type_patterns=self.index_type_patterns, **self.info_response
+                index_type_patterns=self.index_type_patterns,
+                reference_millis=self.reference_millis,
+                **self.info_response,
             )
         return self._info
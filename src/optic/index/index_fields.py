@@ -0,0 +1,37 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+# Index information fields and their column headers, in display order
+INDEX_INFO_FIELDS = {
+    "name": "Index",
+    "age": "Age",
+    "type": "Type",
+    "count": "Document Count",
+    "index_size": "Index Size",
+    "shard_size": "Shard Size",
+    "pri": "Pri",
+    "rep": "Rep",
+    "write_alias": "Write Alias",
+    "aliases": "Aliases",
+    "cluster": "Cluster",
+}
+# Fields reported when no fields are selected
+DEFAULT_INDEX_INFO_FIELDS = tuple(
+    field for field in INDEX_INFO_FIELDS if field != "aliases"
+)
+
+
+def selected_index_fields(fields=None) -> list:
+    """
+    Returns the index information fields to report, in display order
+
+    :param list fields: index information fields to report (None for the default fields)
+    :return: index information fields
+    :rtype: list
+    """
+    if fields is None:
+        fields = DEFAULT_INDEX_INFO_FIELDS
+    return [field for field in INDEX_INFO_FIELDS if field in fields]
@@ -0,0 +1,241 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+from optic.common.exceptions import OpticDataError
+from optic.common.units import parse_bytes
+from optic.index.index_table import MISSING, IndexTable
+
+# Range filter settings, and the IndexTable column and bound they apply to
+RANGE_FILTERS = {
+    "min_age": ("age", "min"),
+    "max_age": ("age", "max"),
+    "min_index_size": ("pri.store.size", "min"),
+    "max_index_size": ("pri.store.size", "max"),
+    "min_shard_size": ("shard_size", "min"),
+    "max_shard_size": ("shard_size", "max"),
+    "min_doc_count": ("docs.count", "min"),
+    "max_doc_count": ("docs.count", "max"),
+}
+
+# Filter settings matching the value of an IndexTable column
+VALUE_FILTERS = {"health": "health", "status": "status"}
+
+FILTER_SETTINGS = (
+    "write_alias_only",
+    *RANGE_FILTERS,
+    "type_filter",
+    *VALUE_FILTERS,
+)
+
+# Filtered columns from cheapest to most expensive to evaluate: stored columns,
+# then derived columns ordered by the cost of calculating them
+EVALUATION_ORDER = (
+    "health",
+    "status",
+    "docs.count",
+    "pri.store.size",
+    "shard_size",
+    "age",
+    "index_type",
+    "write_alias",
+)
+
+
+def _range_predicate(low, high):
+    """
+    Returns a predicate checking a value is within bounds (rows with no value never are)
+
+    :param int|float low: lower bound (None for no lower bound)
+    :param int|float high: upper bound (None for no upper bound)
+    :return: predicate
+    :rtype: Callable
+    """
+    if low is None:
+        return lambda value: value != MISSING and value <= high
+    if high is None:
+        return lambda value: value != MISSING and value >= low
+    return lambda value: value != MISSING and low <= value <= high
+
+
+class IndexFilter:
+    def __init__(
+        self,
+        write_alias_only=None,
+        min_age=None,
+        max_age=None,
+        min_index_size=None,
+        max_index_size=None,
+        min_shard_size=None,
+        max_shard_size=None,
+        min_doc_count=None,
+        max_doc_count=None,
+        type_filter=None,
+        health=None,
+        status=None,
+    ):
+        """
+        Compiled index filter, applied to an IndexTable in a single pass.
+
+        Size thresholds are parsed once, the minimum and maximum of a column are
+        checked by one predicate, and predicates run from the cheapest column to the
+        most expensive one, each only on the rows that passed the previous ones, so
+        derived columns (e.g. index types) are only calculated for those rows.
+
+        :param bool write_alias_only: only keep indices that are (or are not) write alias targets
+        :param int min_age: minimum age in days
+        :param int max_age: maximum age in days
+        :param str|int min_index_size: minimum primary store size (e.g. 1gb, or bytes)
+        :param str|int max_index_size: maximum primary store size (e.g. 1gb, or bytes)
+        :param str|int min_shard_size: minimum primary shard size (e.g. 1gb, or bytes)
+        :param str|int max_shard_size: maximum primary shard size (e.g. 1gb, or bytes)
+        :param int min_doc_count: minimum document count
+        :param int max_doc_count: maximum document count
+        :param list type_filter: index types to exclude
+        :param str health: only keep indices with this health (green, yellow, or red)
+        :param str status: only keep indices with this status (open or close)
+        :raises OpticDataError: if a size is in an unrecognized format
+        """
+        self.settings = {
+            "write_alias_only": write_alias_only,
+            "min_age": min_age,
+            "max_age": max_age,
+            "min_index_size": min_index_size,
+            "max_index_size": max_index_size,
+            "min_shard_size": min_shard_size,
+            "max_shard_size": max_shard_size,
+            "min_doc_count": min_doc_count,
+            "max_doc_count": max_doc_count,
+            "type_filter": type_filter,
+            "health": health,
+            "status": status,
+        }
+        ranges = {
+            "min_age": min_age,
+            "max_age": max_age,
+            "min_index_size": min_index_size,
+            "max_index_size": max_index_size,
+            "min_shard_size": min_shard_size,
+            "max_shard_size": max_shard_size,
+            "min_doc_count": min_doc_count,
+            "max_doc_count": max_doc_count,
+        }
+        self.bounds = {}
+        for setting, value in ranges.items():
+            if value is not None:
+                column_name, bound = RANGE_FILTERS[setting]
+                bounds = self.bounds.setdefault(column_name, {"min": None, "max": None})
+                bounds[bound] = parse_bytes(value)
+        self.write_alias_only = write_alias_only
+        self.excluded_types = frozenset(type_filter or ())
+        self.values = {
+            VALUE_FILTERS[setting]: value.lower()
+            for setting, value in (("health", health), ("status", status))
+            if value is not None
+        }
+        self.predicates = self._compile()
+
+    @classmethod
+    def from_dict(cls, filters) -> "IndexFilter":
+        """
+        Compiles a filter dictionary (as used by get_index_info) into an IndexFilter
+
+        :param dict filters: dictionary with filter information
+        :return: IndexFilter object
+        :rtype: IndexFilter
+        :raises OpticDataError: if the dictionary has an unrecognized filter setting
+        """
+        unknown = [setting for setting in filters if setting not in FILTER_SETTINGS]
+        if unknown:
+            raise OpticDataError("Unrecognized index filter: " + ", ".join(unknown))
+        return cls(**filters)
+
+    def without(self, settings) -> "IndexFilter":
+        """
+        Returns a copy of the filter that ignores some of its settings
+        (e.g. the settings already applied by OpenSearch)
+
+        :param list settings: filter settings to ignore
+        :return: IndexFilter object
+        :rtype: IndexFilter
+        """
+        return IndexFilter(
+            **{
+                setting: value
+                for setting, value in self.settings.items()
+                if setting not in settings
+            }
+        )
+
+    @property
+    def active_settings(self) -> dict:
+        """
+        Returns the filter settings that exclude indices
+
+        :return: filter setting -> value
+        :rtype: dict
+        """
+        return {
+            setting: value
+            for setting, value in self.settings.items()
+            if value not in (None, [], ())
+        }
+
+    def _compile(self) -> list:
+        """
+        Builds one predicate per filtered column, in evaluation order
+
+        :return: list of (column name, predicate) tuples
+        :rtype: list
+        """
+        predicates = {}
+        for column_name, expected in self.values.items():
+            predicates[column_name] = lambda value, expected=expected: value == expected
+        for column_name, bounds in self.bounds.items():
+            predicates[column_name] = _range_predicate(bounds["min"], bounds["max"])
+        if self.excluded_types:
+            excluded_types = self.excluded_types
+            predicates["index_type"] = lambda value: value not in excluded_types
+        if self.write_alias_only is not None:
+            write_alias_only = bool(self.write_alias_only)
+            predicates["write_alias"] = lambda value: bool(value) is write_alias_only
+        return [
+            (column_name, predicates[column_name])
+            for column_name in EVALUATION_ORDER
+            if column_name in predicates
+        ]
+
+    @property
+    def columns(self) -> list:
+        """
+        Returns the names of the filtered columns
+
+        :return: column names
+        :rtype: list
+        """
+        return [column_name for column_name, _ in self.predicates]
+
+    def apply(self, table) -> IndexTable:
+        """
+        Filters an index table
+
+        :param IndexTable table: table of index information
+        :return: table of filtered indexes
+        :rtype: IndexTable
+        """
+        positions = None
+        for column_name, predicate in self.predicates:
+            if positions is not None and column_name not in table.columns:
+                # calculate derived columns only for the rows that are left
+                table = table.take(positions)
+                positions = None
+            column = table.column(column_name)
+            rows = range(len(table)) if positions is None else positions
+            positions = [row for row in rows if predicate(column[row])]
+            if not positions:
+                break
+        if positions is None:
+            return table
+        return table.take(positions)
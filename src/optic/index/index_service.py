@@ -4,284 +4,705 @@
 # ** Licensed under the Universal Permissive License v 1.0
 # ** as shown at https://oss.oracle.com/licenses/upl/
 
+import heapq
+
 from terminaltables import AsciiTable
 
+from optic.common.concurrency import (
+    async_map_clusters,
+    iter_clusters,
+    map_clusters,
+    report_failures,
+)
 from optic.common.exceptions import OpticDataError
 from optic.common.optic_color import OpticColor
+from optic.common.table_stream import print_table_stream
+from optic.common.units import byte_unit, format_bytes
+from optic.index.index_fields import INDEX_INFO_FIELDS, selected_index_fields
+from optic.index.index_filter import IndexFilter
+from optic.index.index_table import (
+    CAT_COLUMNS,
+    DERIVED_COLUMN_SOURCES,
+    MISSING,
+    IndexTable,
+    now_millis,
+)
+
+# Sort types and the IndexTable column they sort by
+_SORT_COLUMNS = {
+    "age": "age",
+    "name": "index",
+    "write-alias": "write_alias",
+    "index-size": "pri.store.size",
+    "shard-size": "shard_size",
+    "doc-count": "docs.count",
+    "type": "index_type",
+    "primary-shards": "pri",
+    "replica-shards": "rep",
+}
+
+# Index information fields and the IndexTable column they are reported from
+_INDEX_FIELD_COLUMNS = {
+    "name": "index",
+    "write_alias": "write_alias",
+    "aliases": "aliases",
+    "age": "age",
+    "type": "index_type",
+    "count": "docs.count",
+    "index_size": "pri.store.size",
+    "shard_size": "shard_size",
+    "pri": "pri",
+    "rep": "rep",
+    "cluster": "cluster",
+}
+
+
+def parse_sort_key(sort_key) -> tuple[str, bool]:
+    """
+    Parses a sort key (e.g. age, or age:desc for descending order) into its
+    sort type and direction
+
+    :param str sort_key: sort type, optionally followed by :asc or :desc
+    :return: sort type and whether the sort is descending
+    :rtype: tuple[str, bool]
+    :raises OpticDataError: if the sort type or direction is not recognized
+    """
+    sort_type, _, direction = sort_key.lower().partition(":")
+    if sort_type not in _SORT_COLUMNS:
+        raise OpticDataError(
+            f"Unrecognized sort type: {sort_type} "
+            f"(expected one of {', '.join(_SORT_COLUMNS)})"
+        )
+    if direction not in ("", "asc", "desc"):
+        raise OpticDataError(
+            f"Unrecognized sort direction: {direction} (expected asc or desc)"
+        )
+    return sort_type, direction == "desc"
+
 
+def _rank(values) -> list:
+    """
+    Replaces values with their rank in sorted order, so string columns can be
+    sorted in descending order by negating them
+
+    :param list values: column values
+    :return: ranks in row order
+    :rtype: list
+    """
+    ranks = {value: rank for rank, value in enumerate(sorted(set(values)))}
+    return [ranks[value] for value in values]
 
-def parse_bytes(bytes_string) -> int | float:
-    """
-    Parses a memory amount string into an integer or float
-
-    :param str|float|int bytes_string: memory amount string
-    :return: int or float with parsed memory amount
-    :rtype: int | float
-    :raises OpticDataError: if the memory amount string format is not valid
-    """
-    if type(bytes_string) is float:
-        return bytes_string
-    if type(bytes_string) is int or bytes_string.isdigit():
-        return int(bytes_string)
-    no_decimal_string = bytes_string.replace(".", "", 1)
-    if no_decimal_string.isdigit():
-        return float(bytes_string)
-    elif bytes_string[-1].lower() == "b":
-        match bytes_string[-2].lower():
-            case "k":
-                if no_decimal_string[:-2].isdigit():
-                    return float(bytes_string[:-2]) * 2**10
-            case "m":
-                if no_decimal_string[:-2].isdigit():
-                    return float(bytes_string[:-2]) * 2**20
-            case "g":
-                if no_decimal_string[:-2].isdigit():
-                    return float(bytes_string[:-2]) * 2**30
-            case "t":
-                if no_decimal_string[:-2].isdigit():
-                    return float(bytes_string[:-2]) * 2**40
-            case _:
-                if no_decimal_string[-2].isdigit():
-                    return float(bytes_string[:-1])
-        raise OpticDataError("Unrecognized storage format: " + bytes_string)
+
+def sort_index_table(table, sort_by, top=None) -> IndexTable:
+    """
+    Sorts an index table by the sort keys provided, the last sort key being the
+    primary sort key, in a single pass over a composite key
+
+    :param IndexTable table: table of index information
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param int top: only keep the first top indexes in sort order (None for all)
+    :return: table of sorted indexes
+    :rtype: IndexTable
+    :raises OpticDataError: if a sort key is not recognized
+    """
+    sort_keys = [parse_sort_key(sort_key) for sort_key in sort_by]
+    positions = range(len(table))
+    if not sort_keys:
+        if top is None or top >= len(table):
+            return table
+        return table.take(positions[:top])
+
+    key_columns = []
+    for sort_type, descending in reversed(sort_keys):
+        column = table.column(_SORT_COLUMNS[sort_type])
+        if isinstance(column, list):
+            column = _rank(column)
+        if descending:
+            column = [-value for value in column]
+        key_columns.append(column)
+    if len(key_columns) == 1:
+        key = key_columns[0].__getitem__
     else:
-        raise OpticDataError("Unrecognized storage format: " + bytes_string)
+        key = list(zip(*key_columns)).__getitem__
 
+    if top is not None and top < len(table):
+        # heap selection of the first rows instead of sorting every row
+        return table.take(heapq.nsmallest(top, positions, key=key))
+    return table.take(sorted(positions, key=key))
 
-def parse_filters(filters) -> list:
+
+def _index_filter(filters) -> IndexFilter:
     """
-    Parses filter dictionary into list of lambdas for use with filter()
+    Returns the compiled IndexFilter for a filter dictionary or IndexFilter
 
-    :param dict filters: dictionary with filter information
-    :return: list of lambdas
-    :rtype: list
+    :param dict|IndexFilter filters: filter information
+    :return: IndexFilter object
+    :rtype: IndexFilter
     """
+    if isinstance(filters, IndexFilter):
+        return filters
+    return IndexFilter.from_dict(filters)
 
-    def filter_generator(attribute, captured_value, filter_type):
-        if filter_type == "max":
-            return lambda index: (
-                parse_bytes(getattr(index.info, attribute))
-                <= parse_bytes(captured_value)
-            )
-        elif filter_type == "min":
-            return lambda index: (
-                parse_bytes(getattr(index.info, attribute))
-                >= parse_bytes(captured_value)
-            )
-        elif filter_type == "equality":
-            return lambda index: (getattr(index.info, attribute) != captured_value)
-        elif filter_type == "top_level":
-            return lambda index: (getattr(index, attribute) == captured_value)
-
-    filter_functions = []
-    for key, value in filters.items():
-        if value is not None:
-            if key == "write_alias_only":
-                filter_functions.append(
-                    filter_generator("write_alias", value, "top_level")
-                )
-            elif key == "min_age":
-                filter_functions.append(filter_generator("age", value, "min"))
-            elif key == "max_age":
-                filter_functions.append(filter_generator("age", value, "max"))
-            elif key == "min_index_size":
-                filter_functions.append(
-                    filter_generator("pri.store.size", value, "min")
-                )
-            elif key == "max_index_size":
-                filter_functions.append(
-                    filter_generator("pri.store.size", value, "max")
-                )
-            elif key == "min_shard_size":
-                filter_functions.append(filter_generator("shard_size", value, "min"))
-            elif key == "max_shard_size":
-                filter_functions.append(filter_generator("shard_size", value, "max"))
-            elif key == "min_doc_count":
-                filter_functions.append(filter_generator("docs.count", value, "min"))
-            elif key == "max_doc_count":
-                filter_functions.append(filter_generator("docs.count", value, "max"))
-            elif key == "type_filter":
-                for type_filter in value:
-                    filter_functions.append(
-                        filter_generator("index_type", type_filter, "equality")
-                    )
-    return filter_functions
-
-
-def parse_sort_by(sort_by) -> list:
-    """
-    Parses tuple of desired sort into list of lambdas for use as sort() keys
 
+def write_alias_needed(filters, sort_by, fields=None) -> bool:
+    """
+    Determines whether alias information (write alias targets or aliases of each
+    index) is required by filters, sort, or output fields
+
+    :param dict|IndexFilter filters: filter information
     :param list sort_by: tuple with desired sort types
-    :return: list of lambdas
-    :rtype: list
+    :param list fields: index information fields to report (None for the default fields)
+    :return: True if alias information is required
+    :rtype: bool
     """
-    sort_functions = []
-    for sort_type in sort_by:
-        if sort_type == "age":
-            sort_functions.append(lambda index: index.info.age)
-        elif sort_type == "name":
-            sort_functions.append(lambda index: index.info.index)
-        elif sort_type == "write-alias":
-            sort_functions.append(lambda index: index.write_alias)
-        elif sort_type == "index-size":
-            sort_functions.append(
-                lambda index: parse_bytes(getattr(index.info, "pri.store.size"))
+    return (
+        "write_alias" in _index_filter(filters).columns
+        or any(parse_sort_key(key)[0] == "write-alias" for key in sort_by)
+        or any(
+            field in ("write_alias", "aliases")
+            for field in selected_index_fields(fields)
+        )
+    )
+
+
+# Sort types OpenSearch can sort _cat/indices by, with the column it sorts and
+# whether the direction is reversed (older indices have earlier creation dates)
+_SERVER_SORT_COLUMNS = {
+    "name": ("index", False),
+    "doc-count": ("docs.count", False),
+    "index-size": ("pri.store.size", False),
+    "primary-shards": ("pri", False),
+    "replica-shards": ("rep", False),
+    "age": ("creation.date", True),
+}
+
+# Size and count filters never match closed indices, which report no values
+_OPEN_ONLY_COLUMNS = ("docs.count", "pri.store.size", "shard_size")
+
+
+class IndexQueryPlan:
+    def __init__(self, filters, sort_by=(), fields=None):
+        """
+        Plans the _cat/indices query for index information, pushing to OpenSearch
+        what it can do itself and leaving the remainder to be done locally:
+
+        - only the columns needed by the filters, sort, and fields are requested (h=)
+        - a sort on stored columns is done by OpenSearch (s=), so the local sort
+          only merges already sorted results
+        - the health filter is applied by OpenSearch (health=), and indices matched by
+          wildcards are only retrieved with the filtered status (expand_wildcards=) or
+          when size or count filters do not exclude closed indices.  expand_wildcards
+          does not apply to index names without wildcards, so the status filter is
+          also applied locally
+
+        :param dict|IndexFilter filters: filter information
+        :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+        :param list fields: index information fields to report (None for the default fields)
+        :raises OpticDataError: if a filter or sort key is not recognized
+        """
+        self.index_filter = _index_filter(filters)
+        self.sort_keys = [parse_sort_key(sort_key) for sort_key in sort_by]
+        self.sort_by = list(sort_by)
+        self.fields = fields
+        # ages of every cluster's indices are calculated at the same time
+        self.reference_millis = now_millis()
+        self.params = {}
+        self.pushed = []
+        pushed_settings = []
+
+        table_columns = {"index"}
+        table_columns.update(self.index_filter.columns)
+        table_columns.update(
+            _SORT_COLUMNS[sort_type] for sort_type, _ in self.sort_keys
+        )
+        table_columns.update(self.field_columns)
+        cat_columns = set()
+        for column_name in table_columns:
+            cat_columns.update(DERIVED_COLUMN_SOURCES.get(column_name, (column_name,)))
+        self.columns = [name for name in CAT_COLUMNS if name in cat_columns]
+        if len(self.columns) < len(CAT_COLUMNS):
+            self.pushed.append("columns: " + ",".join(self.columns))
+
+        server_sort = [
+            _SERVER_SORT_COLUMNS.get(sort_type) for sort_type, _ in self.sort_keys
+        ]
+        if server_sort and None not in server_sort:
+            # the last sort key is the primary sort key
+            self.params["s"] = ",".join(
+                column_name + (":desc" if descending != reversed_order else "")
+                for (column_name, reversed_order), (_, descending) in zip(
+                    reversed(server_sort), reversed(self.sort_keys)
+                )
+            )
+            self.pushed.append("sort: " + self.params["s"])
+
+        settings = self.index_filter.active_settings
+        if "health" in settings:
+            self.params["health"] = settings["health"].lower()
+            pushed_settings.append("health")
+            self.pushed.append("health: " + self.params["health"])
+        if "status" in settings:
+            expand = "open" if settings["status"].lower() == "open" else "closed"
+            self.params["expand_wildcards"] = expand + ",hidden"
+            self.pushed.append(
+                "status of wildcard matches: " + settings["status"].lower()
             )
-        elif sort_type == "shard-size":
-            sort_functions.append(lambda index: parse_bytes(index.info.shard_size))
-        elif sort_type == "doc-count":
-            sort_functions.append(lambda index: getattr(index.info, "docs.count"))
-        elif sort_type == "type":
-            sort_functions.append(lambda index: index.info.index_type)
-        elif sort_type == "primary-shards":
-            sort_functions.append(lambda index: index.info.pri)
-        elif sort_type == "replica-shards":
-            sort_functions.append(lambda index: index.info.rep)
+        elif any(name in self.index_filter.columns for name in _OPEN_ONLY_COLUMNS):
+            self.params["expand_wildcards"] = "open,hidden"
+            self.pushed.append("closed indices excluded by size and count filters")
+
+        self.local_filter = self.index_filter.without(pushed_settings)
+
+    @property
+    def field_columns(self) -> list:
+        """
+        Returns the IndexTable columns the reported fields are built from
+
+        :return: column names
+        :rtype: list
+        """
+        return [
+            _INDEX_FIELD_COLUMNS[field] for field in selected_index_fields(self.fields)
+        ]
 
-    return sort_functions
+    @property
+    def with_write_alias(self) -> bool:
+        """
+        Returns whether write alias information is required by filters, sort, or fields
+
+        :return: True if write alias information is required
+        :rtype: bool
+        """
+        return write_alias_needed(self.index_filter, self.sort_by, self.fields)
+
+    def query(self, search_pattern="*") -> str:
+        """
+        Returns the _cat/indices query for a search pattern
+
+        :param str search_pattern: index search pattern (comma separated for several)
+        :return: query string
+        :rtype: str
+        """
+        query = (
+            "/_cat/indices/"
+            + search_pattern
+            + "?format=json&bytes=b&h="
+            + ",".join(self.columns)
+        )
+        for param, value in self.params.items():
+            query += f"&{param}={value}"
+        return query
+
+    def explain(self) -> list:
+        """
+        Describes what is pushed down to OpenSearch and what is done locally
+
+        :return: lines of explanation
+        :rtype: list
+        """
+        lines = ["Pushed down to OpenSearch:"]
+        lines += ["  " + pushed for pushed in self.pushed] or ["  nothing"]
+        lines.append("Done locally:")
+        local = [
+            f"filter: {setting}={value}"
+            for setting, value in self.local_filter.active_settings.items()
+        ]
+        if self.sort_by:
+            local.append(
+                "sort: "
+                + ",".join(self.sort_by)
+                + (" (merging presorted results)" if "s" in self.params else "")
+            )
+        lines += ["  " + line for line in local] or ["  nothing"]
+        return lines
 
 
-def filter_index_list(index_list, lambda_list) -> list:
+def plan_index_query(filters, sort_by=(), fields=None) -> IndexQueryPlan:
     """
-    Filters index list based on lambda expressions provided
+    Plans the _cat/indices query that retrieves index information
 
-    :param list index_list: list of indexes
-    :param list lambda_list: list of lambdas
-    :return: list of filtered indexes
-    :rtype: list
+    :param dict|IndexFilter filters: filter information
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param list fields: index information fields to report (None for the default fields)
+    :return: IndexQueryPlan object
+    :rtype: IndexQueryPlan
     """
-    for function in lambda_list:
-        index_list = list(filter(function, index_list))
-    return index_list
+    return IndexQueryPlan(filters, sort_by, fields)
 
 
-def sort_index_list(index_list, lambda_list) -> list:
+def explain_index_query(clusters, filters, sort_by=(), fields=None) -> list:
     """
-    Sorts index list based on lambda expressions provided
+    Describes how index information will be retrieved from each cluster
 
-    :param list index_list: list of indexes
-    :param list lambda_list: list of lambdas
-    :return: list of sorted indexes
+    :param list clusters: list of Cluster type objects
+    :param dict|IndexFilter filters: filter information
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param list fields: index information fields to report (None for the default fields)
+    :return: lines of explanation
     :rtype: list
     """
-    for function in lambda_list:
-        index_list.sort(key=function)
-    return index_list
+    query_plan = plan_index_query(filters, sort_by, fields)
+    lines = ["Index query plan"]
+    for cluster in clusters:
+        lines.append(f"{cluster.name}: {query_plan.query(cluster.search_pattern)}")
+    return lines + query_plan.explain()
 
 
-def filter_and_sort_indices(cluster_list, filters, sort_by) -> list:
+def filter_and_sort_indices(
+    cluster_list, filters, sort_by, max_concurrency=None, fields=None, top=None
+) -> IndexTable:
     """
     Retrieves, filters, and sorts indexes from clusters
 
     :param cluster_list: list of clusters
-    :param dict filters: dictionary with filter information
-    :param list sort_by: tuple with desired sort types
-    :return: list of filtered indexes
-    :rtype: list
+    :param dict|IndexFilter filters: filter information
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :param list fields: index information fields to report (None for the default fields)
+    :param int top: only keep the first top indexes in sort order (None for all)
+    :return: table of filtered indexes
+    :rtype: IndexTable
     """
-    index_list = []
-    for cluster in cluster_list:
-        index_list.extend(cluster.index_list)
-
-    filter_functions = parse_filters(filters)
-    sort_by_functions = parse_sort_by(sort_by)
-
-    index_list = filter_index_list(index_list, filter_functions)
-    index_list = sort_index_list(index_list, sort_by_functions)
-    return index_list
+    query_plan = plan_index_query(filters, sort_by, fields)
+    results, failures = map_clusters(
+        lambda cluster: cluster.fetch_index_table(
+            query_plan.with_write_alias, query_plan
+        ),
+        cluster_list,
+        max_concurrency,
+    )
+    report_failures(failures)
+    return _filter_and_sort_results(results, query_plan, top)
+
+
+def _filter_and_sort_results(results, query_plan, top=None) -> IndexTable:
+    """
+    Filters the index tables retrieved from each cluster, then combines and sorts them
 
+    :param list results: list of (cluster, IndexTable) tuples
+    :param IndexQueryPlan query_plan: plan of the index query
+    :param int top: only keep the first top indexes in sort order (None for all)
+    :return: table of filtered indexes
+    :rtype: IndexTable
+    """
+    sort_by = query_plan.sort_by
+    # derived columns depend on each cluster's settings, so they are
+    # calculated before the cluster tables are combined
+    needed_columns = [
+        _SORT_COLUMNS[sort_type] for sort_type, _ in query_plan.sort_keys
+    ] + query_plan.field_columns
+    tables = []
+    for _, cluster_table in results:
+        if cluster_table.query_plan is query_plan:
+            index_filter = query_plan.local_filter
+        else:
+            # retrieved before, without pushing anything down
+            index_filter = query_plan.index_filter
+        cluster_table.set_reference_time(query_plan.reference_millis)
+        cluster_table = index_filter.apply(cluster_table)
+        if top is not None:
+            # only the first top indexes of each cluster can make the overall top
+            cluster_table = sort_index_table(cluster_table, sort_by, top)
+        cluster_table.materialize(needed_columns)
+        tables.append(cluster_table)
+
+    return sort_index_table(IndexTable.concat(tables), sort_by, top)
+
+
+def _default_filters() -> dict:
+    """
+    Returns a filter dictionary that does not exclude any index
 
-def get_index_info(clusters, filters=None, sort_by=None) -> list:
+    :return: dictionary with filter information
+    :rtype: dict
+    """
+    return {
+        "write_alias_only": None,
+        "min_age": None,
+        "max_age": None,
+        "min_index_size": None,
+        "max_index_size": None,
+        "min_shard_size": None,
+        "max_shard_size": None,
+        "min_doc_count": None,
+        "max_doc_count": None,
+        "type_filter": [],
+        "health": None,
+        "status": None,
+    }
+
+
+def get_index_info(
+    clusters,
+    filters=None,
+    sort_by=None,
+    max_concurrency=None,
+    fields=None,
+    byte_type=None,
+    top=None,
+) -> list:
     """
     Retrieves and packages Index information into a list of dictionaries
 
     :param list clusters: list of Cluster type objects
-    :param dict filters: dictionary with filter configuration
-    :param list sort_by: tuple with desired sort types
+    :param dict|IndexFilter filters: filter configuration (dictionary or IndexFilter)
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :param list fields: index information fields to report (None for the default fields)
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :param int top: only report the first top indexes in sort order (None for all)
     :return: list of dictionaries containing cluster information
     :rtype: list
     """
     if filters is None:
-        filters = {
-            "write_alias_only": None,
-            "min_age": None,
-            "max_age": None,
-            "min_index_size": None,
-            "max_index_size": None,
-            "min_shard_size": None,
-            "max_shard_size": None,
-            "min_doc_count": None,
-            "max_doc_count": None,
-            "type_filter": [],
-        }
+        filters = _default_filters()
     if sort_by is None:
         sort_by = []
-    index_list = filter_and_sort_indices(clusters, filters, sort_by)
-    index_dicts = []
-    for index in index_list:
-        index_dicts.append(
-            {
-                "name": index.info.index,
-                "write_alias": index.write_alias,
-                "age": index.info.age,
-                "type": index.info.index_type,
-                "count": getattr(index.info, "docs.count"),
-                "index_size": getattr(index.info, "pri.store.size"),
-                "shard_size": index.info.shard_size,
-                "pri": index.info.pri,
-                "rep": index.info.rep,
-                "cluster": index.cluster_name,
-            }
+    index_table = filter_and_sort_indices(
+        clusters, filters, sort_by, max_concurrency, fields, top
+    )
+    return build_index_dicts(index_table, fields, byte_type)
+
+
+def iter_index_info(
+    clusters,
+    filters=None,
+    sort_by=None,
+    max_concurrency=None,
+    fields=None,
+    byte_type=None,
+    top=None,
+    ordered=False,
+):
+    """
+    Generator variant of get_index_info that yields index information as it is produced
+
+    Without sort keys, the indexes of each cluster are yielded as soon as that
+    cluster has been queried (clusters in the order they answer, or in the order
+    given if ordered, up to top indexes overall), while the remaining clusters are
+    still being queried.  Sorting needs
+    every cluster, so with sort keys the indexes are only yielded once all clusters
+    answered.  Clusters that could not be queried are reported after the last index
+
+    :param list clusters: list of Cluster type objects
+    :param dict|IndexFilter filters: filter configuration (dictionary or IndexFilter)
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :param list fields: index information fields to report (None for the default fields)
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :param int top: only report the first top indexes in sort order (None for all)
+    :param bool ordered: whether clusters are yielded in the order given, as
+        get_index_info orders them
+    :return: generator of dictionaries containing index information
+    :rtype: Generator
+    """
+    if filters is None:
+        filters = _default_filters()
+    if sort_by:
+        index_table = filter_and_sort_indices(
+            clusters, filters, sort_by, max_concurrency, fields, top
+        )
+        yield from iter_index_dicts(index_table, fields, byte_type)
+        return
+
+    query_plan = plan_index_query(filters, [], fields)
+    failures = []
+    remaining = top
+    for cluster, cluster_table, error in iter_clusters(
+        lambda cluster: cluster.fetch_index_table(
+            query_plan.with_write_alias, query_plan
+        ),
+        clusters,
+        max_concurrency,
+        ordered,
+    ):
+        if error is not None:
+            failures.append((cluster, error))
+            continue
+        if remaining == 0:
+            continue
+        index_table = _filter_and_sort_results(
+            [(cluster, cluster_table)], query_plan, remaining
         )
-    return index_dicts
+        if remaining is not None:
+            remaining -= len(index_table)
+        yield from iter_index_dicts(index_table, fields, byte_type)
+    report_failures(failures)
+
+
+async def async_get_index_info(
+    clusters,
+    filters=None,
+    sort_by=None,
+    max_concurrency=None,
+    fields=None,
+    byte_type=None,
+    top=None,
+) -> list:
+    """
+    Asynchronous variant of get_index_info
 
+    :param list clusters: list of Cluster type objects
+    :param dict|IndexFilter filters: filter configuration (dictionary or IndexFilter)
+    :param list sort_by: tuple with desired sort keys (e.g. age, or age:desc)
+    :param int max_concurrency: maximum number of clusters queried at the same time
+    :param list fields: index information fields to report (None for the default fields)
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :param int top: only report the first top indexes in sort order (None for all)
+    :return: list of dictionaries containing cluster information
+    :rtype: list
+    """
+    if filters is None:
+        filters = _default_filters()
+    if sort_by is None:
+        sort_by = []
+    query_plan = plan_index_query(filters, sort_by, fields)
+    results, failures = await async_map_clusters(
+        lambda cluster: cluster.async_fetch_index_table(
+            query_plan.with_write_alias, query_plan
+        ),
+        clusters,
+        max_concurrency,
+    )
+    report_failures(failures)
+    index_table = _filter_and_sort_results(results, query_plan, top)
+    return build_index_dicts(index_table, fields, byte_type)
+
+
+def _format_shard_size(shard_size, index_size, byte_type=None) -> str | None:
+    """
+    Formats the size of a primary shard with two decimals, in the unit of its index
+    size unless a byte_type is given (e.g. 477.5kb)
+
+    :param float shard_size: primary shard size in bytes
+    :param int index_size: primary store size of the index in bytes
+    :param str byte_type: storage unit to use (None for the unit of the index size)
+    :return: shard size in digital storage unit
+    :rtype: str | None
+    """
+    if shard_size == MISSING:
+        return None
+    return format_bytes(shard_size, byte_type or byte_unit(index_size)[0], decimals=2)
 
-def print_index_info(index_dicts, no_color) -> None:
+
+def _index_field_values(index_table, field, byte_type=None) -> list:
     """
-    Prints Index Information
+    Returns the reported values of an index information field for every row
 
-    :param list index_dicts: list of dictionaries of index information
+    :param IndexTable index_table: table of index information
+    :param str field: index information field
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :return: values in row order
+    :rtype: list
+    """
+    if field == "shard_size":
+        return [
+            _format_shard_size(shard_size, index_size, byte_type)
+            for shard_size, index_size in zip(
+                index_table.column("shard_size"), index_table.column("pri.store.size")
+            )
+        ]
+    column = index_table.column(_INDEX_FIELD_COLUMNS[field])
+    if field == "write_alias":
+        return [bool(value) for value in column]
+    if field == "index_size":
+        return [
+            None if value == MISSING else format_bytes(value, byte_type)
+            for value in column
+        ]
+    if field == "count":
+        return [None if value == MISSING else value for value in column]
+    return list(column)
+
+
+def iter_index_dicts(index_table, fields=None, byte_type=None):
+    """
+    Iterates over the rows of an index table as dictionaries
+
+    Only the requested fields are computed, so expensive information
+    (e.g. write alias targets) is not retrieved unless asked for.  Sizes are
+    kept in bytes in the table and only formatted here
+
+    :param IndexTable index_table: table of index information
+    :param list fields: index information fields to report (None for the default fields)
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :return: generator of dictionaries containing index information
+    :rtype: Generator
+    """
+    selected = selected_index_fields(fields)
+    columns = [_index_field_values(index_table, field, byte_type) for field in selected]
+    for values in zip(*columns):
+        yield dict(zip(selected, values))
+
+
+def build_index_dicts(index_table, fields=None, byte_type=None) -> list:
+    """
+    Packages an index table into a list of dictionaries
+
+    :param IndexTable index_table: table of index information
+    :param list fields: index information fields to report (None for the default fields)
+    :param str byte_type: storage unit sizes are reported in (None for the most suitable unit)
+    :return: list of dictionaries containing index information
+    :rtype: list
+    """
+    return list(iter_index_dicts(index_table, fields, byte_type))
+
+
+def _index_info_rows(index_dicts, no_color, fields=None):
+    """
+    Formats index information as table rows, headers first
+
+    :param Iterable index_dicts: dictionaries of index information
     :param bool no_color: whether colored output or not
-    :return: None
-    :rtype: None
+    :param list fields: index information fields to display (None for the default fields)
+    :return: generator of table rows
+    :rtype: Generator
     """
     optic_color = OpticColor()
     if no_color:
         optic_color.disable_colors()
 
-    print_data = [
-        [
-            "Index",
-            "Age",
-            "Type",
-            "Document Count",
-            "Index Size",
-            "Shard Size",
-            "Pri",
-            "Rep",
-            "Write Alias",
-            "Cluster",
-        ]
-    ]
+    columns = selected_index_fields(fields)
+    yield [INDEX_INFO_FIELDS[field] for field in columns]
     for stats in index_dicts:
-        print_data.append(
-            [
-                stats["name"],
-                stats["age"],
-                stats["type"],
-                stats["count"],
-                stats["index_size"],
-                stats["shard_size"],
-                stats["pri"],
-                stats["rep"],
-                (optic_color.GREEN if stats["write_alias"] else optic_color.RED)
-                + str(stats["write_alias"])
-                + optic_color.STOP,
-                stats["cluster"],
-            ]
-        )
+        row = []
+        for field in columns:
+            if field == "write_alias":
+                row.append(
+                    (optic_color.GREEN if stats["write_alias"] else optic_color.RED)
+                    + str(stats["write_alias"])
+                    + optic_color.STOP
+                )
+            else:
+                row.append(stats[field])
+        yield row
+
+
+def print_index_info(index_dicts, no_color, fields=None) -> None:
+    """
+    Prints Index Information
 
-    table = AsciiTable(print_data)
+    :param list index_dicts: list of dictionaries of index information
+    :param bool no_color: whether colored output or not
+    :param list fields: index information fields to display (None for the default fields)
+    :return: None
+    :rtype: None
+    """
+    table = AsciiTable(list(_index_info_rows(index_dicts, no_color, fields)))
     table.title = "Index Info"
     print(table.table)
+
+
+def print_index_info_stream(index_dicts, no_color, fields=None) -> None:
+    """
+    Prints Index Information while it is being produced (e.g. by iter_index_info),
+    with column widths computed from the first indexes
+
+    :param Iterable index_dicts: dictionaries of index information
+    :param bool no_color: whether colored output or not
+    :param list fields: index information fields to display (None for the default fields)
+    :return: None
+    :rtype: None
+    """
+    rows = _index_info_rows(index_dicts, no_color, fields)
+    print_table_stream(next(rows), rows, title="Index Info")
@@ -0,0 +1,446 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+
+from optic.common.units import format_bytes, parse_bytes
+from optic.index.index_type import index_type_classifier
+
+# Stored in numeric columns when OpenSearch reports no value (e.g. closed indices)
+MISSING = -1
+
+# _cat/indices columns stored as typed arrays, and their array type codes
+NUMERIC_COLUMNS = {
+    "pri": "l",
+    "rep": "l",
+    "docs.count": "q",
+    "docs.deleted": "q",
+    "store.size": "q",
+    "pri.store.size": "q",
+    "creation.date": "q",
+}
+# Numeric columns holding sizes in bytes
+SIZE_COLUMNS = ("store.size", "pri.store.size")
+# _cat/indices columns stored as lists of strings
+STRING_COLUMNS = ("index", "uuid", "health", "status")
+# _cat/indices columns the table is built from, in the order they are requested
+CAT_COLUMNS = (
+    "health",
+    "status",
+    "index",
+    "uuid",
+    "pri",
+    "rep",
+    "docs.count",
+    "docs.deleted",
+    "store.size",
+    "pri.store.size",
+    "creation.date",
+)
+# _cat/indices columns each derived column is calculated from
+DERIVED_COLUMN_SOURCES = {
+    "age": ("creation.date",),
+    "index_type": ("index",),
+    "shard_size": ("pri.store.size", "pri"),
+    "write_alias": ("index",),
+    "aliases": ("index",),
+}
+# Low cardinality string columns whose values are interned
+INTERNED_COLUMNS = ("health", "status")
+
+MILLIS_PER_DAY = 86_400_000
+
+
+def now_millis() -> int:
+    """
+    Returns the current time in epoch milliseconds
+
+    :return: epoch milliseconds
+    :rtype: int
+    """
+    return time.time_ns() // 1_000_000
+
+
+def age_in_days(creation_millis, reference_millis) -> int:
+    """
+    Returns the number of calendar days (UTC) between a creation date and a
+    reference time
+
+    :param int creation_millis: creation date in epoch milliseconds
+    :param int reference_millis: reference time in epoch milliseconds
+    :return: age in days
+    :rtype: int
+    """
+    return reference_millis // MILLIS_PER_DAY - creation_millis // MILLIS_PER_DAY
+
+
+def epoch_millis(date_string) -> int:
+    """
+    Converts an ISO 8601 date string to epoch milliseconds
+
+    :param str date_string: ISO 8601 date string (e.g. 2024-06-04T15:17:41.806Z)
+    :return: epoch milliseconds, or MISSING if there is no date
+    :rtype: int
+    """
+    if date_string is None:
+        return MISSING
+    # only needed when OpenSearch does not report epoch milliseconds
+    import dateutil.parser
+
+    return int(round(dateutil.parser.isoparse(date_string).timestamp() * 1000))
+
+
+def _iso_date(date_millis) -> str | None:
+    """
+    Converts epoch milliseconds to an ISO 8601 date string in OpenSearch format
+
+    :param int date_millis: epoch milliseconds
+    :return: ISO 8601 date string (e.g. 2024-06-04T15:17:41.806Z)
+    :rtype: str | None
+    """
+    if date_millis is None:
+        return None
+    date = datetime.fromtimestamp(date_millis / 1000, timezone.utc)
+    return date.strftime("%Y-%m-%dT%H:%M:%S.") + f"{date_millis % 1000:03d}Z"
+
+
+class IndexTable:
+    def __init__(
+        self,
+        columns=None,
+        index_type_patterns=None,
+        write_alias_lookup=None,
+        query_plan=None,
+        cluster_name=None,
+        reference_millis=None,
+        aliases_lookup=None,
+    ):
+        """
+        Column-oriented table of index information.
+
+        Every _cat/indices field is stored as one column (numbers, sizes in bytes and
+        creation dates in epoch milliseconds as typed arrays, repeated strings
+        interned), so a cluster with tens of thousands of indices does not need an
+        Index and IndexInfo object per index.  Columns that
+        are derived from other columns (age, index_type, shard_size, write_alias,
+        aliases)
+        are calculated for the whole table the first time they are asked for.
+        Rows can be appended one at a time while a response is streamed.
+
+        :param dict columns: column name -> array or list of values
+        :param dict index_type_patterns: index type name -> regular expression
+        :param write_alias_lookup: callable that returns whether an index name is a write alias target
+        :param IndexQueryPlan query_plan: plan of the query the table was retrieved with, if any
+        :param str cluster_name: name of the cluster appended rows belong to
+        :param int reference_millis: epoch milliseconds ages are calculated at (the
+            time ages are first calculated if None)
+        :param aliases_lookup: callable that returns the comma-separated aliases of an index name
+        """
+        if columns is None:
+            columns = {name: array(code) for name, code in NUMERIC_COLUMNS.items()}
+            columns.update({name: [] for name in STRING_COLUMNS})
+            columns["cluster"] = []
+        self.columns = columns
+        self.index_type_patterns = index_type_patterns or {}
+        self.write_alias_lookup = write_alias_lookup
+        self.aliases_lookup = aliases_lookup
+        self.query_plan = query_plan
+        self.cluster_name = None if cluster_name is None else sys.intern(cluster_name)
+        self.reference_millis = reference_millis
+        self._derived_columns = {
+            "age": self._calculate_age,
+            "index_type": self._calculate_index_type,
+            "shard_size": self._calculate_shard_size,
+            "write_alias": self._calculate_write_alias,
+            "aliases": self._calculate_aliases,
+        }
+
+    @classmethod
+    def from_response(
+        cls,
+        indices_response,
+        cluster_name=None,
+        index_type_patterns=None,
+        write_alias_lookup=None,
+        query_plan=None,
+        aliases_lookup=None,
+    ) -> "IndexTable":
+        """
+        Constructs an IndexTable from a _cat/indices response
+
+        Sizes may be reported in bytes (bytes=b) or in human readable form, and the
+        creation date as epoch milliseconds (creation.date) or as an ISO 8601 string
+        (creation.date.string)
+
+        :param Iterable indices_response: dictionaries of index information
+        :param str cluster_name: name of the cluster the indices belong to
+        :param dict index_type_patterns: index type name -> regular expression
+        :param write_alias_lookup: callable that returns whether an index name is a write alias target
+        :param IndexQueryPlan query_plan: plan of the query the response was retrieved with, if any
+        :param aliases_lookup: callable that returns the comma-separated aliases of an index name
+        :return: IndexTable object
+        :rtype: IndexTable
+        :raises OpticDataError: if an index size is in an unrecognized format
+        """
+        table = cls(
+            index_type_patterns=index_type_patterns,
+            write_alias_lookup=write_alias_lookup,
+            aliases_lookup=aliases_lookup,
+            query_plan=query_plan,
+            cluster_name=cluster_name,
+        )
+        table.extend(indices_response)
+        return table
+
+    def append(self, index_info) -> None:
+        """
+        Appends a row from a _cat/indices response
+
+        Derived columns must not have been calculated yet
+
+        :param dict index_info: dictionary of index information
+        :return: None
+        :rtype: None
+        :raises OpticDataError: if the index size is in an unrecognized format
+        """
+        columns = self.columns
+        for name in STRING_COLUMNS:
+            value = index_info.get(name)
+            if name in INTERNED_COLUMNS and value is not None:
+                value = sys.intern(value)
+            columns[name].append(value)
+        for name in NUMERIC_COLUMNS:
+            value = index_info.get(name)
+            if value is None:
+                if name == "creation.date":
+                    value = epoch_millis(index_info.get("creation.date.string"))
+                else:
+                    value = MISSING
+            elif name in SIZE_COLUMNS and not str(value).isdigit():
+                value = int(round(parse_bytes(value)))
+            else:
+                value = int(value)
+            columns[name].append(value)
+        columns["cluster"].append(self.cluster_name)
+
+    def extend(self, indices_response) -> None:
+        """
+        Appends every row of a _cat/indices response, which may be any iterable
+        (e.g. rows streamed from the cluster)
+
+        :param Iterable indices_response: dictionaries of index information
+        :return: None
+        :rtype: None
+        :raises OpticDataError: if an index size is in an unrecognized format
+        """
+        for index_info in indices_response:
+            self.append(index_info)
+
+    @classmethod
+    def concat(cls, tables) -> "IndexTable":
+        """
+        Joins tables into a single table, keeping the columns present in every table
+
+        Derived columns are only kept if they were calculated for every table, as the
+        type patterns and alias lookups of the tables may differ
+
+        :param list tables: list of IndexTable objects
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        if not tables:
+            return cls()
+        reference_millis = {table.reference_millis for table in tables}
+        names = [
+            name
+            for name in tables[0].columns
+            if all(name in table.columns for table in tables[1:])
+        ]
+        columns = {}
+        for name in names:
+            column = tables[0].columns[name][:]
+            for table in tables[1:]:
+                column.extend(table.columns[name])
+            columns[name] = column
+        return cls(
+            columns=columns,
+            reference_millis=(
+                reference_millis.pop() if len(reference_millis) == 1 else None
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["index"])
+
+    def column(self, name) -> array | list:
+        """
+        Returns a column, calculating it first if it is a derived column
+
+        :param str name: column name
+        :return: column values in row order
+        :rtype: array | list
+        """
+        if name not in self.columns:
+            self.columns[name] = self._derived_columns[name]()
+        return self.columns[name]
+
+    def materialize(self, names) -> None:
+        """
+        Calculates derived columns ahead of time (e.g. before tables are joined)
+
+        :param list names: column names
+        :return: None
+        :rtype: None
+        """
+        for name in names:
+            if name in self._derived_columns:
+                self.column(name)
+
+    def take(self, positions) -> "IndexTable":
+        """
+        Returns a new table with the rows at the given positions, in that order
+
+        :param list positions: row positions
+        :return: IndexTable object
+        :rtype: IndexTable
+        """
+        columns = {}
+        for name, column in self.columns.items():
+            values = [column[position] for position in positions]
+            if isinstance(column, array):
+                values = array(column.typecode, values)
+            columns[name] = values
+        return IndexTable(
+            columns=columns,
+            index_type_patterns=self.index_type_patterns,
+            write_alias_lookup=self.write_alias_lookup,
+            aliases_lookup=self.aliases_lookup,
+            query_plan=self.query_plan,
+            cluster_name=self.cluster_name,
+            reference_millis=self.reference_millis,
+        )
+
+    def set_reference_time(self, reference_millis) -> None:
+        """
+        Sets the time ages are calculated at, forgetting ages calculated at another
+        time (e.g. by a previous run using the same table)
+
+        :param int reference_millis: epoch milliseconds
+        :return: None
+        :rtype: None
+        """
+        if reference_millis != self.reference_millis:
+            self.reference_millis = reference_millis
+            self.columns.pop("age", None)
+
+    def row(self, position) -> dict:
+        """
+        Returns the _cat/indices style dictionary of a row
+
+        :param int position: row position
+        :return: dictionary of index information
+        :rtype: dict
+        """
+        index_info = {name: self.columns[name][position] for name in STRING_COLUMNS}
+        for name in NUMERIC_COLUMNS:
+            value = self.columns[name][position]
+            if value == MISSING:
+                value = None
+            elif name in SIZE_COLUMNS:
+                value = format_bytes(value)
+            index_info[name] = value
+        index_info["creation.date.string"] = _iso_date(index_info["creation.date"])
+        return index_info
+
+    def rows(self):
+        """
+        Iterates over the _cat/indices style dictionaries of every row
+
+        :return: generator of dictionaries of index information
+        :rtype: Generator
+        """
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def _calculate_age(self) -> array:
+        """
+        Calculate the age of every index in days, at the table reference time
+
+        :return: ages in days
+        :rtype: array
+        """
+        if self.reference_millis is None:
+            self.reference_millis = now_millis()
+        return array(
+            "l",
+            (
+                (
+                    MISSING
+                    if creation_date == MISSING
+                    else age_in_days(creation_date, self.reference_millis)
+                )
+                for creation_date in self.columns["creation.date"]
+            ),
+        )
+
+    def _calculate_index_type(self) -> list:
+        """
+        Calculate the type of every index
+
+        :return: index type strings
+        :rtype: list
+        """
+        return index_type_classifier(self.index_type_patterns).classify_all(
+            self.columns["index"]
+        )
+
+    def _calculate_shard_size(self) -> array:
+        """
+        Calculate the primary shard size of every index in bytes
+
+        :return: shard sizes in bytes
+        :rtype: array
+        """
+        return array(
+            "d",
+            (
+                MISSING if size == MISSING or pri <= 0 else size / pri
+                for size, pri in zip(
+                    self.columns["pri.store.size"], self.columns["pri"]
+                )
+            ),
+        )
+
+    def _calculate_write_alias(self) -> array:
+        """
+        Calculate whether every index is the write target of an alias
+
+        :return: 1 for write alias targets, 0 otherwise
+        :rtype: array
+        """
+        lookup = self.write_alias_lookup
+        return array(
+            "b",
+            (
+                bool(lookup and lookup(index_name))
+                for index_name in self.columns["index"]
+            ),
+        )
+
+    def _calculate_aliases(self) -> list:
+        """
+        Calculate the aliases pointing to every index
+
+        :return: comma-separated alias names (empty for indices without aliases)
+        :rtype: list
+        """
+        lookup = self.aliases_lookup
+        if lookup is None:
+            return [""] * len(self)
+        return [lookup(index_name) for index_name in self.columns["index"]]
@@ -0,0 +1,133 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import functools
+import re
+import sys
+
+# Type of the indices matching none of the index type patterns
+UNDEFINED_TYPE = "UNDEFINED"
+
+# Number of index names whose type is remembered before the memo is cleared, so
+# that a long running process seeing new indices every day does not grow forever
+MAX_MEMOIZED_NAMES = 1_000_000
+
+# Backreferences (\1, (?P=name)) would refer to other groups once the patterns are
+# combined into one expression
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class IndexTypeClassifier:
+    def __init__(self, index_type_patterns=None):
+        """
+        Classifies index names by type, matching the index type patterns in order
+        (the first pattern matching the start of a name gives its type).
+
+        The patterns are compiled once into a single alternation of named groups,
+        so a name is matched once instead of once per pattern.  Patterns that
+        cannot be combined (e.g. inline flags or backreferences) are matched one at
+        a time.  The type of every classified name is remembered.
+
+        :param dict index_type_patterns: index type name -> regular expression
+        """
+        self.index_type_patterns = dict(index_type_patterns or {})
+        self._types = {}
+        self._combined = None
+        self._group_types = ()
+        self._patterns = ()
+        type_names = [sys.intern(name) for name in self.index_type_patterns]
+        reg_exes = list(self.index_type_patterns.values())
+        if not any(_BACKREFERENCE.search(reg_ex) for reg_ex in reg_exes):
+            try:
+                self._combined = re.compile(
+                    "|".join(
+                        f"(?P<_type{number}>{reg_ex})"
+                        for number, reg_ex in enumerate(reg_exes)
+                    )
+                )
+            except re.error:
+                pass
+        if self._combined is not None:
+            self._group_types = tuple(
+                (self._combined.groupindex[f"_type{number}"], type_name)
+                for number, type_name in enumerate(type_names)
+            )
+        else:
+            self._patterns = tuple(
+                (re.compile(reg_ex), type_name)
+                for reg_ex, type_name in zip(reg_exes, type_names)
+            )
+
+    def _match(self, index_name) -> str:
+        """
+        Matches an index name against the index type patterns
+
+        :param str index_name: name of the index
+        :return: index type
+        :rtype: str
+        """
+        if self._combined is not None:
+            match = self._combined.match(index_name)
+            if match is not None:
+                for group, type_name in self._group_types:
+                    if match.start(group) != -1:
+                        return type_name
+            return UNDEFINED_TYPE
+        for pattern, type_name in self._patterns:
+            if pattern.match(index_name):
+                return type_name
+        return UNDEFINED_TYPE
+
+    def classify(self, index_name) -> str:
+        """
+        Returns the type of an index
+
+        :param str index_name: name of the index
+        :return: index type
+        :rtype: str
+        """
+        index_type = self._types.get(index_name)
+        if index_type is None:
+            if len(self._types) >= MAX_MEMOIZED_NAMES:
+                self._types.clear()
+            index_type = self._types[index_name] = self._match(index_name)
+        return index_type
+
+    def classify_all(self, index_names) -> list:
+        """
+        Returns the type of every index of a name column
+
+        :param list index_names: names of the indices
+        :return: index types, in the order of the names
+        :rtype: list
+        """
+        if not self.index_type_patterns:
+            return [UNDEFINED_TYPE] * len(index_names)
+        get = self._types.get
+        index_types = []
+        for index_name in index_names:
+            index_type = get(index_name)
+            if index_type is None:
+                index_type = self.classify(index_name)
+            index_types.append(index_type)
+        return index_types
+
+
+@functools.lru_cache(maxsize=16)
+def _classifier(patterns) -> IndexTypeClassifier:
+    return IndexTypeClassifier(dict(patterns))
+
+
+def index_type_classifier(index_type_patterns) -> IndexTypeClassifier:
+    """
+    Returns the classifier of a set of index type patterns, shared by every
+    cluster and table using the same patterns during a run
+
+    :param dict index_type_patterns: index type name -> regular expression
+    :return: IndexTypeClassifier object
+    :rtype: IndexTypeClassifier
+    """
+    return _classifier(tuple((index_type_patterns or {}).items()))
@@ -64,6 +64,23 @@ cluster_config_file_path: ~/.optic/cluster-config.yaml
 # Terminal Customization
 disable_terminal_color: False
 
+# Connection Settings
+pool_size: 10
+pool_lifetime: 300
+max_concurrency: 8
+
+# Response Cache Settings (ttl in seconds per endpoint, 0 disables caching)
+cache_dir: ~/.optic/cache
+cache_max_size_mb: 100
+cache_ttl:
+  _cat/indices: 30
+  _cat/aliases: 30
+
+# Daemon Settings (optic serve)
+daemon_socket: ~/.optic/optic.sock
+daemon_refresh_interval: 30
+daemon_max_age: 120
+
 # Cluster Info Settings
 storage_percent_thresholds:
   GREEN: 80
@@ -0,0 +1,73 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import json
+import os
+
+from optic.common.config import DEFAULT_DAEMON_SOCKET
+from optic.common.exceptions import OpticAPIError
+
+# Seconds to wait for an answer (the first query of a cluster is not answered
+# from warm state, and waits for the cluster like a command would)
+DEFAULT_DAEMON_TIMEOUT = 300
+
+
+def query_daemon(path, request, socket_path=None, timeout=DEFAULT_DAEMON_TIMEOUT):
+    """
+    Sends a query to the optic daemon (optic serve) listening on a Unix socket
+
+    Messages the daemon printed while answering (e.g. unreachable clusters) are
+    printed, and the clusters it could not query are recorded like local failures
+    (see recording_failures).  None is returned when no daemon is running, so that the caller can
+    answer the query itself.
+
+    :param str path: query path (e.g. /index/info)
+    :param dict request: query arguments
+    :param str socket_path: path of the daemon Unix socket
+    :param float timeout: seconds to wait for the answer
+    :return: query result, or None if the daemon is not running
+    :rtype: list | None
+    :raises OpticAPIError: if the daemon could not answer the query
+    """
+    socket_path = os.path.expanduser(socket_path or DEFAULT_DAEMON_SOCKET)
+    if not os.path.exists(socket_path):
+        return None
+
+    # imported here as they are only needed when a daemon is running
+    import http.client
+    import socket
+
+    from optic.common.concurrency import record_failures
+
+    class UnixHTTPConnection(http.client.HTTPConnection):
+        def connect(self):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(self.timeout)
+            self.sock.connect(socket_path)
+
+    connection = UnixHTTPConnection("localhost", timeout=timeout)
+    try:
+        connection.request(
+            "POST",
+            path,
+            body=json.dumps(request),
+            headers={"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        status = response.status
+        body = json.loads(response.read())
+    except (OSError, http.client.HTTPException, ValueError):
+        # stale socket of a daemon that is no longer running
+        return None
+    finally:
+        connection.close()
+
+    for message in body.get("messages", ()):
+        print(message)
+    record_failures(body.get("failures", ()))
+    if status != 200:
+        raise OpticAPIError(body.get("error", f"optic daemon answered {status}"))
+    return body["result"]
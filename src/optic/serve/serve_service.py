@@ -0,0 +1,504 @@
+# ** OPTIC
+# **
+# ** Copyright (c) 2024-2025 Oracle Corporation
+# ** Licensed under the Universal Permissive License v 1.0
+# ** as shown at https://oss.oracle.com/licenses/upl/
+
+import contextlib
+import http.server
+import io
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from optic.alias.alias_service import get_alias_info
+from optic.cluster.cluster import (
+    FETCHED_PROPERTIES,
+    INFO_PROPERTIES,
+    configure_cluster,
+)
+from optic.cluster.cluster_service import get_cluster_info, get_selected_clusters
+from optic.common.concurrency import (
+    map_clusters,
+    recording_failures,
+    report_failures,
+)
+from optic.common.config import (
+    DEFAULT_DAEMON_MAX_AGE,
+    DEFAULT_DAEMON_REFRESH_INTERVAL,
+    DEFAULT_DAEMON_SOCKET,
+    read_cluster_config,
+)
+from optic.common.exceptions import OpticDataError, OpticError
+from optic.index.index_service import get_index_info, plan_index_query
+
+# Clusters not queried for this many seconds are no longer refreshed
+DEFAULT_IDLE_TIMEOUT = 600
+
+# Settings that only change how results are displayed, not the clusters queried
+_DISPLAY_SETTINGS = ("no_color", "disable_terminal_color", "optic_settings_file_path")
+# Query arguments ignored over TCP, which any local user can connect to: they
+# could read other configuration files or send the credentials to other URLs
+_OWNER_ONLY_ARGUMENTS = ("cluster_config_file_path", "settings")
+
+
+def _file_signature(file_path) -> tuple | None:
+    """
+    Returns what identifies a version of a file (modification time and size)
+
+    :param str file_path: path of the file
+    :return: (modification time in nanoseconds, size), or None if it does not exist
+    :rtype: tuple | None
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _ThreadOutput:
+    def __init__(self, stream):
+        """
+        Replacement of sys.stdout capturing what the thread answering a query
+        prints (e.g. unreachable clusters), so that it is sent with the answer.
+        Everything else is written to the original stream.
+
+        :param TextIO stream: original standard output
+        """
+        self.stream = stream
+        self._local = threading.local()
+
+    def write(self, text) -> int:
+        return (getattr(self._local, "buffer", None) or self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @contextlib.contextmanager
+    def capture(self):
+        """
+        Captures what the current thread prints
+
+        :return: buffer holding the captured text
+        :rtype: io.StringIO
+        """
+        self._local.buffer = io.StringIO()
+        try:
+            yield self._local.buffer
+        finally:
+            self._local.buffer = None
+
+
+class _WarmClusters:
+    def __init__(self, cluster_config_file_path, settings):
+        """
+        Clusters of a cluster configuration file, configured with the same settings,
+        whose state is kept between queries and refreshed in the background
+
+        :param str cluster_config_file_path: path of the cluster configuration file
+        :param dict settings: optic settings the clusters are configured with
+        """
+        self.cluster_config_file_path = cluster_config_file_path
+        self.settings = settings
+        self.lock = threading.Lock()
+        self._signature = None
+        self._cluster_config = None
+        self._clusters = {}
+        self._last_used = {}
+
+    def _new_clusters(self, cluster_selection) -> list:
+        clusters = get_selected_clusters(self._cluster_config, list(cluster_selection))
+        max_age = self.settings.get("daemon_max_age", DEFAULT_DAEMON_MAX_AGE)
+        for cluster in clusters:
+            configure_cluster(cluster, self.settings)
+            if max_age:
+                # state older than this is retrieved again when queried, even if
+                # background refreshes are disabled or failing
+                cluster.property_ttl = {
+                    **dict.fromkeys(FETCHED_PROPERTIES, max_age),
+                    **cluster.property_ttl,
+                }
+        return clusters
+
+    def select(self, cluster_selection, properties) -> list:
+        """
+        Returns the warm Cluster objects of the selected clusters and groups, reading
+        the cluster configuration file again if it was modified (lock must be held)
+
+        :param list cluster_selection: cluster or cluster group names (all if empty)
+        :param tuple properties: cluster properties the query reads, kept warm by
+            background refreshes
+        :return: list of Cluster type objects
+        :rtype: list
+        :raises OpticConfigurationFileError: if the configuration file cannot be read
+        """
+        signature = _file_signature(self.cluster_config_file_path)
+        if self._cluster_config is None or signature != self._signature:
+            self._cluster_config = read_cluster_config(self.cluster_config_file_path)
+            self._signature = signature
+            self._clusters = {}
+            self._last_used = {}
+
+        now = time.monotonic()
+        clusters = []
+        for cluster in self._new_clusters(cluster_selection):
+            clusters.append(self._clusters.setdefault(cluster.name, cluster))
+            for name in properties:
+                self._last_used[cluster.name, name] = now
+        return clusters
+
+    def refresh(self, max_concurrency=None, idle_timeout=DEFAULT_IDLE_TIMEOUT) -> None:
+        """
+        Retrieves again the state of the clusters queried recently, bypassing cached
+        responses, and replaces the warm Cluster objects of the clusters that answered
+
+        :param int max_concurrency: maximum number of clusters queried at the same time
+        :param int idle_timeout: seconds after which unused clusters are not refreshed
+        :return: None
+        :rtype: None
+        """
+        with self.lock:
+            oldest = time.monotonic() - idle_timeout
+            self._last_used = {
+                key: used for key, used in self._last_used.items() if used >= oldest
+            }
+            properties = {}
+            for cluster_name, name in self._last_used:
+                properties.setdefault(cluster_name, set()).add(name)
+            cluster_config = self._cluster_config
+            if not properties:
+                return
+            clusters = self._new_clusters(properties)
+
+        results, failures = map_clusters(
+            lambda cluster: cluster.refresh(*properties[cluster.name]),
+            clusters,
+            max_concurrency,
+        )
+        for cluster, err in failures:
+            logging.warning(f"could not refresh {cluster.name}: {err}")
+        with self.lock:
+            if self._cluster_config is cluster_config:
+                for cluster, _ in results:
+                    self._clusters[cluster.name] = cluster
+
+
+class OpticDaemon:
+    def __init__(
+        self,
+        settings,
+        refresh_interval=DEFAULT_DAEMON_REFRESH_INTERVAL,
+        idle_timeout=DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        Answers cluster, index and alias information queries from Cluster objects
+        kept warm between queries, whose state is refreshed in the background every
+        refresh_interval seconds (0 to only retrieve it when first queried).  State
+        older than the daemon_max_age setting is retrieved again when queried.
+
+        Index queries are answered from warm index tables when the clusters hold
+        one, and are otherwise planned and pushed down to the clusters like a
+        command; full index tables are only retrieved by background refreshes.
+
+        Queries are answered while the daemon is used as a context manager.
+
+        :param dict settings: optic settings (queries can override them)
+        :param int refresh_interval: seconds between background refreshes
+        :param int idle_timeout: seconds after which unused clusters are not refreshed
+        """
+        self.settings = settings
+        self.refresh_interval = refresh_interval
+        self.idle_timeout = idle_timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresh_thread = None
+        self._output = None
+
+    def __enter__(self):
+        self._output = _ThreadOutput(sys.stdout)
+        sys.stdout = self._output
+        self._stop.clear()
+        if self.refresh_interval:
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_loop, name="optic-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+        sys.stdout = self._output.stream
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            with self._lock:
+                entries = list(self._entries.values())
+            for entry in entries:
+                entry.refresh(entry.settings.get("max_concurrency"), self.idle_timeout)
+
+    def _entry(self, request) -> _WarmClusters:
+        """
+        Returns the warm clusters a query is answered from
+
+        :param dict request: query arguments
+        :return: warm clusters of the cluster configuration file and settings queried
+        :rtype: _WarmClusters
+        """
+        settings = {**self.settings, **(request.get("settings") or {})}
+        cluster_config_file_path = os.path.abspath(
+            os.path.expanduser(
+                request.get("cluster_config_file_path")
+                or settings["cluster_config_file_path"]
+            )
+        )
+        key = (
+            cluster_config_file_path,
+            json.dumps(
+                {
+                    setting: value
+                    for setting, value in settings.items()
+                    if setting not in _DISPLAY_SETTINGS
+                },
+                sort_keys=True,
+                default=str,
+            ),
+        )
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = _WarmClusters(cluster_config_file_path, settings)
+            return self._entries[key]
+
+    def query(self, kind, request) -> dict:
+        """
+        Answers a query with the same results as the matching library function
+        (get_cluster_info, get_index_info, or get_alias_info)
+
+        :param str kind: cluster, index, or alias
+        :param dict request: query arguments (cluster_config_file_path,
+            cluster_selection, settings, max_concurrency, and for index queries
+            filters, sort_by, fields, and top)
+        :return: dictionary with the query result, the messages printed, and the
+            names of the clusters that could not be queried
+        :rtype: dict
+        :raises OpticError: if the query cannot be answered
+        """
+        if kind not in INFO_PROPERTIES:
+            raise OpticDataError(f"Unrecognized query: {kind} info")
+        entry = self._entry(request)
+        settings = entry.settings
+        max_concurrency = request.get("max_concurrency") or settings.get(
+            "max_concurrency"
+        )
+        cluster_selection = request.get("cluster_selection") or ()
+        with (
+            self._output.capture() as messages,
+            entry.lock,
+            recording_failures() as failed_clusters,
+        ):
+            match kind:
+                case "cluster" | "alias":
+                    properties = INFO_PROPERTIES[kind]
+                    clusters = entry.select(cluster_selection, properties)
+                    results, failures = map_clusters(
+                        lambda cluster: cluster.fetch(*properties),
+                        clusters,
+                        max_concurrency,
+                    )
+                    report_failures(failures)
+                    clusters = [cluster for cluster, _ in results]
+                    if kind == "cluster":
+                        result = get_cluster_info(clusters, max_concurrency)
+                    else:
+                        result = get_alias_info(clusters, max_concurrency)
+                case "index":
+                    # a warm index table is filtered in memory, otherwise the query
+                    # plan pushes work down to the cluster, like a command would
+                    query_plan = plan_index_query(
+                        request.get("filters") or {},
+                        request.get("sort_by") or [],
+                        request.get("fields"),
+                    )
+                    properties = ("index_table",)
+                    if query_plan.with_write_alias:
+                        properties += ("alias_list",)
+                    result = get_index_info(
+                        entry.select(cluster_selection, properties),
+                        query_plan.index_filter,
+                        request.get("sort_by"),
+                        max_concurrency,
+                        request.get("fields"),
+                        settings.get("byte_type"),
+                        request.get("top"),
+                    )
+        return {
+            "result": result,
+            "messages": messages.getvalue().splitlines(),
+            "failures": failed_clusters,
+        }
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    server_version = "optic"
+
+    def do_GET(self) -> None:  # noqa: N802
+        path, _, query = self.path.partition("?")
+        if path == "/status":
+            self._send(200, {"status": "ok"})
+            return
+        # e.g. /index/info?cluster=my_group, for dashboards
+        self._answer({"cluster_selection": parse_qs(query).get("cluster", [])})
+
+    def do_POST(self) -> None:  # noqa: N802
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "Query arguments must be a JSON object"})
+            return
+        if not isinstance(request, dict):
+            self._send(400, {"error": "Query arguments must be a JSON object"})
+            return
+        self._answer(request)
+
+    def _answer(self, request) -> None:
+        kind, _, tool = urlsplit(self.path).path.strip("/").partition("/")
+        if tool != "info" or kind not in INFO_PROPERTIES:
+            self._send(404, {"error": f"Unrecognized query: {self.path}"})
+            return
+        request = {
+            argument: value
+            for argument, value in request.items()
+            if argument not in self.server.ignored_arguments
+        }
+        try:
+            body = self.server.optic_daemon.query(kind, request)
+        except OpticError as err:
+            self._send(400, {"error": str(err)})
+            return
+        self._send(200, body)
+
+    def _send(self, status, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, message_format, *args) -> None:
+        logging.debug("optic daemon: " + message_format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _socket_in_use(socket_path) -> bool:
+    """
+    Returns whether a process is listening on a Unix socket
+
+    :param str socket_path: path of the socket
+    :return: True if a connection to the socket succeeds
+    :rtype: bool
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def create_server(optic_daemon, socket_path=None, port=None):
+    """
+    Creates the HTTP server answering queries for a daemon, listening on a Unix
+    socket, or on a localhost TCP port if one is given
+
+    Only the user running the daemon can connect to the Unix socket.  Any local
+    user can connect to the TCP port, so queries received on it are answered with
+    the cluster configuration file and settings of the daemon, and the ones they
+    give are ignored
+
+    :param OpticDaemon optic_daemon: daemon answering the queries
+    :param str socket_path: path of the Unix socket
+    :param int port: localhost TCP port (None to listen on the Unix socket)
+    :return: HTTP server
+    :rtype: socketserver.BaseServer
+    :raises OpticError: if another daemon is listening on the socket
+    """
+    if port is not None:
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _RequestHandler)
+        server.ignored_arguments = _OWNER_ONLY_ARGUMENTS
+    else:
+        socket_path = os.path.expanduser(socket_path or DEFAULT_DAEMON_SOCKET)
+        if os.path.exists(socket_path):
+            if _socket_in_use(socket_path):
+                raise OpticError(
+                    f"An optic daemon is already listening on {socket_path}"
+                )
+            os.remove(socket_path)
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+        # only the user running the daemon can connect to it
+        umask = os.umask(0o177)
+        try:
+            server = _UnixHTTPServer(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        server.ignored_arguments = ()
+    server.optic_daemon = optic_daemon
+    return server
+
+
+def run_daemon(
+    settings,
+    socket_path=None,
+    port=None,
+    refresh_interval=DEFAULT_DAEMON_REFRESH_INTERVAL,
+    idle_timeout=DEFAULT_IDLE_TIMEOUT,
+) -> None:
+    """
+    Answers queries until interrupted (optic serve)
+
+    :param dict settings: optic settings
+    :param str socket_path: path of the Unix socket
+    :param int port: localhost TCP port (None to listen on the Unix socket)
+    :param int refresh_interval: seconds between background refreshes
+    :param int idle_timeout: seconds after which unused clusters are not refreshed
+    :return: None
+    :rtype: None
+    :raises OpticError: if another daemon is listening on the socket
+    """
+    socket_path = os.path.expanduser(
+        socket_path or settings.get("daemon_socket") or DEFAULT_DAEMON_SOCKET
+    )
+    optic_daemon = OpticDaemon(settings, refresh_interval, idle_timeout)
+    server = create_server(optic_daemon, socket_path, port)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(
+        "optic daemon listening on "
+        + (socket_path if port is None else f"http://127.0.0.1:{port}")
+    )
+    try:
+        with optic_daemon, server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if port is None:
+            with contextlib.suppress(OSError):
+                os.remove(socket_path)
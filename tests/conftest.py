@@ -1,10 +1,114 @@
 import shutil
 import tempfile
+from types import SimpleNamespace
 
 import pytest
 import yaml
 
-from optic.common.config import ClusterConfig
+from optic.cluster.cluster import Cluster
+from optic.common.config import DEFAULT_OPTIC_SETTINGS, ClusterConfig
+
+SIM_HEALTH_RESPONSE = {"status": "green"}
+
+SIM_ALLOCATION_RESPONSE = [{"disk.used": "40", "disk.total": "100"}]
+
+SIM_INDICES_RESPONSE = [
+    {
+        "health": "green",
+        "status": "open",
+        "index": "stockindex",
+        "uuid": "XXX",
+        "pri": "1",
+        "rep": "1",
+        "docs.count": "2016",
+        "docs.deleted": "15",
+        "store.size": "954kb",
+        "pri.store.size": "954kb",
+        "creation.date.string": "2024-06-04T15:17:41.806Z",
+    },
+    {
+        "health": "green",
+        "status": "open",
+        "index": "students",
+        "uuid": "YYY",
+        "pri": "2",
+        "rep": "1",
+        "docs.count": "15",
+        "docs.deleted": "0",
+        "store.size": "2mb",
+        "pri.store.size": "1mb",
+        "creation.date.string": "2024-06-04T15:17:41.806Z",
+    },
+]
+
+SIM_ALIASES_RESPONSE = [
+    {
+        "alias": "alias1",
+        "index": "students",
+        "filter": "-",
+        "routing.index": "-",
+        "routing.search": "-",
+        "is_write_index": "true",
+    }
+]
+
+
+@pytest.fixture(autouse=True)
+def completion_dir(tmp_path, monkeypatch):
+    # keep shell completion data written by commands out of the home directory
+    completion_dir = str(tmp_path / "completion")
+    monkeypatch.setattr(
+        "optic.common.completion.DEFAULT_COMPLETION_DIR", completion_dir
+    )
+    return completion_dir
+
+
+@pytest.fixture(autouse=True)
+def daemon_socket(tmp_path, monkeypatch):
+    # never answer test queries with an optic daemon running on the machine
+    daemon_socket = str(tmp_path / "optic.sock")
+    monkeypatch.setitem(DEFAULT_OPTIC_SETTINGS, "daemon_socket", daemon_socket)
+    monkeypatch.setattr("optic.serve.serve_client.DEFAULT_DAEMON_SOCKET", daemon_socket)
+    return daemon_socket
+
+
+@pytest.fixture
+def cluster_api(mocker):
+    """
+    Simulates the API of every cluster: queries are answered with the response
+    of the first endpoint in cluster_api.responses they start with (called with
+    the query if it is a function), and recorded in cluster_api.queries as
+    (cluster name, path) pairs
+    """
+    cluster_api = SimpleNamespace(
+        queries=[],
+        responses={
+            "_cluster/health": SIM_HEALTH_RESPONSE,
+            "_cat/allocation": SIM_ALLOCATION_RESPONSE,
+            "_cat/indices": SIM_INDICES_RESPONSE,
+            "_cat/aliases": SIM_ALIASES_RESPONSE,
+        },
+    )
+
+    def action(cluster, query):
+        cluster_api.queries.append((cluster.name, query.split("?")[0]))
+        response = next(
+            response
+            for endpoint, response in cluster_api.responses.items()
+            if query.startswith("/" + endpoint)
+        )
+        api = mocker.Mock()
+        api.response = response(query) if callable(response) else response
+        api.iter_rows.side_effect = lambda: iter(api.response)
+        return api
+
+    mocker.patch.object(Cluster, "_action", autospec=True, side_effect=action)
+    return cluster_api
+
+
+@pytest.fixture
+def api_cluster(cluster_api):
+    return Cluster(name="test_cluster")
 
 
 @pytest.fixture
@@ -4,8 +4,17 @@ from unittest.mock import patch
 import pytest
 from urllib3.response import HTTPResponse
 
-from optic.common.api import OpenSearchAction
-from optic.common.exceptions import OpticAPIError
+from optic.cluster.cluster import Cluster, configure_cluster
+from optic.common.api import (
+    DEFAULT_POOL_LIFETIME,
+    OpenSearchAction,
+    SessionRegistry,
+    session_registry,
+)
+from optic.common.exceptions import OpticAPIError, OpticDataError
+
+# credentials of the example clusters, never sent anywhere
+PASSWORD = "p"  # noqa: S105
 
 
 class TestOpenSearchActionClass:
@@ -31,6 +40,19 @@ class TestOpenSearchActionClass:
 
         assert api.response == {"request": "valid"}
 
+    def test_empty_response_retrieved_once(self, mocker):
+        mock_response = mocker.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = []
+
+        api = OpenSearchAction(url="http://example.com/optic")
+        mock_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+        assert api.response == []
+        assert api.response == []
+        assert list(api.iter_rows()) == []
+        mock_get.assert_called_once()
+
     # attempt 4 different backoff_factors to ensure the number is being correctly handled by OpenSearchAction
     @pytest.mark.parametrize("backoff_factor", [0.5, 1, 2, 5])
     def test_retry_failure_until_success(self, backoff_factor):
@@ -127,3 +149,79 @@ class TestOpenSearchActionClass:
 
         # Assert the _make_request method was called the expected number of times (first call is not considered a retry)
         assert mock_make_request.call_count == retries + 1
+
+    def test_rows_streamed_from_response(self):
+        body = b'[{"index": "stockindex"}, {"index": "students"}]'
+        with patch(
+            "urllib3.connectionpool.HTTPConnectionPool._make_request",
+            return_value=self._http_response(200, body),
+        ):
+            action = OpenSearchAction(url="http://example.com/optic")
+            rows = action.iter_rows()
+            assert next(rows) == {"index": "stockindex"}
+            assert list(rows) == [{"index": "students"}]
+
+    def test_truncated_streamed_response(self):
+        with patch(
+            "urllib3.connectionpool.HTTPConnectionPool._make_request",
+            return_value=self._http_response(200, b'[{"index": "stockindex"}, {"ind'),
+        ):
+            action = OpenSearchAction(url="http://example.com/optic")
+            with pytest.raises(OpticDataError):
+                list(action.iter_rows())
+
+
+class TestSessionRegistry:
+    def test_actions_for_same_cluster_share_session(self):
+        first = OpenSearchAction(url="http://pool.example.com", usr="u", pwd=PASSWORD)
+        second = OpenSearchAction(url="http://pool.example.com", usr="u", pwd=PASSWORD)
+        assert first.session is second.session
+
+    def test_actions_for_different_connections_do_not_share_session(self):
+        base = OpenSearchAction(url="http://pool.example.com", usr="u", pwd=PASSWORD)
+        other_user = OpenSearchAction(
+            url="http://pool.example.com", usr="x", pwd=PASSWORD
+        )
+        other_ssl = OpenSearchAction(
+            url="http://pool.example.com", usr="u", pwd=PASSWORD, verify_ssl=False
+        )
+        assert base.session is not other_user.session
+        assert base.session is not other_ssl.session
+        assert other_user.session is not other_ssl.session
+
+    def test_session_recycled_after_lifetime(self, mocker):
+        registry = SessionRegistry()
+        args = ("http://pool.example.com", "u", "p", True, 3, 2, (500,))
+        mock_time = mocker.patch("optic.common.api.time.monotonic", return_value=0)
+        session = registry.get(*args, pool_lifetime=10)
+        mock_time.return_value = 5
+        assert registry.get(*args, pool_lifetime=10) is session
+        mock_time.return_value = 11
+        assert registry.get(*args, pool_lifetime=10) is not session
+
+    def test_session_pool_size(self):
+        registry = SessionRegistry()
+        session = registry.get(
+            "http://pool.example.com", "u", "p", True, 3, 2, (500,), pool_size=4
+        )
+        assert session.get_adapter("http://pool.example.com")._pool_maxsize == 4
+        registry.close()
+
+    def test_cluster_pool_lifetime_zero(self):
+        # 0 never recycles the pooled session, it is not replaced by the default
+        assert Cluster(name="pool_cluster", pool_lifetime=0).pool_lifetime == 0
+        assert Cluster(name="pool_cluster").pool_lifetime == DEFAULT_POOL_LIFETIME
+        cluster = configure_cluster(Cluster(name="pool_cluster"), {"pool_lifetime": 0})
+        assert cluster.pool_lifetime == 0
+
+    def test_cluster_exposes_pooled_session(self):
+        cluster = Cluster(
+            url="http://pool.example.com",
+            auth={"username": "u", "password": PASSWORD},
+            name="pool_cluster",
+        )
+        assert cluster.session is cluster.session
+        assert cluster.session is cluster._action("/_cluster/health").session
+        assert cluster.session in [
+            session for session, _ in session_registry._sessions.values()
+        ]
@@ -0,0 +1,226 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from optic.cluster.cluster import Cluster
+from optic.cluster.cluster_service import async_get_cluster_info
+from optic.common.exceptions import OpticAPIError
+from optic.index.index_service import async_get_index_info
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from optic.common.async_api import (  # noqa: E402
+    AsyncOpenSearchAction,
+    async_session_registry,
+    close_async_sessions,
+)
+
+# credentials of the test servers, never checked
+PASSWORD = "p"  # noqa: S105
+
+CAT_INDICES = [
+    {
+        "health": "green",
+        "status": "open",
+        "index": "stockindex",
+        "uuid": "XXX",
+        "pri": "1",
+        "rep": "1",
+        "docs.count": "2016",
+        "docs.deleted": "15",
+        "store.size": "954kb",
+        "pri.store.size": "954kb",
+        "creation.date.string": "2024-06-04T15:17:41.806Z",
+    }
+]
+
+CAT_ALIASES = [
+    {
+        "alias": "stock",
+        "index": "stockindex",
+        "filter": "-",
+        "routing.index": "-",
+        "routing.search": "-",
+        "is_write_index": "true",
+    }
+]
+
+
+def run_with_server(routes, test):
+    """
+    Runs a coroutine test function against a local HTTP server serving routes
+    """
+
+    async def main():
+        app = web.Application()
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+        async with TestServer(app) as server:
+            try:
+                return await test(str(server.make_url("")).rstrip("/"))
+            finally:
+                await close_async_sessions()
+
+    return asyncio.run(main())
+
+
+def json_route(body):
+    async def handler(request):
+        return web.json_response(body)
+
+    return handler
+
+
+def sequence_route(statuses, body):
+    remaining = list(statuses)
+
+    async def handler(request):
+        status = remaining.pop(0) if remaining else 200
+        return web.json_response(
+            body if status == 200 else {"error": status}, status=status
+        )
+
+    return handler
+
+
+class TestAsyncOpenSearchAction:
+    def test_successful_request(self):
+        async def test(url):
+            api = AsyncOpenSearchAction(url=url, query="/optic", usr="u", pwd=PASSWORD)
+            return await api.response()
+
+        async def handler(request):
+            assert request.headers["Authorization"] == "Basic dTpw"
+            return web.json_response({"request": "valid"})
+
+        assert run_with_server({"/optic": handler}, test) == {"request": "valid"}
+
+    @pytest.mark.parametrize("backoff_factor", [0.5, 1, 2, 5])
+    def test_retry_failure_until_success(self, backoff_factor):
+        requested_sleep_seconds = []
+        original_sleep = asyncio.sleep
+
+        async def _patched_sleep(seconds):
+            requested_sleep_seconds.append(seconds)
+            await original_sleep(0)
+
+        async def test(url):
+            api = AsyncOpenSearchAction(
+                url=url, query="/optic", retries=5, backoff_factor=backoff_factor
+            )
+            with patch("optic.common.async_api.asyncio.sleep", _patched_sleep):
+                return await api.response()
+
+        routes = {"/optic": sequence_route([502, 500, 503], {"result": "success"})}
+        assert run_with_server(routes, test) == {"result": "success"}
+        # same schedule as the urllib3 Retry used by OpenSearchAction
+        assert requested_sleep_seconds == [backoff_factor * 2, backoff_factor * 4]
+
+    @pytest.mark.parametrize("retries", [0, 2, 4])
+    def test_retry_failure_until_exhausted(self, retries):
+        attempts = []
+
+        async def handler(request):
+            attempts.append(request)
+            return web.json_response({"error": "bad gateway"}, status=502)
+
+        async def test(url):
+            api = AsyncOpenSearchAction(
+                url=url, query="/optic", retries=retries, backoff_factor=0
+            )
+            return await api.response()
+
+        with pytest.raises(OpticAPIError) as exc_info:
+            run_with_server({"/optic": handler}, test)
+        assert f"after {retries} retries" in str(exc_info.value)
+        assert "502 error responses" in str(exc_info.value)
+        assert len(attempts) == retries + 1
+
+    def test_non_retryable_error(self):
+        async def test(url):
+            api = AsyncOpenSearchAction(url=url, query="/missing")
+            return await api.response()
+
+        with pytest.raises(OpticAPIError) as exc_info:
+            run_with_server({"/optic": json_route({})}, test)
+        assert "did not attempt to retry" in str(exc_info.value)
+
+    def test_rows_streamed_from_response(self):
+        async def test(url):
+            api = AsyncOpenSearchAction(url=url, query="/_cat/indices")
+            return [row async for row in api.iter_rows()]
+
+        routes = {"/_cat/indices": json_route(CAT_INDICES * 3)}
+        assert run_with_server(routes, test) == CAT_INDICES * 3
+
+    def test_actions_share_pooled_session(self):
+        async def test(url):
+            sessions = []
+            for _ in range(2):
+                async with async_session_registry.session(url, "u", "p", True) as s:
+                    sessions.append(s)
+            return sessions
+
+        first, second = run_with_server({}, test)
+        assert first is second
+
+    def test_sessions_closed_when_loop_finishes(self):
+        async def main():
+            async with async_session_registry.session(
+                "http://pool.example.com", "u", PASSWORD, True
+            ) as session:
+                return session
+
+        # close_async_sessions is not called
+        session = asyncio.run(main())
+        assert session.closed
+        assert not async_session_registry._loops
+
+
+class TestAsyncCluster:
+    def _cluster(self, url, name="async_cluster"):
+        return Cluster(url=url, auth={"username": "u", "password": PASSWORD}, name=name)
+
+    def test_async_get_cluster_info(self):
+        routes = {
+            "/_cluster/health": json_route({"status": "green"}),
+            "/_cat/allocation": json_route([{"disk.used": "25", "disk.total": "100"}]),
+        }
+
+        async def test(url):
+            clusters = [self._cluster(url, f"cluster_{i}") for i in range(3)]
+            return await async_get_cluster_info(clusters)
+
+        assert run_with_server(routes, test) == [
+            {"name": f"cluster_{i}", "status": "green", "usage": 25} for i in range(3)
+        ]
+
+    def test_async_get_index_info(self):
+        routes = {
+            "/_cat/indices/{pattern}": json_route(CAT_INDICES),
+            "/_cat/aliases/{pattern}": json_route(CAT_ALIASES),
+        }
+
+        async def test(url):
+            return await async_get_index_info([self._cluster(url)])
+
+        index_info = run_with_server(routes, test)
+        assert index_info[0]["name"] == "stockindex"
+        assert index_info[0]["write_alias"] is True
+        assert index_info[0]["count"] == 2016
+        assert index_info[0]["cluster"] == "async_cluster"
+
+    def test_async_failures_are_reported(self, capsys):
+        routes = {"/_cluster/health": json_route({"status": "green"})}
+
+        async def test(url):
+            return await async_get_cluster_info([self._cluster(url)])
+
+        with patch.object(AsyncOpenSearchAction, "_backoff", return_value=0):
+            assert run_with_server(routes, test) == []
+        assert "Unable to retrieve information for async_cluster" in (
+            capsys.readouterr().out
+        )
@@ -0,0 +1,115 @@
+import pytest
+
+from benchmarks.opensearch_stub import StubOpenSearch, SyntheticCluster
+from benchmarks.run_benchmarks import compare, make_cluster, parse_args, run
+from optic.alias.alias_service import get_alias_info
+from optic.cluster.cluster_service import get_cluster_info
+from optic.common.api import close_sessions
+from optic.index.index_service import get_index_info
+from optic.index.index_table import epoch_millis
+
+
+@pytest.fixture
+def synthetic_cluster():
+    return SyntheticCluster(index_count=200, alias_count=30)
+
+
+@pytest.fixture
+def stub(synthetic_cluster):
+    with StubOpenSearch(synthetic_cluster) as stub:
+        yield stub
+    close_sessions()
+
+
+@pytest.fixture
+def cluster(stub):
+    return make_cluster(stub.url)
+
+
+class TestOpenSearchStub:
+    def test_synthetic_cluster(self, synthetic_cluster):
+        assert len(synthetic_cluster.indices) == 200
+        assert len({alias["alias"] for alias in synthetic_cluster.aliases}) == 30
+        # content is reproducible
+        assert SyntheticCluster(200, 30).aliases == synthetic_cluster.aliases
+
+    def test_index_info(self, cluster, synthetic_cluster):
+        index_dicts = get_index_info(
+            [cluster], sort_by=["age:desc"], fields=["name", "age", "type"]
+        )
+        assert len(index_dicts) == 200
+        ages = [index["age"] for index in index_dicts]
+        assert ages == sorted(ages, reverse=True)
+        assert {index["type"] for index in index_dicts} == {
+            "logs",
+            "metrics",
+            "traces",
+            "audit",
+            "UNDEFINED",
+        }
+
+    def test_pushed_down_query(self, cluster, synthetic_cluster):
+        filters = {"health": "yellow", "status": None}
+        index_dicts = get_index_info([cluster], filters, fields=["name"])
+        expected = [
+            index["index"]
+            for index in synthetic_cluster.indices
+            if index["health"] == "yellow"
+        ]
+        assert [index["name"] for index in index_dicts] == expected
+        oldest = synthetic_cluster.cat_indices(
+            params={"s": "creation.date", "h": "index,creation.date"}
+        )[0]
+        assert list(oldest) == ["index", "creation.date"]
+        assert int(oldest["creation.date"]) == min(
+            int(index["creation.date"]) for index in synthetic_cluster.indices
+        )
+        assert epoch_millis("2024-01-01") < int(oldest["creation.date"])
+
+    def test_alias_info(self, cluster):
+        alias_dicts = get_alias_info([cluster])
+        assert len(alias_dicts) == 30
+        for alias in alias_dicts:
+            (targets,) = alias.values()
+            assert [target["write_target"] for target in targets].count(True) == 1
+
+    def test_injected_errors(self, cluster, stub, capsys):
+        stub.error_rate = 1.0
+        stub.error_status = 400
+        assert get_cluster_info([cluster]) == []
+        assert "Unable to retrieve information for benchmark" in capsys.readouterr().out
+        assert stub.error_count == stub.request_count > 0
+
+
+class TestRunBenchmarks:
+    def test_run(self, stub):
+        options = parse_args(
+            ["--url", stub.url, "--indices", "200", "--rounds", "2", "--top", "5"]
+        )
+        results = run(options)["results"]
+        for stage in ("fetch", "parse", "build", "filter", "sort", "render"):
+            assert len(results[f"index/200/{stage}"]["rounds"]) == 2
+        assert "filter" not in {key.split("/")[2] for key in results if "alias" in key}
+        assert results["cluster/200/end_to_end"]["median"] > 0
+
+    def test_compare(self):
+        baseline = {
+            "results": {
+                "index/1000/render": {"median": 0.100},
+                "index/1000/sort": {"median": 0.0001},
+                "alias/1000/render": {"median": 0.100},
+            }
+        }
+        results = {
+            "results": {
+                "index/1000/render": {"median": 0.150},
+                # relative slowdown, but too short to be meaningful
+                "index/1000/sort": {"median": 0.0005},
+                "alias/1000/render": {"median": 0.110},
+                "cluster/1000/render": {"median": 0.010},
+            }
+        }
+        changes, regressions = compare(results, baseline, threshold=0.2)
+        assert regressions == ["index/1000/render"]
+        assert changes["alias/1000/render"] == pytest.approx(0.1)
+        assert "cluster/1000/render" not in changes
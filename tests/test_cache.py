@@ -0,0 +1,185 @@
+import os
+
+import pytest
+
+from benchmarks.opensearch_stub import StubOpenSearch, SyntheticCluster
+from benchmarks.run_benchmarks import make_cluster
+from optic.cluster.cluster import Cluster, configure_cluster
+from optic.common.api import OpenSearchAction, close_sessions
+from optic.common.cache import ResponseCache, credentials_key
+from optic.common.config import OpticSettings
+
+URL = "https://cache.example.com:9200"
+QUERY = "/_cat/indices/*?format=json"
+PASSWORD = "p"  # noqa: S105
+
+
+@pytest.fixture
+def cache(temp_dir):
+    return ResponseCache(
+        cache_dir=temp_dir, ttl={"_cat/indices": 30, "_cat/aliases": 0}
+    )
+
+
+@pytest.fixture
+def mock_get(mocker):
+    mock_response = mocker.Mock()
+    mock_response.json.return_value = [{"index": "stockindex"}]
+    return mocker.patch("requests.Session.get", return_value=mock_response)
+
+
+class TestResponseCache:
+    def test_ttl_for_endpoint(self, cache):
+        assert cache.ttl_for(QUERY) == 30
+        assert cache.ttl_for("_cat/indices/abc*") == 30
+        assert cache.ttl_for("/_cat/aliases/*?format=json") == 0
+        assert cache.ttl_for("/_cluster/health?pretty") == 0
+
+    def test_round_trip(self, cache):
+        cache.put(URL, "usr", QUERY, [{"index": "stockindex"}])
+        assert cache.get(URL, "usr", QUERY) == [{"index": "stockindex"}]
+        assert cache.get(URL, "other_usr", QUERY) is None
+        assert cache.get(URL, "usr", "/_cat/indices/other*") is None
+
+    def test_uncached_endpoint(self, cache, temp_dir):
+        cache.put(URL, "usr", "/_cat/aliases/*", [{"alias": "a"}])
+        assert cache.get(URL, "usr", "/_cat/aliases/*") is None
+        assert os.listdir(temp_dir) == []
+
+    def test_expired_entry(self, cache, mocker):
+        mock_time = mocker.patch("optic.common.cache.time.time", return_value=1000)
+        cache.put(URL, "usr", QUERY, [])
+        mock_time.return_value = 1029
+        assert cache.get(URL, "usr", QUERY) == []
+        mock_time.return_value = 1031
+        assert cache.get(URL, "usr", QUERY) is None
+
+    def test_corrupted_entry_is_a_miss(self, cache):
+        cache.put(URL, "usr", QUERY, [])
+        with open(cache._path(URL, "usr", QUERY), "w") as f:
+            f.write('{"created": ')
+        assert cache.get(URL, "usr", QUERY) is None
+
+    def test_atomic_write_leaves_no_temporary_files(self, cache, temp_dir):
+        cache.put(URL, "usr", QUERY, [{"index": "stockindex"}])
+        assert [name for name in os.listdir(temp_dir) if name.endswith(".tmp")] == []
+
+    def test_streamed_round_trip(self, cache, temp_dir):
+        rows = [{"index": f"index-{i}"} for i in range(3)]
+        writer = cache.writer(URL, "usr", QUERY)
+        for row in rows:
+            writer.write(row)
+        assert cache.get(URL, "usr", QUERY) is None
+        writer.commit()
+        assert list(cache.iter_rows(URL, "usr", QUERY)) == rows
+        assert cache.get(URL, "usr", QUERY) == rows
+        assert [name for name in os.listdir(temp_dir) if name.endswith(".tmp")] == []
+
+    def test_discarded_write_is_not_cached(self, cache, temp_dir):
+        writer = cache.writer(URL, "usr", QUERY)
+        writer.write({"index": "stockindex"})
+        writer.discard()
+        assert cache.iter_rows(URL, "usr", QUERY) is None
+        assert os.listdir(temp_dir) == []
+        assert cache.writer(URL, "usr", "/_cat/aliases/*") is None
+
+    def test_least_recently_used_entries_evicted(self, temp_dir):
+        cache = ResponseCache(cache_dir=temp_dir, ttl={"_cat/indices": 30})
+        for i in range(3):
+            cache.put(URL, "usr", f"/_cat/indices/{i}", ["x" * 1000])
+            path = cache._path(URL, "usr", f"/_cat/indices/{i}")
+            os.utime(path, (i, i))
+        # reading an entry makes it the most recently used one
+        assert cache.get(URL, "usr", "/_cat/indices/0") is not None
+
+        # room for exactly two of the three entries
+        cache.max_size = sum(
+            os.path.getsize(cache._path(URL, "usr", f"/_cat/indices/{i}"))
+            for i in (0, 2)
+        )
+        cache.evict()
+        assert cache.get(URL, "usr", "/_cat/indices/1") is None
+        assert cache.get(URL, "usr", "/_cat/indices/0") is not None
+        assert cache.get(URL, "usr", "/_cat/indices/2") is not None
+
+
+class TestOpenSearchActionCache:
+    def test_cached_response_skips_request(self, cache, mock_get):
+        for _ in range(3):
+            api = OpenSearchAction(url=URL, query=QUERY, usr="usr", cache=cache)
+            assert api.response == [{"index": "stockindex"}]
+        mock_get.assert_called_once()
+
+    def test_refresh_bypasses_cached_response(self, cache, mock_get):
+        credentials = credentials_key("usr", "")
+        cache.put(URL, credentials, QUERY, [{"index": "stale"}])
+        api = OpenSearchAction(
+            url=URL, query=QUERY, usr="usr", cache=cache, refresh_cache=True
+        )
+        assert api.response == [{"index": "stockindex"}]
+        assert cache.get(URL, credentials, QUERY) == [{"index": "stockindex"}]
+
+    def test_responses_not_shared_across_credentials(self, cache, mock_get):
+        for pwd in (PASSWORD, PASSWORD, "other", PASSWORD):
+            api = OpenSearchAction(
+                url=URL, query=QUERY, usr="usr", pwd=pwd, cache=cache
+            )
+            assert api.response == [{"index": "stockindex"}]
+        assert mock_get.call_count == 2
+
+    def test_streamed_response_is_cached(self, cache, mock_get):
+        mock_get.return_value.iter_content.return_value = [
+            b'[{"index": "stock',
+            b'index"}]',
+        ]
+        api = OpenSearchAction(url=URL, query=QUERY, usr="usr", cache=cache)
+        assert list(api.iter_rows()) == [{"index": "stockindex"}]
+        api = OpenSearchAction(url=URL, query=QUERY, usr="usr", cache=cache)
+        assert list(api.iter_rows()) == [{"index": "stockindex"}]
+        mock_get.assert_called_once()
+
+
+class TestClusterCache:
+    def test_cache_disabled_without_ttl(self):
+        assert Cluster(name="test_cluster").cache is None
+
+    def test_cache_disabled_for_settings_without_ttl(self, temp_dir):
+        settings = OpticSettings({"cache_dir": temp_dir}).fields
+        assert configure_cluster(Cluster(name="test_cluster"), settings).cache is None
+
+    def test_cache_from_settings(self, temp_dir):
+        cluster = configure_cluster(
+            Cluster(name="test_cluster"),
+            {"cache_dir": temp_dir, "cache_ttl": {"_cat/indices": 30}},
+        )
+        assert cluster.cache.cache_dir == temp_dir
+        assert cluster.cache.ttl_for(QUERY) == 30
+
+        cluster = configure_cluster(cluster, {"no_cache": True})
+        assert cluster.cache is None
+
+    def test_cache_kept_until_settings_change(self, temp_dir):
+        cluster = Cluster(
+            name="test_cluster", cache_dir=temp_dir, cache_ttl={"_cat/indices": 30}
+        )
+        cache = cluster.cache
+        assert cluster.cache is cache
+        cluster.cache_ttl["_cat/aliases"] = 10
+        assert cluster.cache is not cache
+        assert cluster.cache.ttl_for("/_cat/aliases/*?format=json") == 10
+
+    def test_refresh_bypasses_cache(self, temp_dir):
+        with StubOpenSearch(SyntheticCluster(index_count=50)) as stub:
+            cluster = make_cluster(stub.url)
+            cluster.no_cache = False
+            cluster.cache_dir = temp_dir
+            cluster.cache_ttl = {"_cat/indices": 30}
+            assert len(cluster.index_list) == 50
+            # invalidated properties are retrieved from the cache
+            cluster.invalidate("index_list")
+            cluster.index_list
+            assert stub.request_count == 1
+            cluster.refresh("index_list")
+            assert stub.request_count == 2
+            assert not cluster.refresh_cache
+        close_sessions()
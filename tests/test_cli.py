@@ -3,6 +3,8 @@ import pytest
 from click.testing import CliRunner
 
 from optic.cli import alias, cli, cluster, get_default_from_optic_settings, index, init
+from optic.cluster.cluster import Cluster
+from optic.common.exceptions import OpticAPIError
 
 
 @pytest.fixture
@@ -61,7 +63,9 @@ class TestCli:
         mock_exit.assert_called_once_with(1)
 
     def test_init_command_success(self, mocker, runner):
-        mock_initialize_optic = mocker.patch("optic.cli.initialize_optic")
+        mock_initialize_optic = mocker.patch(
+            "optic.initialize.initialize_service.initialize_optic"
+        )
         runner.invoke(cli, ["init"])
         mock_initialize_optic.assert_called_once()
 
@@ -98,8 +102,12 @@ class TestCli:
     def test_cluster_info_command_success(
         self, mocker, runner, optic_settings_file_path, optic_settings, cluster_config
     ):
-        mock_get_selected_clusters = mocker.patch("optic.cli.get_selected_clusters")
-        mock_get_cluster_info = mocker.patch("optic.cli.get_cluster_info")
+        mock_get_selected_clusters = mocker.patch(
+            "optic.cluster.cluster_service.get_selected_clusters"
+        )
+        mock_get_cluster_info = mocker.patch(
+            "optic.cluster.cluster_service.get_cluster_info"
+        )
 
         runner.invoke(
             cli,
@@ -115,6 +123,42 @@ class TestCli:
         mock_get_selected_clusters.assert_called_once()
         mock_get_cluster_info.assert_called_once()
 
+    @pytest.mark.parametrize("command", ["cluster", "index", "alias"])
+    def test_info_exits_with_error_when_a_cluster_fails(
+        self,
+        mocker,
+        runner,
+        command,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        def action(cluster, query):
+            if cluster.name == "cluster_1":
+                raise OpticAPIError("unreachable")
+            api = mocker.Mock()
+            if query.startswith("/_cluster/health"):
+                api.response = {"status": "green"}
+            elif query.startswith("/_cat/allocation"):
+                api.response = [{"disk.used": "40", "disk.total": "100"}]
+            else:
+                api.response = []
+            api.iter_rows.side_effect = lambda: iter(api.response)
+            return api
+
+        mocker.patch.object(Cluster, "_action", autospec=True, side_effect=action)
+        args = ["--settings", optic_settings_file_path, command, "info", "-o", "json"]
+
+        result = runner.invoke(cli, args + ["-c", "g2"])
+        assert result.exit_code == 1
+        assert "Unable to retrieve information for cluster_1" in result.output
+        if command == "cluster":
+            # the information of the clusters that answered is still written
+            assert '"name": "my_cluster"' in result.output
+
+        result = runner.invoke(cli, args + ["-c", "my_cluster"])
+        assert result.exit_code == 0
+
     def test_alias_tool_usage_display(self, ctx_obj, runner):
         result = runner.invoke(cli, ["alias"], obj=ctx_obj)
         assert result.exit_code == 0
@@ -128,8 +172,10 @@ class TestCli:
         optic_settings_file,
         cluster_config_file,
     ):
-        mock_get_selected_clusters = mocker.patch("optic.cli.get_selected_clusters")
-        mock_get_alias_info = mocker.patch("optic.cli.get_alias_info")
+        mock_get_selected_clusters = mocker.patch(
+            "optic.cluster.cluster_service.get_selected_clusters"
+        )
+        mock_get_alias_info = mocker.patch("optic.alias.alias_service.get_alias_info")
 
         runner.invoke(
             cli,
@@ -188,9 +234,11 @@ class TestCli:
         optic_settings_file,
         cluster_config_file,
     ):
-        mock_configure_cluster = mocker.patch("optic.cli.configure_cluster")
-        mock_get_index_info = mocker.patch("optic.cli.get_index_info")
-        mock_print_index_info = mocker.patch("optic.cli.print_index_info")
+        mock_configure_cluster = mocker.patch("optic.cluster.cluster.configure_cluster")
+        mock_get_index_info = mocker.patch("optic.index.index_service.get_index_info")
+        mock_print_index_info = mocker.patch(
+            "optic.index.index_service.print_index_info"
+        )
 
         runner.invoke(
             cli,
@@ -209,6 +257,93 @@ class TestCli:
         mock_get_index_info.assert_called_once()
         mock_print_index_info.assert_called_once()
 
+    def test_index_info_sort_keys_and_top(
+        self,
+        mocker,
+        runner,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        mocker.patch("optic.cluster.cluster.configure_cluster")
+        mock_get_index_info = mocker.patch("optic.index.index_service.get_index_info")
+        mocker.patch("optic.index.index_service.print_index_info")
+        args = ["--settings", optic_settings_file_path, "index", "info"]
+
+        result = runner.invoke(cli, args + ["-s", "Index-Size:DESC", "--top", "5"])
+        assert result.exit_code == 0
+        call_args = mock_get_index_info.call_args.args
+        assert call_args[2] == ["index-size:desc"]
+        assert call_args[-1] == 5
+
+        result = runner.invoke(cli, args + ["-s", "index-size:sideways"])
+        assert result.exit_code == 2
+        assert "Unrecognized sort direction" in result.output
+
+    def test_index_info_stream(
+        self,
+        mocker,
+        runner,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        mocker.patch("optic.cluster.cluster.configure_cluster")
+        mock_get_index_info = mocker.patch("optic.index.index_service.get_index_info")
+        mock_iter_index_info = mocker.patch("optic.index.index_service.iter_index_info")
+        records = [{"name": "index_1", "cluster": "cluster_1"}]
+        mock_iter_index_info.return_value = iter(records)
+        mock_print_stream = mocker.patch(
+            "optic.index.index_service.print_index_info_stream"
+        )
+
+        result = runner.invoke(
+            cli, ["--settings", optic_settings_file_path, "index", "info", "--stream"]
+        )
+        assert result.exit_code == 0
+        mock_get_index_info.assert_not_called()
+        mock_iter_index_info.assert_called_once()
+        assert mock_iter_index_info.call_args.kwargs == {"ordered": False}
+        assert list(mock_print_stream.call_args.args[0]) == records
+
+    def test_index_info_machine_readable_output(
+        self,
+        mocker,
+        runner,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        mocker.patch("optic.cluster.cluster.configure_cluster")
+        mock_iter_index_info = mocker.patch(
+            "optic.index.index_service.iter_index_info",
+            return_value=iter([{"name": "stockindex", "count": 2016}]),
+        )
+        mock_print_index_info = mocker.patch(
+            "optic.index.index_service.print_index_info"
+        )
+
+        result = runner.invoke(
+            cli,
+            [
+                "--settings",
+                optic_settings_file_path,
+                "index",
+                "info",
+                "-f",
+                "name",
+                "-f",
+                "count",
+                "--output",
+                "csv",
+            ],
+        )
+        assert result.exit_code == 0
+        assert result.output.splitlines() == ["name,count", "stockindex,2016"]
+        mock_print_index_info.assert_not_called()
+        # records are written in cluster order, as get_index_info orders them
+        assert mock_iter_index_info.call_args.kwargs == {"ordered": True}
+
     def test_option_get_default_from_optic_settings_absent(self, ctx_obj):
         context = click.Context(cli.commands["alias"].commands["info"], obj=ctx_obj)
         option_class = get_default_from_optic_settings("example_setting")
@@ -1,5 +1,6 @@
 import pytest
 
+from optic.alias.alias import Alias
 from optic.cluster.cluster import Cluster, ClusterHealth
 from optic.cluster.cluster_service import (
     build_cluster_info_table,
@@ -79,6 +80,152 @@ class TestClusterClass:
         ]
         assert test_cluster._calculate_storage_percent(sim_disk_response) == 34
 
+    def test_property_ttl(self, api_cluster, cluster_api, mocker):
+        now = mocker.patch("optic.cluster.cluster.time.time", return_value=1000.0)
+        api_cluster.property_ttl = {"health": 10}
+
+        assert api_cluster.health.status == "green"
+        assert api_cluster.storage_percent == 40
+        assert api_cluster.fetched_at == {"health": 1000.0, "storage_percent": 1000.0}
+
+        now.return_value = 1009.0
+        api_cluster.health
+        assert len(cluster_api.queries) == 2
+
+        # health expired, storage percent has no time to live
+        now.return_value = 1010.0
+        api_cluster.health
+        api_cluster.storage_percent
+        assert len(cluster_api.queries) == 3
+        assert api_cluster.fetched_at == {"health": 1010.0, "storage_percent": 1000.0}
+
+    def test_invalidate_and_refresh(self, api_cluster, cluster_api, mocker):
+        now = mocker.patch("optic.cluster.cluster.time.time", return_value=1000.0)
+        api_cluster.health
+        api_cluster.storage_percent
+
+        api_cluster.invalidate("health")
+        assert api_cluster._health is None
+        assert api_cluster.fetched_at == {"storage_percent": 1000.0}
+
+        # the properties held are retrieved again
+        now.return_value = 1005.0
+        api_cluster.refresh()
+        assert len(cluster_api.queries) == 3
+        assert api_cluster.fetched_at == {"storage_percent": 1005.0}
+
+        api_cluster.refresh("health")
+        assert api_cluster.fetched_at == {"storage_percent": 1005.0, "health": 1005.0}
+
+        api_cluster.invalidate()
+        assert api_cluster._health is None
+        assert api_cluster.fetched_at == {}
+
+    def test_invalidate_dependent_property(self):
+        cluster = Cluster(name="test_cluster")
+        cluster._alias_list = ["alias"]
+        cluster._write_alias_targets = {"index"}
+        cluster.fetched_at["alias_list"] = 1000.0
+
+        cluster.invalidate("write_alias_targets")
+        assert cluster._alias_list is None
+        assert cluster._write_alias_targets is None
+        assert cluster.fetched_at == {}
+
+    def test_falsy_values_retrieved_once(self, api_cluster, cluster_api):
+        cluster_api.responses.update(
+            {
+                "_cat/allocation": [{"disk.used": "0", "disk.total": "100"}],
+                "_cat/indices": [],
+                "_cat/aliases": [],
+            }
+        )
+        for _ in range(2):
+            assert api_cluster.storage_percent == 0
+            assert api_cluster.index_list == []
+            assert api_cluster.alias_list == []
+            assert api_cluster.write_alias_targets == set()
+        assert [path for _, path in cluster_api.queries] == [
+            "/_cat/allocation",
+            "/_cat/indices/*",
+            "/_cat/aliases/*",
+        ]
+
+    def test_alias_without_write_target(self):
+        alias = Alias(
+            alias_name="alias1",
+            info_response=[{"index": "students", "is_write_index": "false"}],
+        )
+        assert alias.write_targets == []
+        assert alias.write_targets is alias.write_targets
+
+    def test_records_keep_known_fields(self):
+        health = ClusterHealth(status="green", number_of_nodes="3", awareness={})
+        assert not hasattr(health, "__dict__")
+        assert health.number_of_nodes == 3
+        assert health.unassigned_shards is None
+        with pytest.raises(AttributeError):
+            health.awareness
+
+        kept = ClusterHealth(keep_unknown_fields=True, status="green", awareness={})
+        assert kept.awareness == {}
+        assert kept.as_dict()["awareness"] == {}
+
+    def test_alias_targets_parsed_from_response(self, api_cluster, cluster_api):
+        cluster_api.responses["_cat/aliases"] = [
+            {
+                "alias": "alias1",
+                "index": "students",
+                "filter": "*",
+                "routing.index": "1",
+                "routing.search": "-",
+                "is_write_index": "true",
+            }
+        ]
+        (alias,) = api_cluster.alias_list
+        (target,) = alias.targets
+        assert alias.info_response is None
+        assert not hasattr(target, "__dict__")
+        assert (target.index, target.filter, target.is_write_index) == (
+            "students",
+            True,
+            True,
+        )
+        assert getattr(target, "routing.index") == "1"
+        assert getattr(target, "routing.search") is False
+        assert target.extra_fields is None
+
+    def test_alias_response_dropped_once_parsed(self):
+        alias = Alias(alias_name="alias1", info_response=[{"index": "students"}])
+        assert [target.index for target in alias.targets] == ["students"]
+        assert alias.info_response is None
+
+    def test_alias_index(self, api_cluster, cluster_api):
+        cluster_api.responses["_cat/aliases"] = [
+            {"alias": "logs", "index": "logs-1", "is_write_index": "false"},
+            {"alias": "logs", "index": "logs-2", "is_write_index": "true"},
+            {"alias": "recent", "index": "logs-2", "filter": "*", "routing.index": "1"},
+        ]
+        alias_index = api_cluster.alias_index
+        assert len(alias_index) == 2
+        assert [target.index for target in alias_index.targets("logs")] == [
+            "logs-1",
+            "logs-2",
+        ]
+        assert alias_index.targets("missing") == []
+        assert alias_index.alias_names("logs-2") == ["logs", "recent"]
+        assert alias_index.write_aliases("logs-2") == ["logs"]
+        assert alias_index.aliases("logs-2")["recent"].filter is True
+        assert getattr(alias_index.aliases("logs-2")["recent"], "routing.index") == "1"
+        assert alias_index.alias_names("students") == []
+        assert api_cluster.write_alias_targets == {"logs-2"}
+        assert api_cluster.index_aliases("logs-2") == "logs,recent"
+
+        api_cluster.invalidate("alias_list")
+        assert api_cluster._alias_index is None
+        assert api_cluster.alias_index is not alias_index
+        assert len(cluster_api.queries) == 2
+
 
 class TestClusterService:
     def test_get_cluster_info(self, cluster_selection):
@@ -0,0 +1,128 @@
+import os
+
+import pytest
+from click.shell_completion import ShellComplete
+from click.testing import CliRunner
+
+from optic.cli import cli
+from optic.common.completion import complete_search_pattern, remember_names
+
+
+def complete(args, incomplete):
+    completion = ShellComplete(cli, {}, "optic", "_OPTIC_COMPLETE")
+    return [item.value for item in completion.get_completions(args, incomplete)]
+
+
+@pytest.fixture
+def mock_yaml_load(mocker):
+    return mocker.patch(
+        "optic.common.completion.yaml_load",
+        side_effect=AssertionError("configuration file parsed"),
+    )
+
+
+class TestCompletion:
+    def test_complete_cluster_selection(
+        self, mocker, optic_settings_file_path, optic_settings_file, cluster_config_file
+    ):
+        args = ["--settings", optic_settings_file_path, "index", "info", "-c"]
+        assert complete(args, "") == [
+            "cluster_1",
+            "cluster_2",
+            "cluster_3",
+            "g2",
+            "my_cluster",
+            "my_group",
+        ]
+
+        # served from the completion index until the configuration file changes
+        mock_yaml_load = mocker.patch("optic.common.completion.yaml_load")
+        assert complete(args, "my_") == ["my_cluster", "my_group"]
+        mock_yaml_load.assert_not_called()
+
+        with open(cluster_config_file, "a") as f:
+            f.write("  g3: [cluster_2]\n")
+        os.utime(cluster_config_file, ns=(0, 0))
+        mocker.stopall()
+        assert complete(args, "g") == ["g2", "g3"]
+
+    def test_commands_record_completion_index(
+        self,
+        mocker,
+        mock_yaml_load,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        mocker.patch("optic.cluster.cluster.configure_cluster")
+        mocker.patch("optic.cluster.cluster_service.get_cluster_info", return_value=[])
+        mocker.patch("optic.cluster.cluster_service.print_cluster_info")
+        # the command parses the configuration files with the real yaml_load
+        result = CliRunner().invoke(
+            cli, ["--settings", optic_settings_file_path, "cluster", "info"]
+        )
+        assert result.exit_code == 0
+
+        args = ["--settings", optic_settings_file_path, "cluster", "info", "-c"]
+        assert complete(args, "cluster_") == ["cluster_1", "cluster_2", "cluster_3"]
+        mock_yaml_load.assert_not_called()
+
+    def test_complete_search_pattern(
+        self,
+        mocker,
+        optic_settings_file_path,
+        optic_settings_file,
+        cluster_config_file,
+    ):
+        mocker.patch("optic.cluster.cluster.configure_cluster")
+        mocker.patch(
+            "optic.index.index_service.get_index_info",
+            return_value=[
+                {"name": "logs-1", "cluster": "cluster_1"},
+                {"name": "logs-2", "cluster": "cluster_2"},
+                {"name": "metrics-1", "cluster": "cluster_3"},
+            ],
+        )
+        mocker.patch("optic.index.index_service.print_index_info")
+        result = CliRunner().invoke(
+            cli, ["--settings", optic_settings_file_path, "index", "info"]
+        )
+        assert result.exit_code == 0
+        remember_names("aliases", {"cluster_1": ["logs"]})
+
+        args = ["--settings", optic_settings_file_path, "index", "info", "-p"]
+        assert complete(args, "") == ["logs", "logs-1", "logs-2", "metrics-1"]
+        assert complete(args, "logs-") == ["logs-1", "logs-2"]
+        assert complete(args, "logs-1,m") == ["logs-1,metrics-1"]
+        assert complete(args[:4] + ["-c", "my_group", "-p"], "") == [
+            "logs",
+            "logs-1",
+            "metrics-1",
+        ]
+        assert complete(args[:4] + ["-c", "cluster_2", "-p"], "") == ["logs-2"]
+
+    def test_remember_names(self, completion_dir, mocker):
+        ctx = mocker.Mock(params={})
+
+        def recorded():
+            return complete_search_pattern(ctx, None, "", completion_dir)
+
+        remember_names("indices", {"c1": ["logs-1", "logs-2", "metrics-1"]})
+        assert recorded() == ["logs-1", "logs-2", "metrics-1"]
+
+        # every index matching the pattern was retrieved: logs-2 no longer exists
+        remember_names("indices", {"c1": ["logs-1", "logs-3"]}, "logs-*")
+        assert recorded() == ["logs-1", "logs-3", "metrics-1"]
+
+        # filtered results only add names
+        remember_names("indices", {"c1": ["metrics-2"]}, "*", complete=False)
+        assert recorded() == ["logs-1", "logs-3", "metrics-1", "metrics-2"]
+
+        # names excluded by a pattern were not retrieved
+        remember_names("indices", {"c1": ["logs-1"]}, "*,-logs-3")
+        assert recorded() == ["logs-1", "logs-3", "metrics-1", "metrics-2"]
+
+    def test_missing_completion_data(self, mock_yaml_load, temp_dir):
+        args = ["--settings", f"{temp_dir}/missing.yaml", "alias", "info"]
+        assert complete(args + ["-c"], "") == []
+        assert complete(args + ["-p"], "") == []
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from optic.cluster.cluster import Cluster, ClusterHealth
+from optic.cluster.cluster_service import get_cluster_info
+from optic.common.concurrency import iter_clusters, map_clusters
+from optic.common.config import DEFAULT_OPTIC_SETTINGS, OpticSettings
+from optic.common.exceptions import OpticAPIError
+
+
+@pytest.fixture
+def clusters():
+    return [Cluster(name=f"test_cluster_{i}") for i in range(6)]
+
+
+class TestMapClusters:
+    def test_results_keep_cluster_order(self, clusters):
+        # later clusters answer first
+        def fetch(cluster):
+            time.sleep(0.01 * (len(clusters) - clusters.index(cluster)))
+            return cluster.name
+
+        results, failures = map_clusters(fetch, clusters, max_concurrency=6)
+        assert [result for _, result in results] == [c.name for c in clusters]
+        assert failures == []
+
+    def test_concurrency_is_bounded(self, clusters):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(cluster):
+            with lock:
+                active.append(cluster)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(cluster)
+
+        map_clusters(fetch, clusters, max_concurrency=2)
+        assert max(peak) == 2
+
+    def test_failures_are_collected(self, clusters):
+        def fetch(cluster):
+            if cluster.name == "test_cluster_2":
+                raise OpticAPIError("unreachable")
+            return cluster.name
+
+        results, failures = map_clusters(fetch, clusters)
+        assert len(results) == 5
+        assert [cluster.name for cluster, _ in failures] == ["test_cluster_2"]
+        assert str(failures[0][1]) == "unreachable"
+
+    def test_unexpected_errors_are_raised(self, clusters):
+        def fetch(cluster):
+            raise ValueError("bug")
+
+        with pytest.raises(ValueError):
+            map_clusters(fetch, clusters)
+
+    def test_no_clusters(self):
+        assert map_clusters(lambda cluster: cluster, []) == ([], [])
+
+
+class TestIterClusters:
+    def test_outcomes_in_completion_order(self, clusters):
+        # later clusters answer first
+        def fetch(cluster):
+            time.sleep(0.02 * (len(clusters) - clusters.index(cluster)))
+            if cluster.name == "test_cluster_2":
+                raise OpticAPIError("unreachable")
+            return cluster.name
+
+        outcomes = list(iter_clusters(fetch, clusters, max_concurrency=6))
+        assert [cluster.name for cluster, _, _ in outcomes] == [
+            c.name for c in reversed(clusters)
+        ]
+        assert [str(error) for _, _, error in outcomes if error] == ["unreachable"]
+
+    def test_outcomes_in_cluster_order(self, clusters):
+        # later clusters answer first
+        def fetch(cluster):
+            time.sleep(0.02 * (len(clusters) - clusters.index(cluster)))
+            return cluster.name
+
+        outcomes = list(iter_clusters(fetch, clusters, max_concurrency=6, ordered=True))
+        assert [result for _, result, _ in outcomes] == [c.name for c in clusters]
+
+    def test_no_clusters(self):
+        assert list(iter_clusters(lambda cluster: cluster, [])) == []
+
+
+class TestPartialFailure:
+    def test_get_cluster_info_skips_failed_cluster(self, mocker, capsys):
+        healthy = Cluster(name="healthy")
+        healthy._storage_percent = 10
+        healthy._health = ClusterHealth(**{"status": "green"})
+        broken = Cluster(name="broken")
+        mocker.patch.object(
+            Cluster,
+            "storage_percent",
+            new_callable=mocker.PropertyMock,
+            side_effect=[OpticAPIError("timed out"), 10],
+        )
+
+        cluster_info = get_cluster_info([broken, healthy], max_concurrency=1)
+        assert cluster_info == [{"name": "healthy", "status": "green", "usage": 10}]
+        assert "Unable to retrieve information for broken" in capsys.readouterr().out
+
+
+class TestOpticSettingsDefaults:
+    def test_defaults_fill_missing_settings(self):
+        settings = OpticSettings({"search_pattern": "*"}).fields
+        assert settings["max_concurrency"] == DEFAULT_OPTIC_SETTINGS["max_concurrency"]
+        assert settings["search_pattern"] == "*"
+
+    def test_settings_file_overrides_defaults(self):
+        assert OpticSettings({"max_concurrency": 3}).fields["max_concurrency"] == 3
@@ -1,17 +1,30 @@
+import re
 from datetime import datetime, timezone
 
 import dateutil.parser
 import pytest
 
 from optic.cluster.cluster import Cluster
+from optic.common import units
 from optic.common.exceptions import OpticDataError
-from optic.index.index import Index
+from optic.common.table_stream import print_table_stream
+from optic.common.units import format_bytes, parse_bytes
+from optic.index.index import IndexInfo
+from optic.index.index_filter import IndexFilter
 from optic.index.index_service import (
+    build_index_dicts,
+    explain_index_query,
     get_index_info,
-    parse_bytes,
-    parse_filters,
-    parse_sort_by,
+    iter_index_info,
+    plan_index_query,
+    print_index_info,
+    print_index_info_stream,
+    sort_index_table,
+    write_alias_needed,
 )
+from optic.index.index_table import MILLIS_PER_DAY, MISSING, IndexTable
+from optic.index.index_type import IndexTypeClassifier, index_type_classifier
+from tests.conftest import SIM_INDICES_RESPONSE
 
 
 class TestIndexService:
@@ -27,6 +40,9 @@ class TestIndexService:
         assert parse_bytes("320tb") == 320 * 2**40
         assert parse_bytes("320.75gb") == 320.75 * 2**30
         assert parse_bytes("320.754b") == 320.754
+        assert parse_bytes("1.5pb") == 1.5 * 2**50
+        assert parse_bytes("2GB") == 2 * 2**30
+        assert parse_bytes(format_bytes(3 * 2**50)) == 3 * 2**50
 
         def parse_bytes_exception_cases():
             with pytest.raises(OpticDataError):
@@ -41,12 +57,18 @@ class TestIndexService:
                 parse_bytes("wasgb")
             with pytest.raises(OpticDataError):
                 parse_bytes("wastb")
+            with pytest.raises(OpticDataError):
+                parse_bytes("waspb")
+            with pytest.raises(OpticDataError):
+                parse_bytes("b")
 
         parse_bytes_exception_cases()
 
     def test_get_index_info(self):
-        test_cluster = Cluster(name="test_cluster")
-        test_cluster._index_list = []
+        test_index_type_patterns = {"STOCK": "(.*)ocki(.*)$"}
+        test_cluster = Cluster(
+            name="test_cluster", index_type_patterns=test_index_type_patterns
+        )
         sim_response = {
             "health": "yellow",
             "status": "open",
@@ -60,13 +82,8 @@ class TestIndexService:
             "pri.store.size": "954kb",
             "creation.date.string": "2024-06-04T15:17:41.806Z",
         }
-        test_index_type_patterns = {"STOCK": "(.*)ocki(.*)$"}
-        test_index = Index(
-            cluster_name="test_cluster",
-            index_type_patterns=test_index_type_patterns,
-            info_response=sim_response,
-        )
-        test_cluster._index_list.append(test_index)
+        test_cluster._index_table = test_cluster._build_index_table([sim_response])
+        test_cluster._write_alias_targets = set()
 
         dict_response = get_index_info([test_cluster])
         assert dict_response[0]["name"] == "stockindex"
@@ -80,95 +97,551 @@ class TestIndexService:
         assert dict_response[0]["type"] == "STOCK"
         assert dict_response[0]["count"] == 2016
         assert dict_response[0]["index_size"] == "954kb"
-        assert dict_response[0]["shard_size"] == "954.0kb"
+        assert dict_response[0]["shard_size"] == "954kb"
         assert dict_response[0]["pri"] == 1
         assert dict_response[0]["rep"] == 1
         assert dict_response[0]["cluster"] == "test_cluster"
 
-    def test_parse_filters(self):
-        filter_dict = {
-            "min_age": 3,
-            "max_age": 8,
-            "min_index_size": "200b",
-            "max_index_size": "800kb",
-            "min_shard_size": "200b",
-            "max_shard_size": "800kb",
-            "min_doc_count": 200,
-            "max_doc_count": 500,
-            "type_filter": {
-                "type_1": "reg_ex_1",
-                "type_2": "reg_ex_2",
-                "type_3": "reg_ex_3",
-            },
+    def test_parsed_sizes_remembered(self, mocker):
+        split_size = mocker.spy(units, "split_size")
+        for _ in range(3):
+            assert parse_bytes("17.25kb") == 17.25 * 2**10
+        split_size.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "store_size,shard_size,shard_size_bytes",
+        [
+            ("954kb", "477kb", 477 * 2**10),
+            ("1mb", "0.5mb", 2**19),
+            ("3pb", "1.5pb", 1.5 * 2**50),
+            ("1000", "500b", 500),
+        ],
+    )
+    def test_shard_size(self, store_size, shard_size, shard_size_bytes):
+        index_info = IndexInfo(index="logs", pri="2", **{"pri.store.size": store_size})
+        assert index_info.shard_size_bytes == shard_size_bytes
+        assert index_info.shard_size == shard_size
+
+    def test_age_of_index_created_today(self, mocker):
+        isoparse = mocker.spy(dateutil.parser, "isoparse")
+        index_info = IndexInfo(
+            index="logs",
+            **{"creation.date.string": datetime.now(timezone.utc).isoformat()},
+        )
+        assert index_info.age == 0
+        assert index_info.age == 0
+        isoparse.assert_called_once()
+
+
+class TestIndexTable:
+    def test_from_response(self):
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE, cluster_name="c1")
+        assert len(table) == 2
+        assert list(table.column("index")) == ["stockindex", "students"]
+        assert list(table.column("pri")) == [1, 2]
+        assert list(table.column("docs.count")) == [2016, 15]
+        assert list(table.column("pri.store.size")) == [954 * 2**10, 2**20]
+        assert list(table.column("shard_size")) == [954 * 2**10, 2**19]
+        assert list(table.column("cluster")) == ["c1", "c1"]
+        assert table.row(0) == SIM_INDICES_RESPONSE[0] | {
+            "pri": 1,
+            "rep": 1,
+            "docs.count": 2016,
+            "docs.deleted": 15,
+            "creation.date": 1717514261806,
         }
-        filter_function_list = parse_filters(filter_dict)
-        index_info_dict = {
-            "pri.store.size": "300kb",
-            "docs.count": "600",
+
+    def test_from_numeric_response(self):
+        numeric_response = {
+            "index": "stockindex",
+            "pri": "2",
+            "rep": "1",
+            "docs.count": "2016",
+            "store.size": "1953535",
+            "pri.store.size": "976767",
+            "creation.date": "1717514261806",
         }
-        test_index = Index(info_response=index_info_dict)
-        test_index.info._age = 10
-        test_index.info._index_type = "type_1"
-        test_index.info._shard_size = "150b"
-        # Assert age is greater than 3
-        assert filter_function_list[0](test_index) is True
-        # Assert age is less than 3
-        assert filter_function_list[1](test_index) is False
-        # Assert index size is greater than 200b
-        assert filter_function_list[2](test_index) is True
-        # Assert index size is greater than 800kb
-        assert filter_function_list[3](test_index) is True
-        # Assert shard size is greater than 200b
-        assert filter_function_list[4](test_index) is False
-        # Assert shard size is greater than 800kb
-        assert filter_function_list[5](test_index) is True
-        # Assert doc count is greater than 200
-        assert filter_function_list[6](test_index) is True
-        # Assert doc count is less than 500
-        assert filter_function_list[7](test_index) is False
-        # Assert type is not type_1
-        assert filter_function_list[8](test_index) is False
-        # Assert type is not type_2
-        assert filter_function_list[9](test_index) is True
-        # Assert type is not type_3
-        assert filter_function_list[10](test_index) is True
-
-    def test_parse_sort_by(self):
-        sort_list = (
+        table = IndexTable.from_response([numeric_response])
+        assert table.column("pri.store.size")[0] == 976767
+        assert table.column("store.size")[0] == 1953535
+        assert table.column("shard_size")[0] == 976767 / 2
+        assert table.column("creation.date")[0] == 1717514261806
+        assert table.row(0)["creation.date.string"] == "2024-06-04T15:17:41.806Z"
+
+    def test_byte_type(self):
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE)
+        assert build_index_dicts(table, ["index_size", "shard_size"]) == [
+            {"index_size": "954kb", "shard_size": "954kb"},
+            {"index_size": "1mb", "shard_size": "0.5mb"},
+        ]
+        assert build_index_dicts(table, ["index_size", "shard_size"], "mb") == [
+            {"index_size": "0.9mb", "shard_size": "0.93mb"},
+            {"index_size": "1mb", "shard_size": "0.5mb"},
+        ]
+        with pytest.raises(OpticDataError):
+            build_index_dicts(table, ["index_size"], "yb")
+
+    def test_sizes_below_byte_type(self):
+        # gb is the default byte_type of the settings file
+        assert format_bytes(4096, "gb") == "4kb"
+        assert format_bytes(50 * 2**20, "gb") == "50mb"
+        assert format_bytes(0.5 * 2**30, "gb") == "0.5gb"
+        assert format_bytes(0, "gb") == "0gb"
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE)
+        assert build_index_dicts(table, ["index_size", "shard_size"], "gb") == [
+            {"index_size": "954kb", "shard_size": "954kb"},
+            {"index_size": "1mb", "shard_size": "512kb"},
+        ]
+
+    def test_ages_at_reference_time(self):
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE)
+        # midnight UTC, 10 days after the indices were created
+        midnight = 1717545600000 + 9 * MILLIS_PER_DAY
+        table.set_reference_time(midnight - 1)
+        assert list(table.column("age")) == [9, 9]
+        table.set_reference_time(midnight)
+        assert list(table.column("age")) == [10, 10]
+        assert list(table.take([1]).column("age")) == [10]
+
+    def test_clusters_share_reference_time(self, mocker):
+        midnight = 1717545600000 + 9 * MILLIS_PER_DAY
+        # the run starts just before midnight and ends after it
+        mocker.patch(
+            "optic.index.index_service.now_millis", side_effect=[midnight - 1, midnight]
+        )
+        mocker.patch(
+            "optic.index.index_table.now_millis",
+            side_effect=AssertionError("age calculated at another time"),
+        )
+        clusters = []
+        for name in ("cluster_1", "cluster_2"):
+            cluster = Cluster(name=name)
+            cluster._index_table = cluster._build_index_table(SIM_INDICES_RESPONSE)
+            clusters.append(cluster)
+        index_info = get_index_info(clusters, fields=["name", "age"])
+        assert [index["age"] for index in index_info] == [9, 9, 9, 9]
+
+    def test_index_info_age_from_epoch_millis(self, mocker):
+        isoparse = mocker.spy(dateutil.parser, "isoparse")
+        index_info = IndexInfo(
+            index="stockindex",
+            reference_millis=1717545600000,
+            **{"creation.date": "1717514261806"},
+        )
+        assert index_info.age == 1
+        isoparse.assert_not_called()
+
+    def test_closed_index_values_are_missing(self):
+        closed_index = {"index": "closed", "status": "close", "pri": "1", "rep": "1"}
+        table = IndexTable.from_response([closed_index])
+        assert table.column("docs.count")[0] == MISSING
+        assert table.column("shard_size")[0] == MISSING
+        assert table.row(0)["pri.store.size"] is None
+
+    def test_derived_columns(self):
+        table = IndexTable.from_response(
+            SIM_INDICES_RESPONSE,
+            index_type_patterns={"STUDENT": "stud.*"},
+            write_alias_lookup=lambda index_name: index_name == "students",
+        )
+        assert table.column("index_type") == ["UNDEFINED", "STUDENT"]
+        assert list(table.column("write_alias")) == [0, 1]
+        assert "age" not in table.columns
+        table.materialize(["age", "index"])
+        assert "age" in table.columns
+
+    def test_take_and_concat(self):
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE, cluster_name="c1")
+        other = IndexTable.from_response(SIM_INDICES_RESPONSE[:1], cluster_name="c2")
+        table.materialize(["shard_size"])
+        combined = IndexTable.concat([table.take([1]), other])
+        assert list(combined.column("index")) == ["students", "stockindex"]
+        assert list(combined.column("cluster")) == ["c1", "c2"]
+        # derived columns are only kept when calculated for every table
+        assert "shard_size" not in combined.columns
+
+    def test_filter_and_sort(self):
+        table = IndexTable.from_response(SIM_INDICES_RESPONSE)
+        filtered = IndexFilter.from_dict(
+            {"min_index_size": "1mb", "max_age": None}
+        ).apply(table)
+        assert list(filtered.column("index")) == ["students"]
+        filtered = IndexFilter(max_doc_count=2016, min_doc_count=16).apply(table)
+        assert list(filtered.column("index")) == ["stockindex"]
+
+        sorted_table = sort_index_table(table, ["doc-count"])
+        assert list(sorted_table.column("index")) == ["students", "stockindex"]
+        # the last sort type is the primary sort key
+        sorted_table = sort_index_table(table, ["doc-count", "name"])
+        assert list(sorted_table.column("index")) == ["stockindex", "students"]
+
+    @pytest.mark.parametrize(
+        "sort_type, expected",
+        [
+            ("age", ["stockindex", "students"]),
+            ("name", ["stockindex", "students"]),
+            ("write-alias", ["stockindex", "students"]),
+            ("index-size", ["stockindex", "students"]),
+            ("shard-size", ["students", "stockindex"]),
+            ("doc-count", ["students", "stockindex"]),
+            ("type", ["students", "stockindex"]),
+            ("primary-shards", ["stockindex", "students"]),
+            ("replica-shards", ["students", "stockindex"]),
+        ],
+    )
+    def test_sort_types(self, sort_type, expected):
+        response = [
+            SIM_INDICES_RESPONSE[0],
+            SIM_INDICES_RESPONSE[1]
+            | {"rep": "0", "creation.date.string": "2024-01-01T00:00:00Z"},
+        ]
+        table = IndexTable.from_response(
+            response,
+            index_type_patterns={"STUDENTS": "^students$"},
+            write_alias_lookup=lambda index_name: index_name == "students",
+        )
+        assert list(sort_index_table(table, [sort_type]).column("index")) == expected
+        assert (
+            list(sort_index_table(table, [sort_type + ":desc"]).column("index"))
+            == expected[::-1]
+        )
+
+    def test_sort_directions_and_top(self):
+        response = [
+            dict(SIM_INDICES_RESPONSE[i % 2], index=f"index-{i}") for i in range(6)
+        ]
+        table = IndexTable.from_response(response)
+        sorted_table = sort_index_table(table, ["name:desc", "index-size:desc"])
+        assert list(sorted_table.column("index")) == [
+            "index-5",
+            "index-3",
+            "index-1",
+            "index-4",
+            "index-2",
+            "index-0",
+        ]
+        top_table = sort_index_table(table, ["name", "index-size:desc"], top=2)
+        assert list(top_table.column("index")) == ["index-1", "index-3"]
+        assert list(sort_index_table(table, [], top=2).column("index")) == [
+            "index-0",
+            "index-1",
+        ]
+        with pytest.raises(OpticDataError):
+            sort_index_table(table, ["size"])
+
+    def test_top_across_clusters(self, api_cluster):
+        index_info = get_index_info(
+            [api_cluster, api_cluster],
+            sort_by=["doc-count:desc"],
+            fields=["name", "count"],
+            top=3,
+        )
+        assert index_info == [
+            {"name": "stockindex", "count": 2016},
+            {"name": "stockindex", "count": 2016},
+            {"name": "students", "count": 15},
+        ]
+
+
+class TestIndexTypeClassifier:
+    PATTERNS = {
+        "ISM": r"(.*)-ism-(\d{6})$",
+        "SYSTEM": r"(^\..*)$",
+        "LOGS": r"logs",
+        "DATED": r"(.*)-(\d{4})\.(\d{2})\.(\d{2})$",
+    }
+    NAMES = [
+        "app-ism-000001",
+        ".kibana",
+        "logs-2024.06.04",
+        "metrics-2024.06.04",
+        "students",
+        "x-logs",
+    ]
+
+    def expected_types(self, patterns):
+        types = []
+        for name in self.NAMES:
+            for type_name, reg_ex in patterns.items():
+                if re.match(reg_ex, name):
+                    types.append(type_name)
+                    break
+            else:
+                types.append("UNDEFINED")
+        return types
+
+    @pytest.mark.parametrize(
+        "extra_pattern",
+        [
+            {},
+            # combined with the other patterns
+            {"DUPLICATE": r"(.*)-(\d{4})\.(\d{2})\.(\d{2})$"},
+            # matched one pattern at a time
+            {"REPEATED": r"(\w)\1"},
+            {"CASELESS": r"(?i)STUDENTS"},
+        ],
+    )
+    def test_first_matching_pattern(self, extra_pattern):
+        patterns = {**self.PATTERNS, **extra_pattern}
+        classifier = IndexTypeClassifier(patterns)
+        assert classifier.classify_all(self.NAMES) == self.expected_types(patterns)
+        assert [classifier.classify(name) for name in self.NAMES] == (
+            self.expected_types(patterns)
+        )
+
+    def test_classifier_shared_across_clusters(self, mocker):
+        classifier = index_type_classifier(dict(self.PATTERNS))
+        classifier._types.clear()
+        match = mocker.spy(classifier, "_match")
+        for cluster_name in ("cluster_1", "cluster_2"):
+            table = IndexTable.from_response(
+                [{"index": name} for name in self.NAMES],
+                cluster_name=cluster_name,
+                index_type_patterns=dict(self.PATTERNS),
+            )
+            assert table.column("index_type") == self.expected_types(self.PATTERNS)
+        assert match.call_count == len(self.NAMES)
+
+    def test_no_patterns(self):
+        assert IndexTypeClassifier().classify_all(["logs"]) == ["UNDEFINED"]
+
+
+class TestIndexInfoStream:
+    def test_iter_index_info_matches_get_index_info(self, api_cluster):
+        fields = ["name", "count", "cluster"]
+        for sort_by in ([], ["doc-count"]):
+            assert list(
+                iter_index_info([api_cluster], sort_by=sort_by, fields=fields)
+            ) == get_index_info([api_cluster], sort_by=sort_by, fields=fields)
+
+    def test_iter_index_info_top_without_sort(self, api_cluster):
+        index_info = list(iter_index_info([api_cluster] * 3, fields=["name"], top=3))
+        assert index_info == [{"name": "stockindex"}, {"name": "students"}] + [
+            {"name": "stockindex"}
+        ]
+
+    def test_stream_output_matches_table(self, api_cluster, capsys):
+        index_info = get_index_info([api_cluster])
+        capsys.readouterr()
+        print_index_info(index_info, False)
+        table = capsys.readouterr().out
+        print_index_info_stream(iter(index_info), False)
+        assert capsys.readouterr().out == table
+
+    def test_columns_sized_from_sample(self, capsys):
+        rows = [["x", 1], ["longer", None]]
+        assert print_table_stream(["A", "B"], rows, title="T", sample_size=1) == 2
+        assert capsys.readouterr().out.splitlines() == [
+            "+T--+---+",
+            "| A | B |",
+            "+---+---+",
+            "| x | 1 |",
+            "| longer | None |",
+            "+---+---+",
+        ]
+
+
+class TestIndexFilter:
+    def test_compiled_predicates(self):
+        index_filter = IndexFilter(
+            write_alias_only=True,
+            min_age=3,
+            max_age=8,
+            min_index_size="200b",
+            max_index_size="800kb",
+            type_filter=["type_1", "type_2"],
+        )
+        # one predicate per column, cheapest columns first
+        assert index_filter.columns == [
+            "pri.store.size",
             "age",
-            "name",
-            "index-size",
-            "shard-size",
-            "doc-count",
-            "type",
-            "primary-shards",
-            "replica-shards",
-        )
-        sort_function_list = parse_sort_by(sort_list)
-        index_info_dict = {
-            "index": "test_name",
-            "pri.store.size": "300kb",
-            "docs.count": "600",
-            "pri": "1",
-            "rep": "0",
+            "index_type",
+            "write_alias",
+        ]
+        assert index_filter.bounds["pri.store.size"] == {"min": 200, "max": 800 * 2**10}
+        predicates = dict(index_filter.predicates)
+        assert predicates["age"](3) is True
+        assert predicates["age"](9) is False
+        assert predicates["age"](MISSING) is False
+        assert predicates["index_type"]("type_2") is False
+        assert predicates["index_type"]("type_3") is True
+        assert predicates["write_alias"](1) is True
+
+    def test_threshold_predicates(self):
+        predicates = dict(
+            IndexFilter(
+                min_age=3,
+                max_age=8,
+                min_index_size="200b",
+                max_index_size="800kb",
+                min_shard_size="200b",
+                max_shard_size="800kb",
+                min_doc_count=200,
+                max_doc_count=500,
+                type_filter=["type_1", "type_2"],
+            ).predicates
+        )
+        assert predicates["age"](3) is True
+        assert predicates["age"](10) is False
+        assert predicates["pri.store.size"](300 * 2**10) is True
+        assert predicates["pri.store.size"](900 * 2**10) is False
+        assert predicates["shard_size"](150) is False
+        assert predicates["shard_size"](800 * 2**10) is True
+        assert predicates["docs.count"](200) is True
+        assert predicates["docs.count"](600) is False
+        assert predicates["index_type"]("type_1") is False
+        assert predicates["index_type"]("type_3") is True
+
+    def test_unknown_filter_setting(self):
+        with pytest.raises(OpticDataError):
+            IndexFilter.from_dict({"min_size": "1gb"})
+
+    def test_derived_columns_only_calculated_for_remaining_rows(self):
+        calculated = []
+        table = IndexTable.from_response(
+            SIM_INDICES_RESPONSE,
+            write_alias_lookup=lambda index_name: calculated.append(index_name),
+        )
+        filtered = IndexFilter(min_doc_count=100, write_alias_only=False).apply(table)
+        assert list(filtered.column("index")) == ["stockindex"]
+        assert calculated == ["stockindex"]
+
+    def test_get_index_info_with_index_filter(self, api_cluster):
+        index_info = get_index_info(
+            [api_cluster], filters=IndexFilter(max_index_size="1mb"), fields=["name"]
+        )
+        assert index_info == [{"name": "stockindex"}, {"name": "students"}]
+        index_info = get_index_info(
+            [api_cluster], filters=IndexFilter(max_shard_size="512kb"), fields=["name"]
+        )
+        assert index_info == [{"name": "students"}]
+
+
+class TestIndexQueryPlan:
+    def test_columns_trimmed_to_what_is_needed(self):
+        query_plan = plan_index_query({"max_age": 30}, ["doc-count"], ["name"])
+        assert query_plan.columns == ["index", "docs.count", "creation.date"]
+        assert query_plan.query("logs-*,metrics-*") == (
+            "/_cat/indices/logs-*,metrics-*?format=json&bytes=b"
+            "&h=index,docs.count,creation.date&s=docs.count"
+        )
+        query_plan = plan_index_query({}, [], None)
+        assert query_plan.columns == [
+            "index",
+            "pri",
+            "rep",
+            "docs.count",
+            "pri.store.size",
+            "creation.date",
+        ]
+
+    def test_sort_pushed_down(self):
+        query_plan = plan_index_query({}, ["age", "index-size:desc"], ["name"])
+        # the last sort key is the primary one, and ascending age is descending date
+        assert query_plan.params["s"] == "pri.store.size:desc,creation.date:desc"
+        query_plan = plan_index_query({}, ["age", "shard-size"], ["name"])
+        assert "s" not in query_plan.params
+
+    def test_filters_pushed_down(self):
+        query_plan = plan_index_query(
+            {"health": "Yellow", "status": "open", "min_doc_count": 10}, [], ["name"]
+        )
+        assert query_plan.params == {
+            "health": "yellow",
+            "expand_wildcards": "open,hidden",
+        }
+        assert query_plan.local_filter.active_settings == {
+            "status": "open",
+            "min_doc_count": 10,
         }
-        test_index = Index(info_response=index_info_dict)
-        test_index.info._age = 10
-        test_index.info._index_type = "type_1"
-        test_index.info._shard_size = "150b"
-        # Assert that sort key is age
-        assert sort_function_list[0](test_index) == 10
-        # Assert that sort key is name
-        assert sort_function_list[1](test_index) == "test_name"
-        # Assert that sort key is index size
-        assert sort_function_list[2](test_index) == 300 * 2**10
-        # Assert that sort key is shard size
-        assert sort_function_list[3](test_index) == 150
-        # Assert that sort key is doc count
-        assert sort_function_list[4](test_index) == 600
-        # Assert that sort key is index type
-        assert sort_function_list[5](test_index) == "type_1"
-        # Assert that sort key is primary shards
-        assert sort_function_list[6](test_index) == 1
-        # Assert that sort key is replica shards
-        assert sort_function_list[7](test_index) == 0
+
+        query_plan = plan_index_query({"min_index_size": "1gb"}, [], ["name"])
+        assert query_plan.params == {"expand_wildcards": "open,hidden"}
+        assert query_plan.local_filter.active_settings == {"min_index_size": "1gb"}
+
+    def test_explain(self):
+        cluster = Cluster(name="c1", search_pattern="logs-*")
+        lines = explain_index_query(
+            [cluster], {"status": "close", "type_filter": ["SYSTEM"]}, ["name"], None
+        )
+        assert lines[1].startswith("c1: /_cat/indices/logs-*?format=json")
+        assert "  status of wildcard matches: close" in lines
+        assert "  filter: status=close" in lines
+        assert "  sort: index" in lines
+        assert "  filter: type_filter=['SYSTEM']" in lines
+        assert "  sort: name (merging presorted results)" in lines
+
+    def test_planned_query_not_kept_as_index_table(self, api_cluster):
+        index_info = get_index_info(
+            [api_cluster], filters={"status": "open"}, fields=["name"]
+        )
+        assert len(index_info) == 2
+        assert api_cluster._index_table is None
+        assert len(api_cluster.index_table) == 2
+
+    def test_status_filtered_for_concrete_index_name(self, api_cluster):
+        # expand_wildcards does not apply to index names, so OpenSearch returns the
+        # open index
+        api_cluster.search_pattern = "stockindex"
+        index_info = get_index_info(
+            [api_cluster], filters={"status": "close"}, fields=["name"]
+        )
+        assert index_info == []
+        index_info = get_index_info(
+            [api_cluster], filters={"status": "open"}, fields=["name"]
+        )
+        assert len(index_info) == 2
+
+    def test_pushed_filters_applied_locally_to_loaded_table(self, api_cluster):
+        assert len(api_cluster.index_table) == 2
+        index_info = get_index_info(
+            [api_cluster], filters={"health": "red"}, fields=["name"]
+        )
+        assert index_info == []
+
+
+class TestWriteAliasResolution:
+    def test_write_alias_needed(self):
+        no_filters = {"write_alias_only": None}
+        assert write_alias_needed(no_filters, [], None) is True
+        assert write_alias_needed(no_filters, [], ["name", "write_alias"]) is True
+        assert write_alias_needed(no_filters, ["write-alias"], ["name"]) is True
+        assert write_alias_needed({"write_alias_only": True}, [], ["name"]) is True
+        assert write_alias_needed(no_filters, ["age"], ["name", "age"]) is False
+        assert write_alias_needed(no_filters, [], ["name", "aliases"]) is True
+
+    def test_index_list_does_not_fetch_aliases(self, api_cluster, cluster_api):
+        assert len(api_cluster.index_list) == 2
+        assert cluster_api.queries == [("test_cluster", "/_cat/indices/*")]
+        assert api_cluster._alias_list is None
+
+    def test_write_alias_resolved_on_access(self, api_cluster, cluster_api):
+        write_aliases = [index.write_alias for index in api_cluster.index_list]
+        assert write_aliases == [False, True]
+        assert [path for _, path in cluster_api.queries] == [
+            "/_cat/indices/*",
+            "/_cat/aliases/*",
+        ]
+
+    def test_get_index_info_without_write_alias_field(self, api_cluster):
+        index_info = get_index_info([api_cluster], fields=["name", "count"])
+        assert index_info == [
+            {"name": "stockindex", "count": 2016},
+            {"name": "students", "count": 15},
+        ]
+        assert api_cluster._alias_list is None
+
+    def test_get_index_info_with_aliases_field(self, api_cluster):
+        assert "aliases" not in get_index_info([api_cluster])[0]
+        index_info = get_index_info([api_cluster], fields=["name", "aliases"])
+        assert index_info == [
+            {"name": "stockindex", "aliases": ""},
+            {"name": "students", "aliases": "alias1"},
+        ]
+
+    def test_get_index_info_with_write_alias_filter(self, api_cluster):
+        index_info = get_index_info(
+            [api_cluster], filters={"write_alias_only": True}, fields=["name"]
+        )
+        assert index_info == [{"name": "students"}]
+        assert len(api_cluster._alias_list) == 1
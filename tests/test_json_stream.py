@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from optic.common import json_stream
+from optic.common.exceptions import OpticDataError
+from optic.common.json_stream import JSONArrayParser, iter_json_array, orjson
+
+ROWS = [
+    {"index": "stock}index", "docs.count": "2016", "nested": {"a": [1, 2]}},
+    {"index": "café", "docs.count": None},
+    {"index": 'quoted "}" \\', "settings": [{"a": "]"}, {}]},
+    12,
+    "text",
+    [True, False],
+]
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True, marks=pytest.mark.skipif(not orjson, reason="orjson is not installed")
+    ),
+]
+
+
+def chunked(document, size):
+    data = document.encode("utf-8")
+    chunks = []
+    while data:
+        chunks.append(data[:size])
+        data = data[size:]
+    return chunks
+
+
+class TestJSONArrayParser:
+    @pytest.mark.parametrize("use_orjson", BACKENDS)
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_rows_split_across_chunks(self, size, use_orjson):
+        document = json.dumps(ROWS, indent=2, ensure_ascii=False)
+        rows = list(iter_json_array(chunked(document, size), use_orjson=use_orjson))
+        assert rows == ROWS
+
+    def test_rows_returned_as_soon_as_complete(self):
+        parser = JSONArrayParser()
+        assert parser.feed(b'[{"index": "a"}, {"ind') == [{"index": "a"}]
+        assert parser.feed(b'ex": "b"}, 1') == [{"index": "b"}]
+        # the number may continue in the next chunk
+        assert parser.feed(b"2") == []
+        assert parser.feed(b"]") == [12]
+        assert parser.close() == []
+
+    @pytest.mark.parametrize("use_orjson", BACKENDS)
+    def test_large_row_decoded_once(self, use_orjson, monkeypatch):
+        parser = JSONArrayParser(use_orjson=use_orjson)
+        decoded = []
+        if use_orjson:
+            loads = orjson.loads
+            monkeypatch.setattr(
+                json_stream.orjson,
+                "loads",
+                lambda data: decoded.append(data) or loads(data),
+            )
+        else:
+            raw_decode = parser._decoder.raw_decode
+            monkeypatch.setattr(
+                parser._decoder,
+                "raw_decode",
+                lambda data, position: decoded.append(data)
+                or raw_decode(data, position),
+            )
+        row = {"index": "a", "settings": [{"key": f"value {i} }}"} for i in range(200)]}
+        rows = []
+        for chunk in chunked(json.dumps([row]), 5):
+            rows.extend(parser.feed(chunk))
+        rows.extend(parser.close())
+        assert rows == [row]
+        # the end of the row is found before decoding it, across all the chunks
+        assert len(decoded) == 1
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b" [ ] \n"])) == []
+
+    @pytest.mark.parametrize(
+        "document",
+        [b'{"index": "a"}', b'[{"index": "a"}', b'[{"index": "a"}]]', b"[{bad}]"],
+    )
+    def test_invalid_document(self, document):
+        with pytest.raises(OpticDataError):
+            list(iter_json_array([document]))
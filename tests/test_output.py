@@ -0,0 +1,90 @@
+import io
+import json
+import sys
+
+import pytest
+
+from optic.alias.alias_service import ALIAS_RECORD_FIELDS, iter_alias_records
+from optic.common.exceptions import OpticDataError, OpticDependencyError
+from optic.common.output import data_output, write_records
+
+RECORDS = [
+    {"name": "stockindex", "count": 2016, "write_alias": False},
+    {"name": "students", "count": None, "write_alias": True},
+]
+
+
+def records():
+    yield from RECORDS
+
+
+class TestWriteRecords:
+    def test_json(self):
+        output = io.StringIO()
+        assert write_records(records(), "json", output) == 2
+        assert json.loads(output.getvalue()) == RECORDS
+
+        output = io.StringIO()
+        write_records([], "json", output)
+        assert json.loads(output.getvalue()) == []
+
+    def test_ndjson(self):
+        output = io.StringIO()
+        assert write_records(records(), "ndjson", output) == 2
+        lines = output.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == RECORDS
+
+    def test_csv(self):
+        output = io.StringIO()
+        assert write_records(records(), "csv", output, ["count", "name"]) == 2
+        assert output.getvalue().splitlines() == [
+            "count,name",
+            "2016,stockindex",
+            ",students",
+        ]
+
+        output = io.StringIO()
+        assert write_records([], "csv", output, ["name"]) == 0
+        assert output.getvalue() == "name\n"
+
+    def test_unknown_format(self):
+        with pytest.raises(OpticDataError):
+            write_records(records(), "xml", io.StringIO())
+
+    def test_arrow_requires_pyarrow(self, mocker):
+        mocker.patch.dict(sys.modules, {"pyarrow": None})
+        with pytest.raises(OpticDependencyError):
+            write_records(records(), "arrow", io.StringIO())
+
+    @pytest.mark.parametrize("output_format", ["arrow", "parquet"])
+    def test_columnar(self, output_format):
+        pyarrow = pytest.importorskip("pyarrow")
+        output = io.TextIOWrapper(io.BytesIO())
+        assert write_records(records(), output_format, output) == 2
+        data = pyarrow.BufferReader(output.buffer.getvalue())
+        if output_format == "parquet":
+            table = pytest.importorskip("pyarrow.parquet").read_table(data)
+        else:
+            table = pyarrow.ipc.open_stream(data).read_all()
+        assert table.to_pylist() == RECORDS
+
+    def test_messages_sent_to_stderr(self, capsys):
+        with data_output("ndjson") as output:
+            print("Getting cluster index list for test_cluster")
+            write_records(records(), "ndjson", output)
+        captured = capsys.readouterr()
+        assert "Getting cluster" in captured.err
+        assert [json.loads(line) for line in captured.out.splitlines()] == RECORDS
+
+    def test_alias_records(self):
+        target = {
+            "cluster_name": "test_cluster",
+            "index_name": "stockindex",
+            "filter": None,
+            "routing_index": None,
+            "routing_search": None,
+            "write_target": True,
+        }
+        alias_records = list(iter_alias_records([{"stock": [target]}]))
+        assert alias_records == [{"alias": "stock", **target}]
+        assert list(alias_records[0]) == list(ALIAS_RECORD_FIELDS)
@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+import urllib.request
+
+import pytest
+from click.testing import CliRunner
+
+from optic.cli import cli
+from optic.cluster.cluster import Cluster
+from optic.common.concurrency import recording_failures
+from optic.common.config import DEFAULT_DAEMON_MAX_AGE
+from optic.common.exceptions import OpticAPIError, OpticError
+from optic.serve.serve_client import query_daemon
+from optic.serve.serve_service import OpticDaemon, create_server
+
+
+@pytest.fixture
+def optic_daemon(optic_settings, cluster_config_file, daemon_socket):
+    with OpticDaemon(optic_settings, refresh_interval=0) as optic_daemon:
+        server = create_server(optic_daemon, daemon_socket)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield optic_daemon
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def refresh(optic_daemon):
+    for entry in optic_daemon._entries.values():
+        entry.refresh()
+
+
+class TestDaemon:
+    def test_queries_are_answered_from_warm_state(self, cluster_api, optic_daemon):
+        result = query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert result == [{"name": "cluster_1", "status": "green", "usage": 40}]
+        assert len(cluster_api.queries) == 2
+
+        result = query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert result == [{"name": "cluster_1", "status": "green", "usage": 40}]
+        assert len(cluster_api.queries) == 2
+
+        request = {
+            "cluster_selection": ["my_group"],
+            "filters": {"max_doc_count": 100},
+            "sort_by": ["name"],
+            "fields": ["name", "write_alias", "cluster"],
+        }
+        result = query_daemon("/index/info", request)
+        assert result == [
+            {"name": "students", "write_alias": True, "cluster": "cluster_1"},
+            {"name": "students", "write_alias": True, "cluster": "cluster_3"},
+        ]
+        # full index tables are kept warm by background refreshes, so other filters
+        # are then answered without queries
+        refresh(optic_daemon)
+        queried = len(cluster_api.queries)
+        request["filters"] = {"min_doc_count": 100}
+        result = query_daemon("/index/info", request)
+        assert [index["name"] for index in result] == ["stockindex", "stockindex"]
+        result = query_daemon("/alias/info", {"cluster_selection": ["cluster_3"]})
+        assert list(result[0]) == ["alias1"]
+        assert len(cluster_api.queries) == queried
+
+    def test_index_query_planned_for_cold_clusters(self, cluster_api, optic_daemon):
+        request = {"cluster_selection": ["cluster_1"], "fields": ["name", "count"]}
+        result = query_daemon("/index/info", request)
+        assert [index["name"] for index in result] == ["stockindex", "students"]
+        # only the columns needed are retrieved, and aliases are not needed
+        assert cluster_api.queries == [("cluster_1", "/_cat/indices/*")]
+        assert Cluster._action.call_args.args[1].endswith("&h=index,docs.count")
+
+        cluster_api.queries.clear()
+        refresh(optic_daemon)
+        assert cluster_api.queries == [("cluster_1", "/_cat/indices/*")]
+
+    def test_refresh(self, cluster_api, optic_daemon):
+        query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        query_daemon("/alias/info", {"cluster_selection": ["cluster_2"]})
+        cluster_api.queries.clear()
+        action = Cluster._action.side_effect
+        refresh_cache = []
+
+        def refreshing_action(cluster, query):
+            refresh_cache.append(cluster.refresh_cache)
+            return action(cluster, query)
+
+        Cluster._action.side_effect = refreshing_action
+        refresh(optic_daemon)
+        # cached responses are bypassed
+        assert refresh_cache == [True] * 3
+        Cluster._action.side_effect = action
+        assert sorted(cluster_api.queries) == [
+            ("cluster_1", "/_cat/allocation"),
+            ("cluster_1", "/_cluster/health"),
+            ("cluster_2", "/_cat/aliases/*"),
+        ]
+        cluster_api.queries.clear()
+        query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert cluster_api.queries == []
+
+    def test_state_retrieved_again_after_max_age(
+        self, cluster_api, optic_daemon, mocker
+    ):
+        now = mocker.patch("optic.cluster.cluster.time.time", return_value=1000.0)
+        query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        now.return_value = 1000.0 + DEFAULT_DAEMON_MAX_AGE - 1
+        query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert len(cluster_api.queries) == 2
+        # without background refreshes, the state is not kept past its maximum age
+        now.return_value = 1000.0 + DEFAULT_DAEMON_MAX_AGE
+        query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert len(cluster_api.queries) == 4
+
+    def test_failed_clusters_recorded(self, cluster_api, optic_daemon):
+        action = Cluster._action.side_effect
+
+        def failing_action(cluster, query):
+            if cluster.name == "cluster_2":
+                raise OpticAPIError("unreachable")
+            return action(cluster, query)
+
+        Cluster._action.side_effect = failing_action
+        with recording_failures() as failed_clusters:
+            result = query_daemon(
+                "/cluster/info", {"cluster_selection": ["cluster_1", "cluster_2"]}
+            )
+        assert [info["name"] for info in result] == ["cluster_1"]
+        assert failed_clusters == ["cluster_2"]
+
+    def test_cluster_config_changes(
+        self, cluster_api, optic_daemon, cluster_config_file, capsys
+    ):
+        assert len(query_daemon("/cluster/info", {})) == 4
+        with open(cluster_config_file, "w") as f:
+            f.write("clusters:\n  cluster_9:\n    url: https://url.com:9200\n")
+            f.write("    username: usr\n    password: pwd\n")
+        os.utime(cluster_config_file, ns=(0, 0))
+        result = query_daemon("/cluster/info", {"cluster_selection": ["cluster_1"]})
+        assert result == []
+        assert "cluster_1 is not present" in capsys.readouterr().out
+
+    def test_errors(self, cluster_api, optic_daemon, daemon_socket, temp_dir):
+        with pytest.raises(OpticAPIError, match="Non-existent or improperly"):
+            query_daemon(
+                "/cluster/info",
+                {"cluster_config_file_path": f"{temp_dir}/missing.yaml"},
+            )
+        with pytest.raises(OpticAPIError, match="Unrecognized query"):
+            query_daemon("/shard/info", {})
+        with pytest.raises(OpticError, match="already listening"):
+            create_server(optic_daemon, daemon_socket)
+
+    def test_localhost_http(
+        self, cluster_api, optic_settings, cluster_config_file, temp_dir
+    ):
+        with OpticDaemon(optic_settings, refresh_interval=0) as optic_daemon:
+            server = create_server(optic_daemon, port=0)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                url = f"http://127.0.0.1:{server.server_address[1]}"
+                with urllib.request.urlopen(  # noqa: S310
+                    f"{url}/cluster/info?cluster=g2"
+                ) as r:
+                    body = json.load(r)
+                # the configuration file and settings of the daemon are used
+                request = urllib.request.Request(  # noqa: S310
+                    f"{url}/cluster/info",
+                    data=json.dumps(
+                        {
+                            "cluster_config_file_path": f"{temp_dir}/missing.yaml",
+                            "settings": {"cluster_config_file_path": "/etc/passwd"},
+                            "cluster_selection": ["cluster_1"],
+                        }
+                    ).encode("utf-8"),
+                )
+                with urllib.request.urlopen(request) as r:  # noqa: S310
+                    posted = json.load(r)
+            finally:
+                server.shutdown()
+                thread.join()
+                server.server_close()
+        assert [info["name"] for info in body["result"]] == ["cluster_1", "my_cluster"]
+        assert [info["name"] for info in posted["result"]] == ["cluster_1"]
+        (entry,) = optic_daemon._entries.values()
+        assert entry.cluster_config_file_path == os.path.abspath(cluster_config_file)
+
+    def test_no_daemon(self, daemon_socket):
+        assert query_daemon("/cluster/info", {}) is None
+        # socket left behind by a daemon that is no longer running
+        open(daemon_socket, "w").close()
+        assert query_daemon("/cluster/info", {}) is None
+
+
+class TestCliDaemon:
+    def test_cli_uses_daemon(
+        self, mocker, optic_settings_file_path, optic_settings_file, cluster_config_file
+    ):
+        mock_query_daemon = mocker.patch(
+            "optic.cli.query_daemon",
+            return_value=[{"name": "cluster_1", "status": "green", "usage": 40}],
+        )
+        mock_get_cluster_info = mocker.patch(
+            "optic.cluster.cluster_service.get_cluster_info"
+        )
+        runner = CliRunner()
+        args = ["--settings", optic_settings_file_path, "cluster", "info", "-o", "csv"]
+
+        result = runner.invoke(cli, args + ["-c", "cluster_1"])
+        assert result.exit_code == 0
+        assert result.output == "name,status,usage\ncluster_1,green,40\n"
+        path, request, _ = mock_query_daemon.call_args.args
+        assert path == "/cluster/info"
+        assert request["cluster_selection"] == ["cluster_1"]
+        assert request["cluster_config_file_path"] == cluster_config_file
+        mock_get_cluster_info.assert_not_called()
+
+        # fresh responses are retrieved by the command itself
+        mock_query_daemon.reset_mock()
+        mock_get_cluster_info.return_value = []
+        result = runner.invoke(cli, args + ["--refresh"])
+        assert result.exit_code == 0
+        mock_query_daemon.assert_not_called()
+        mock_get_cluster_info.assert_called_once()
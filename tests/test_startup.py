@@ -0,0 +1,64 @@
+import os
+import subprocess  # noqa: S404
+import sys
+
+# Modules that are slow to import and only needed once a command runs
+HEAVY_MODULES = (
+    "aiohttp",
+    "asyncio",
+    "dateutil",
+    "orjson",
+    "requests",
+    "terminaltables",
+    "urllib3",
+    "yaml",
+)
+
+REPORT_HEAVY_MODULES = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: print(sorted({name.split('.')[0] for name in sys.modules}"
+    f" & set({HEAVY_MODULES!r})), file=sys.stderr))\n"
+)
+
+
+def run_python(code, *options, env=None):
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **(env or {})},
+        timeout=60,
+    )
+
+
+def heavy_modules_loaded(result):
+    return result.stderr.strip().splitlines()[-1]
+
+
+class TestStartup:
+    def test_import_does_not_load_heavy_modules(self):
+        for module in ("optic", "optic.cli"):
+            result = run_python(REPORT_HEAVY_MODULES + f"import {module}")
+            assert heavy_modules_loaded(result) == "[]", module
+
+    def test_shell_completion_does_not_load_heavy_modules(self):
+        result = run_python(
+            REPORT_HEAVY_MODULES + "from optic.cli import cli\ncli(prog_name='optic')",
+            env={
+                "_OPTIC_COMPLETE": "bash_complete",
+                "COMP_WORDS": "optic index info --",
+                "COMP_CWORD": "3",
+            },
+        )
+        assert "--sort-by" in result.stdout
+        assert heavy_modules_loaded(result) == "[]"
+
+    def test_public_names_are_loaded_on_use(self):
+        result = run_python(
+            "import optic\n"
+            "assert optic.get_index_info.__module__ == 'optic.index.index_service'\n"
+            "assert set(optic.__all__) <= set(dir(optic))\n"
+            "from optic import Cluster, IndexFilter\n"
+            "print(Cluster.__name__, IndexFilter.__name__)"
+        )
+        assert result.stdout.split() == ["Cluster", "IndexFilter"], result.stderr
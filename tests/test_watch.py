@@ -0,0 +1,171 @@
+import io
+
+from click.testing import CliRunner
+
+from benchmarks.opensearch_stub import StubOpenSearch, SyntheticCluster
+from benchmarks.run_benchmarks import make_cluster
+from optic.cli import cli
+from optic.cluster.cluster import INFO_PROPERTIES, Cluster
+from optic.cluster.cluster_service import get_cluster_info
+from optic.common.api import close_sessions
+from optic.common.watch import WatchTable, _delta, watch_clusters
+from optic.index.index_service import get_index_info
+
+COLUMNS = {"name": "Index", "status": "Status", "count": "Document Count"}
+
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def records(count=100, status="green", names=("a", "b")):
+    return [{"name": name, "status": status, "count": count} for name in names]
+
+
+class TestWatchTable:
+    def test_delta(self):
+        assert _delta(100, 1304) == "+1,204"
+        assert _delta(5, 3) == "-2"
+        assert _delta(1.5, 1.25) == "-0.25"
+        assert _delta("yellow", "green") == "yellow→green"
+        assert _delta(False, True) == "False→True"
+
+    def test_changes(self):
+        stream = io.StringIO()
+        table = WatchTable("Index Info", COLUMNS, ("name",), True, stream)
+
+        assert table.update(records(), status="now") == {
+            "changed": 0,
+            "new": 0,
+            "removed": 0,
+        }
+        first = stream.getvalue()
+        assert first.splitlines()[3] == "| a     | green  | 100            |         |"
+
+        # unchanged tables are not written again
+        table.update(records(), status="later")
+        assert stream.getvalue() == first
+
+        counts = table.update(records(110, "yellow", ("a", "c")), status="later")
+        assert counts == {"changed": 1, "new": 1, "removed": 1}
+        first_length = len(first.splitlines())
+        lines = stream.getvalue().splitlines()[first_length:]
+        assert "Status green→yellow, Document Count +10" in lines[3]
+        assert lines[4].endswith("| new                                     |")
+        assert lines[-1] == "later  1 changed, 1 new, 1 removed"
+
+    def test_only_changed_lines_are_rewritten(self):
+        stream = Terminal()
+        table = WatchTable("Index Info", COLUMNS, ("name",), True, stream)
+        table.update(records(names=("a", "b", "c")), ["a message"], "t1")
+        assert stream.getvalue().startswith("\033[H\033[2J+Index Info")
+
+        stream.seek(0)
+        stream.truncate()
+        table.update(records(names=("a", "b", "c")), ["a message"], "t2")
+        # status line
+        assert (
+            stream.getvalue() == "\033[1Ft2  0 changed, 0 new, 0 removed\033[K\033[1E"
+        )
+
+        stream.seek(0)
+        stream.truncate()
+        changed = records(names=("a", "b", "c"))
+        changed[1]["count"] = 90
+        table.update(changed, ["a message"], "t3")
+        rewritten = stream.getvalue().split("\033[K")
+        # row b, whose change widens the Changes column, and the table borders
+        assert len(rewritten) == 9
+        assert (
+            "| b     | green  | 90             | Document Count -10 |" in rewritten[4]
+        )
+
+
+class TestWatch:
+    def test_watch_clusters(self, mocker, cluster_api):
+        mocker.patch("optic.common.watch.time.sleep")
+        cluster_api.responses["_cat/allocation"] = lambda query: [
+            {"disk.used": str(40 + len(cluster_api.queries)), "disk.total": "100"}
+        ]
+        stream = io.StringIO()
+        table = WatchTable(
+            "Cluster Info",
+            {"name": "Cluster", "usage": "Usage"},
+            ("name",),
+            True,
+            stream,
+        )
+        watch_clusters(
+            get_cluster_info,
+            [Cluster(name="cluster_1")],
+            INFO_PROPERTIES["cluster"],
+            table,
+            10,
+            iterations=3,
+        )
+        # only health and allocation are retrieved, again at every update
+        assert (
+            sorted(path for _, path in cluster_api.queries)
+            == ["/_cat/allocation"] * 3 + ["/_cluster/health"] * 3
+        )
+        assert "Usage +" in stream.getvalue()
+        # progress messages are not displayed
+        assert "Getting" not in stream.getvalue()
+
+    def test_watch_bypasses_cache_after_first_update(self, mocker, temp_dir):
+        mocker.patch("optic.common.watch.time.sleep")
+        table = WatchTable(
+            "Index Info", {"name": "Index"}, ("name",), True, io.StringIO()
+        )
+        counts = []
+
+        def fetch(clusters):
+            index_dicts = get_index_info(clusters)
+            counts.append(stub.request_count)
+            return index_dicts
+
+        with StubOpenSearch(SyntheticCluster(index_count=50)) as stub:
+            clusters = []
+            for _ in range(2):
+                cluster = make_cluster(stub.url)
+                cluster.no_cache = False
+                cluster.cache_dir = temp_dir
+                cluster.cache_ttl = {"_cat/indices": 30, "_cat/aliases": 30}
+                clusters.append(cluster)
+            # a previous command cached the responses
+            get_index_info(clusters[:1])
+            cached = stub.request_count
+            watch_clusters(
+                fetch, clusters[1:], INFO_PROPERTIES["index"], table, 10, iterations=3
+            )
+        close_sessions()
+        # the first update is answered from the cache, not the following ones
+        assert counts == [cached, cached * 2, cached * 3]
+
+    def test_invalidate(self, cluster_api):
+        cluster = Cluster(name="cluster_1")
+        cluster.health
+        cluster.health
+        cluster.invalidate("health")
+        cluster.health
+        assert cluster_api.queries == [("cluster_1", "/_cluster/health")] * 2
+
+    def test_watch_requires_table_output(
+        self, optic_settings_file_path, optic_settings_file, cluster_config_file
+    ):
+        result = CliRunner().invoke(
+            cli,
+            [
+                "--settings",
+                optic_settings_file_path,
+                "cluster",
+                "info",
+                "--watch",
+                "5",
+                "-o",
+                "json",
+            ],
+        )
+        assert result.exit_code == 2
+        assert "--watch only supports table output" in result.output